@@ -1,34 +1,116 @@
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request, Response, stream_with_context, g
 from database import DatabaseManager
+from metrics import HttpMetrics, render_prometheus
 from dotenv import load_dotenv
+from datetime import datetime, timedelta
+import csv
+import glob
+import gzip
+import io
+import json
 import os
+import time
 
 # Load environment variables
 load_dotenv()
 
 app = Flask(__name__)
+# Sessions are per thread (see DatabaseManager.db) and closed after every request
 db_manager = DatabaseManager()
+http_metrics = HttpMetrics()
+# Where main.py writes its run_report_<industry>.json files
+RUN_REPORTS_DIR = os.getenv('RUN_REPORTS_DIR', 'output')
+
+# Page size of /api/use-cases when none is requested, and the largest one allowed
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Number of results of /api/search when none is requested, and the largest number allowed
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+# Responses smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 500
+# Column order of the CSV export
+EXPORT_FIELDS = [
+    'id', 'industry', 'business_function', 'origine_de_la_source', 'lien', 'derniere_mise_a_jour',
+    'processus_impacte', 'gains_attendus_realises', 'usage_ia', 'technologies_ia_utilisees',
+    'partenaires_impliques', 'incoherences', 'champs_estimes'
+]
+
+
+def _request_filters():
+    """Filters shared by the listing and export endpoints, read from the query string."""
+    return {
+        'industry': request.args.get('industry'),
+        'technology': request.args.get('technology'),
+        'business_function': request.args.get('business_function'),
+        'since': _parse_day(request.args.get('since'), 'since'),
+        'until': _parse_day(request.args.get('until'), 'until', end_of_day=True),
+    }
+
+
+def _parse_day(value, name, end_of_day=False):
+    if not value:
+        return None
+    try:
+        day = datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid {name} date '{value}', expected YYYY-MM-DD")
+    # An `until` date includes the whole day
+    return day + timedelta(days=1, microseconds=-1) if end_of_day else day
+
+
+@app.teardown_appcontext
+def remove_session(exception=None):
+    """Return the request's database connection to the pool."""
+    db_manager.remove_session()
+
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    """Count the request and its duration for /metrics."""
+    started = g.pop('request_started', None)
+    if started is not None:
+        http_metrics.record(request.endpoint or 'unknown', response.status_code, time.perf_counter() - started)
+    return response
+
+
+@app.after_request
+def add_caching_and_compression(response):
+    """Add an ETag (answering If-None-Match with 304) and gzip JSON responses when accepted."""
+    if response.status_code != 200 or response.mimetype != 'application/json' or response.direct_passthrough:
+        return response
+
+    # Weak ETag: the gzipped and plain representations share it
+    response.add_etag(weak=True)
+    response.make_conditional(request)
+    if response.status_code != 200:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if 'gzip' in request.headers.get('Accept-Encoding', '') and len(response.get_data()) >= MIN_COMPRESS_SIZE:
+        response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
 
 @app.route('/')
 def index():
     """Render the main page."""
     return render_template('index.html')
 
-@app.route('/api/use-cases')
-def get_use_cases():
-    """Get all AI use cases from the database."""
+
+@app.route('/api/industries')
+def get_industries():
+    """Get the list of industries present in the database."""
     try:
-        # Get all industries from the database
-        industries = db_manager.get_all_industries()
-        
-        # Get use cases for each industry
-        use_cases = {}
-        for industry in industries:
-            use_cases[industry] = db_manager.get_use_cases_by_industry(industry)
-        
         return jsonify({
             'success': True,
-            'data': use_cases
+            'data': sorted(db_manager.get_all_industries())
         })
     except Exception as e:
         return jsonify({
@@ -36,5 +118,138 @@ def get_use_cases():
             'error': str(e)
         }), 500
 
+
+@app.route('/api/use-cases')
+def get_use_cases():
+    """Get one page of AI use cases, grouped by industry.
+
+    Query parameters: industry, technology, business_function, since and until
+    (YYYY-MM-DD), limit, and cursor (the next_cursor of the previous page).
+    """
+    try:
+        limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        use_cases, next_cursor = db_manager.page_use_cases(
+            cursor=request.args.get('cursor'), limit=limit, **_request_filters()
+        )
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+    # Group the page by industry, keeping the newest-first order within each group
+    grouped = {}
+    for use_case in use_cases:
+        grouped.setdefault(use_case['industry'], []).append(use_case)
+
+    return jsonify({
+        'success': True,
+        'data': grouped,
+        'count': len(use_cases),
+        'next_cursor': next_cursor
+    })
+
+
+@app.route('/api/search')
+def search_use_cases():
+    """Full-text search over the use cases, best matches first.
+
+    Query parameters: q (required), limit, and the filters of /api/use-cases.
+    """
+    query = request.args.get('q', '').strip()
+    try:
+        if not query:
+            raise ValueError("Missing search query 'q'")
+        limit = min(max(request.args.get('limit', DEFAULT_SEARCH_LIMIT, type=int), 1), MAX_SEARCH_LIMIT)
+        results = db_manager.search(query, _request_filters(), limit=limit)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+    return jsonify({
+        'success': True,
+        'data': results,
+        'count': len(results)
+    })
+
+
+def _ndjson_lines(use_cases):
+    for use_case in use_cases:
+        yield json.dumps(use_case, ensure_ascii=False) + "\n"
+
+
+def _csv_lines(use_cases):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for use_case in use_cases:
+        # Convert lists to strings for CSV
+        writer.writerow({
+            key: "; ".join(value) if isinstance(value, list) else value
+            for key, value in use_case.items()
+        })
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+@app.route('/api/export')
+def export_use_cases():
+    """Stream all matching use cases as NDJSON (default) or CSV.
+
+    Takes the filters of /api/use-cases. Rows are written out as the database
+    produces them, so memory use does not grow with the table.
+    """
+    export_format = request.args.get('format', 'ndjson')
+    try:
+        if export_format not in ('ndjson', 'csv'):
+            raise ValueError(f"Unsupported format '{export_format}', expected ndjson or csv")
+        filters = _request_filters()
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    use_cases = db_manager.iter_use_cases(**filters)
+    if export_format == 'csv':
+        body, mimetype = _csv_lines(use_cases), 'text/csv'
+    else:
+        body, mimetype = _ndjson_lines(use_cases), 'application/x-ndjson'
+
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=ai_use_cases.{export_format}'}
+    )
+
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics: figures of the last benchmark run of each industry and web request counters."""
+    reports = []
+    for path in sorted(glob.glob(os.path.join(RUN_REPORTS_DIR, 'run_report_*.json'))):
+        try:
+            with open(path, encoding='utf-8') as f:
+                reports.append(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Could not read run report {path}: {e}")
+    return Response(render_prometheus(reports, http_metrics), mimetype='text/plain; version=0.0.4')
+
+
 if __name__ == '__main__':
-    app.run(debug=True) 
\ No newline at end of file
+    app.run(debug=True)
@@ -6,6 +6,8 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 import os
 from dotenv import load_dotenv
+from metrics import llm_config
+from rate_limit import get_limiter, with_limiter_retries
 from datetime import datetime
 
 load_dotenv()
@@ -28,14 +30,35 @@ class AIUseCase(BaseModel):
     partenaires_impliques: Optional[List[str]] = Field(None, description="Partenaires impliqués dans l'implémentation")
 
 
+# Single-pass output: the use case together with the coherence check and enrichment results
+class AIUseCaseAnalysis(AIUseCase):
+    incoherences: List[str] = Field(
+        default_factory=list,
+        description="Incohérences ou informations improbables détectées ([] si les informations sont cohérentes)")
+    champs_estimes: List[str] = Field(
+        default_factory=list,
+        description="Noms des champs complétés par estimation ([] si aucun)")
+
+
 class IndustryAnalyzer:
-    def __init__(self):
-        self.llm = ChatOpenAI(
+    def __init__(self, llm_cache=None, metrics=None):
+        # llm_cache (an LLMCache) memoizes responses across runs; None disables it
+        # metrics (a RunMetrics) records the duration and token usage of every call
+        limiter = get_limiter("openai")
+        self.metrics = metrics
+        self.llm_cache = llm_cache
+        self.llm = with_limiter_retries(ChatOpenAI(
             model="gpt-4o-mini",
             api_key=os.getenv("OPENAI_API_KEY"),
-            temperature=0.1
-        )
+            temperature=0.1,
+            cache=llm_cache,
+            # Shared OpenAI quota; retries go through it too, so that it sees every 429
+            rate_limiter=limiter,
+            max_retries=0,
+            callbacks=[limiter.callback_handler()] + ([metrics.callback_handler()] if metrics else [])
+        ))
         self.parser = PydanticOutputParser(pydantic_object=AIUseCase)
+        self.single_pass_parser = PydanticOutputParser(pydantic_object=AIUseCaseAnalysis)
 
     def analyze_article_content(self, content, url, industry):
         """Analyze article content to extract structured use case information."""
@@ -66,13 +89,58 @@ class IndustryAnalyzer:
         - partenaires_impliques: Liste des partenaires ou [] si non mentionnés
         """)
 
+        return self._extract(prompt, self.parser, content, url, industry, "extraction")
+
+    def analyze_article_single_pass(self, content, url, industry):
+        """Extract the use case, check its coherence and fill missing fields in one LLM call.
+
+        Replaces the analyze_article_content / verify_coherence / enrich_information
+        sequence; the coherence flags and estimated fields are stored on the result.
+        """
+        # Prompt in French as requested
+        prompt = ChatPromptTemplate.from_template("""
+        Tu es un analyste spécialisé dans l'identification et l'évaluation des cas d'utilisation de l'IA.
+
+        Analyse le contenu de l'article suivant et extrais les informations sur les cas d'utilisation de l'IA dans l'industrie {industry}.
+        Réponds uniquement en français.
+        Formate ta réponse selon le format de sortie spécifié.
+
+        Contenu de l'article:
+        {content}
+
+        {format_instructions}
+
+        IMPORTANT: Si une information n'est pas disponible, utilise TOUJOURS un tableau vide [] pour les champs de type liste, et "Non mentionné" pour les champs de texte simples.
+
+        Pour chaque champ:
+        - industry: Indique précisément le secteur d'activité (finance, santé, etc.)
+        - business_function: Précise la fonction métier (marketing, RH, finance, etc.)
+        - processus_impacte: Liste les processus métiers impactés
+        - valeur_economique: Chiffre les gains financiers si disponibles
+        - gains_attendus_realises: Liste les bénéfices concrets
+        - usage_ia: Décris clairement comment l'IA est utilisée
+        - technologies_ia_utilisees: Énumère les technologies spécifiques
+        - partenaires_impliques: Liste des partenaires ou [] si non mentionnés
+
+        Ensuite, dans la même réponse:
+        - incoherences: Vérifie la cohérence des informations extraites (les technologies correspondent-elles à l'usage
+          décrit ? les gains sont-ils réalistes ?) et liste chaque contradiction ou information improbable. [] si tout est cohérent.
+        - champs_estimes: Si l'entreprise ou les technologies ne sont pas mentionnées, complète-les de manière plausible
+          à partir des pratiques courantes de l'industrie {industry}, préfixe chaque valeur ajoutée par [ESTIMATION],
+          et liste ici les noms des champs complétés. [] si aucun champ n'a été estimé.
+        """)
+
+        return self._extract(prompt, self.single_pass_parser, content, url, industry, "single_pass")
+
+    def _extract(self, prompt, parser, content, url, industry, operation):
+        """Run an extraction prompt and parse it, repairing list fields the model filled with text."""
         try:
-            chain = prompt | self.llm | self.parser
+            chain = prompt | self.llm | parser
             result = chain.invoke({
                 "content": content,
-                "format_instructions": self.parser.get_format_instructions(),
+                "format_instructions": parser.get_format_instructions(),
                 "industry": industry
-            })
+            }, config=llm_config(operation, industry))
 
             # Add URL to the output
             if hasattr(result, 'lien'):
@@ -90,14 +158,16 @@ class IndustryAnalyzer:
             # Try to handle the case where the error is due to "Non mentionné" instead of []
             if "partenaires_impliques" in str(e) and "list_type" in str(e):
                 print(f"  Attempting to fix partenaires_impliques format issue...")
+                if self.metrics is not None:
+                    self.metrics.record_retry(industry, operation)
                 # Try a direct approach with custom parsing
                 try:
                     # Process response directly without the parser
                     direct_response = self.llm.invoke(prompt.format(
                         content=content,
-                        format_instructions=self.parser.get_format_instructions(),
+                        format_instructions=parser.get_format_instructions(),
                         industry=industry
-                    ))
+                    ), config=llm_config(operation, industry))
 
                     # Create a default object
                     from pydantic import create_model
@@ -113,7 +183,8 @@ class IndustryAnalyzer:
                         json_str = json_match.group(0)
                         # Replace "Non mentionné" with [] for list fields
                         list_fields = ["processus_impacte", "gains_attendus_realises",
-                                       "technologies_ia_utilisees", "partenaires_impliques"]
+                                       "technologies_ia_utilisees", "partenaires_impliques",
+                                       "incoherences", "champs_estimes"]
                         for field in list_fields:
                             json_str = json_str.replace(f'"{field}": "Non mentionné"', f'"{field}": []')
 
@@ -121,7 +192,7 @@ class IndustryAnalyzer:
 
                         # Ensure all list fields are actually lists
                         for field in list_fields:
-                            if field in data and not isinstance(data[field], list):
+                            if field in data and data[field] is not None and not isinstance(data[field], list):
                                 if data[field] == "Non mentionné":
                                     data[field] = []
                                 else:
@@ -129,7 +200,7 @@ class IndustryAnalyzer:
                                     data[field] = [data[field]]
 
                         # Create a new AIUseCase object from the fixed data
-                        result = self.parser.pydantic_object(**data)
+                        result = parser.pydantic_object(**data)
 
                         # Add URL and date
                         result.lien = url
@@ -171,4 +242,4 @@ class IndustryAnalyzer:
             "use_cases": "\n\n".join([str(case.dict()) for case in use_cases])
         })
 
-        return self.llm.invoke(result.to_string())
\ No newline at end of file
+        return self.llm.invoke(result.to_string(), config=llm_config("comparison", industry))
\ No newline at end of file
@@ -1,10 +1,17 @@
-from sqlalchemy import create_engine, Column, String, DateTime
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import (create_engine, Column, String, Text, DateTime, Integer, ForeignKey, Index, JSON,
+                        inspect, insert, delete, text, or_, and_)
+from sqlalchemy.ext.declarative import declarative_base, declared_attr
+from sqlalchemy.orm import sessionmaker, scoped_session, relationship
+from sqlalchemy.dialects import sqlite, postgresql, mysql
 from datetime import datetime
+import base64
+import hashlib
 import json
 import os
 from dotenv import load_dotenv
+from url_utils import normalize_url, canonical_url
+from prefilter import normalize_text
+from fulltext import create_fulltext_index, document_text
 
 # Load environment variables
 load_dotenv()
@@ -12,25 +19,92 @@ load_dotenv()
 # Get database URL from environment variable or use SQLite as default
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///ai_use_cases.db')
 
+
+def create_db_engine(database_url):
+    """Create an engine with the connection pool configured from the environment.
+
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT (seconds) and DB_POOL_RECYCLE (seconds)
+    tune the pool; connections are pre-pinged so stale ones are replaced transparently.
+    """
+    options = {"pool_pre_ping": True}
+    # In-memory SQLite keeps a single connection per thread, which has no pool to size
+    if not (database_url.startswith("sqlite") and (":memory:" in database_url or database_url.rstrip("/") == "sqlite:")):
+        options.update(
+            pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+            pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 30)),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        )
+    return create_engine(database_url, **options)
+
+
+def create_session_registry(bind):
+    """Thread-local session registry: each thread (or web request) gets its own session."""
+    return scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=bind))
+
+
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_db_engine(DATABASE_URL)
+SessionLocal = create_session_registry(engine)
 Base = declarative_base()
 
+
+class ListItemMixin:
+    """One value of a list field of a use case, stored as its own indexed row."""
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    position = Column(Integer, nullable=False, default=0)
+    value = Column(Text, nullable=False)
+    # Lowercased, accent-free form of the value used for lookups
+    value_key = Column(String(255), nullable=False, index=True)
+
+    @declared_attr
+    def use_case_id(cls):
+        return Column(String(64), ForeignKey("ai_use_cases.id", ondelete="CASCADE"), nullable=False, index=True)
+
+
+class UseCaseProcess(ListItemMixin, Base):
+    __tablename__ = "ai_use_case_processes"
+
+
+class UseCaseGain(ListItemMixin, Base):
+    __tablename__ = "ai_use_case_gains"
+
+
+class UseCaseTechnology(ListItemMixin, Base):
+    __tablename__ = "ai_use_case_technologies"
+
+
+class UseCasePartner(ListItemMixin, Base):
+    __tablename__ = "ai_use_case_partners"
+
+
+def _list_relationship(model):
+    return relationship(model, order_by=model.position, lazy="selectin",
+                        cascade="all, delete-orphan", passive_deletes=True)
+
+
 class AIUseCaseDB(Base):
     __tablename__ = "ai_use_cases"
 
-    id = Column(String, primary_key=True)
-    industry = Column(String, nullable=False)
-    business_function = Column(String, nullable=False)
-    origine_de_la_source = Column(String, nullable=False)
-    lien = Column(String, nullable=False)
-    usage_ia = Column(String, nullable=False)
+    id = Column(String(64), primary_key=True)
+    industry = Column(String(255), nullable=False, index=True)
+    business_function = Column(String(255), nullable=False, index=True)
+    origine_de_la_source = Column(String(255), nullable=False)
+    lien = Column(String(768), nullable=False, index=True)
+    usage_ia = Column(Text, nullable=False)
     derniere_mise_a_jour = Column(DateTime, default=datetime.utcnow)
-    processus_impacte = Column(String)  # Stored as JSON string
-    gains_attendus_realises = Column(String)  # Stored as JSON string
-    technologies_ia_utilisees = Column(String)  # Stored as JSON string
-    partenaires_impliques = Column(String)  # Stored as JSON string
+    processus_items = _list_relationship(UseCaseProcess)
+    gains_items = _list_relationship(UseCaseGain)
+    technology_items = _list_relationship(UseCaseTechnology)
+    partner_items = _list_relationship(UseCasePartner)
+    # Quality notes of the single-pass analysis; never searched, so kept as plain lists
+    incoherences = Column(JSON)
+    champs_estimes = Column(JSON)
+
+    __table_args__ = (
+        Index("ix_ai_use_cases_industry_business_function", "industry", "business_function"),
+    )
 
     def to_dict(self):
         """Convert the database entry to a dictionary."""
@@ -42,49 +116,389 @@ class AIUseCaseDB(Base):
             'lien': self.lien,
             'usage_ia': self.usage_ia,
             'derniere_mise_a_jour': self.derniere_mise_a_jour.isoformat(),
-            'processus_impacte': json.loads(self.processus_impacte) if self.processus_impacte else [],
-            'gains_attendus_realises': json.loads(self.gains_attendus_realises) if self.gains_attendus_realises else [],
-            'technologies_ia_utilisees': json.loads(self.technologies_ia_utilisees) if self.technologies_ia_utilisees else [],
-            'partenaires_impliques': json.loads(self.partenaires_impliques) if self.partenaires_impliques else []
+            'processus_impacte': [item.value for item in self.processus_items],
+            'gains_attendus_realises': [item.value for item in self.gains_items],
+            'technologies_ia_utilisees': [item.value for item in self.technology_items],
+            'partenaires_impliques': [item.value for item in self.partner_items],
+            'incoherences': self.incoherences or [],
+            'champs_estimes': self.champs_estimes or []
         }
 
+
+class ProcessedURL(Base):
+    """An article already taken through the pipeline for an industry, so later runs can skip it."""
+    __tablename__ = "processed_urls"
+
+    industry = Column(String(255), primary_key=True)
+    # sha256 of the canonical URL, see url_key
+    url_key = Column(String(64), primary_key=True)
+    url = Column(String(768), nullable=False)
+    # "saved" (a use case was stored) or "not_relevant"
+    status = Column(String(32), nullable=False)
+    processed_at = Column(DateTime, default=datetime.utcnow)
+
+
+# List fields of a use case and the child table holding each of them
+LIST_FIELDS = {
+    'processus_impacte': UseCaseProcess,
+    'gains_attendus_realises': UseCaseGain,
+    'technologies_ia_utilisees': UseCaseTechnology,
+    'partenaires_impliques': UseCasePartner,
+}
+
+
+def value_key(value):
+    """Lookup key of a list value: lowercased, without accents, trimmed."""
+    return normalize_text(str(value)).strip()[:255]
+
+
+def use_case_id(url):
+    """Deterministic id of a use case, derived from its normalized source URL."""
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()[:32]
+
+
+def url_key(url):
+    """Key of an article in processed_urls: http/https, www and tracking parameters do not matter."""
+    return hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+
+
+def _parse_date(value):
+    """Parse the YYYY-MM-DD dates produced by the analyzer; anything else means now."""
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return datetime.utcnow()
+
+
+def encode_cursor(date, row_id):
+    """Opaque pagination cursor pointing after the given row."""
+    payload = json.dumps([date.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on malformed cursors."""
+    try:
+        date, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(date), row_id
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _list_rows(row_id, values):
+    return [
+        {'use_case_id': row_id, 'position': position, 'value': str(value), 'value_key': value_key(value)}
+        for position, value in enumerate(values or [])
+        if value is not None and str(value).strip()
+    ]
+
+
+def migrate_schema(bind):
+    """Bring an existing database up to the current schema.
+
+    Adds the columns and indexes missing on ai_use_cases and moves the list fields
+    that older versions stored as JSON strings into their child tables, then drops
+    those columns. The child tables themselves are created by Base.metadata.create_all.
+    """
+    inspector = inspect(bind)
+    if 'ai_use_cases' not in inspector.get_table_names():
+        return
+
+    columns = {column['name'] for column in inspector.get_columns('ai_use_cases')}
+    legacy_fields = [field for field in LIST_FIELDS if field in columns]
+    # Columns added after the table was created; all of them are nullable
+    missing_columns = [column for column in AIUseCaseDB.__table__.columns if column.name not in columns]
+
+    with bind.begin() as connection:
+        for column in missing_columns:
+            connection.execute(text(
+                f"ALTER TABLE ai_use_cases ADD COLUMN {column.name} {column.type.compile(dialect=bind.dialect)}"
+            ))
+        for index in AIUseCaseDB.__table__.indexes:
+            index.create(connection, checkfirst=True)
+
+        if not legacy_fields:
+            return
+
+        print(f"Migrating {', '.join(legacy_fields)} to child tables...")
+        rows = connection.execute(
+            text(f"SELECT id, {', '.join(legacy_fields)} FROM ai_use_cases")
+        ).mappings().all()
+        for field in legacy_fields:
+            items = []
+            for row in rows:
+                try:
+                    values = json.loads(row[field]) if row[field] else []
+                except ValueError:
+                    values = [row[field]]
+                items.extend(_list_rows(row['id'], values if isinstance(values, list) else [values]))
+            if items:
+                connection.execute(insert(LIST_FIELDS[field].__table__), items)
+            connection.execute(text(f"ALTER TABLE ai_use_cases DROP COLUMN {field}"))
+
+
+REQUIRED_FIELDS = ('industry', 'business_function', 'origine_de_la_source', 'lien', 'usage_ia')
+
+
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, database_url=None):
         """Initialize the database connection and create tables."""
-        Base.metadata.create_all(bind=engine)
-        self.db = SessionLocal()
+        if database_url:
+            self.engine = create_db_engine(database_url)
+            self.sessions = create_session_registry(self.engine)
+        else:
+            self.engine = engine
+            self.sessions = SessionLocal
+        Base.metadata.create_all(bind=self.engine)
+        migrate_schema(self.engine)
+        self.fulltext = create_fulltext_index(self.engine)
+        self._ensure_fulltext_index()
 
-    def save_use_case(self, use_case):
-        """Save a single AI use case to the database."""
-        try:
-            # Convert lists to JSON strings
-            db_use_case = AIUseCaseDB(
-                id=use_case['id'],
-                industry=use_case['industry'],
-                business_function=use_case['business_function'],
-                origine_de_la_source=use_case['origine_de_la_source'],
-                lien=use_case['lien'],
-                usage_ia=use_case['usage_ia'],
-                processus_impacte=json.dumps(use_case.get('processus_impacte', [])),
-                gains_attendus_realises=json.dumps(use_case.get('gains_attendus_realises', [])),
-                technologies_ia_utilisees=json.dumps(use_case.get('technologies_ia_utilisees', [])),
-                partenaires_impliques=json.dumps(use_case.get('partenaires_impliques', []))
+    def _ensure_fulltext_index(self):
+        """Create the full-text index, filling it from ai_use_cases when it is new."""
+        if not self.fulltext.persistent:
+            return
+        with self.engine.begin() as connection:
+            self.fulltext.create(connection)
+            if self.fulltext.count(connection) or not connection.execute(
+                    text("SELECT count(*) FROM ai_use_cases")).scalar():
+                return
+            print("Building the full-text search index...")
+            documents = {}
+            for use_case in self.iter_use_cases():
+                documents[use_case['id']] = document_text(use_case)
+                if len(documents) >= 1000:
+                    self.fulltext.replace(connection, documents)
+                    documents = {}
+            self.fulltext.replace(connection, documents)
+        self.remove_session()
+
+    @property
+    def db(self):
+        """Session of the current thread; safe to share the manager between threads."""
+        return self.sessions()
+
+    def remove_session(self):
+        """Close the session of the current thread, e.g. at the end of a web request."""
+        self.sessions.remove()
+
+    @staticmethod
+    def _to_row(use_case):
+        """Convert a use case dict (AIUseCase.model_dump()) to an ai_use_cases row."""
+        return {
+            'id': use_case.get('id') or use_case_id(use_case['lien']),
+            'industry': use_case['industry'],
+            'business_function': use_case['business_function'],
+            'origine_de_la_source': use_case['origine_de_la_source'],
+            'lien': use_case['lien'],
+            'usage_ia': use_case['usage_ia'],
+            'derniere_mise_a_jour': _parse_date(use_case.get('derniere_mise_a_jour')),
+            'incoherences': list(use_case.get('incoherences') or []),
+            'champs_estimes': list(use_case.get('champs_estimes') or [])
+        }
+
+    def _upsert_statement(self, rows):
+        """Build a dialect-native INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE statement."""
+        table = AIUseCaseDB.__table__
+        dialect = self.engine.dialect.name
+        update_columns = [column.name for column in table.columns if column.name != 'id']
+
+        if dialect in ('sqlite', 'postgresql'):
+            module = sqlite if dialect == 'sqlite' else postgresql
+            statement = module.insert(table).values(rows)
+            return statement.on_conflict_do_update(
+                index_elements=['id'],
+                set_={name: statement.excluded[name] for name in update_columns}
             )
-            self.db.add(db_use_case)
+        if dialect in ('mysql', 'mariadb'):
+            statement = mysql.insert(table).values(rows)
+            return statement.on_duplicate_key_update(
+                {name: statement.inserted[name] for name in update_columns}
+            )
+        return None
+
+    def upsert_use_cases(self, use_cases):
+        """Insert or update many AI use cases in a single transaction.
+
+        Rows are keyed by a deterministic id derived from the source URL, so saving the
+        same article again updates it. Returns a dict with `inserted`, `updated` and
+        `skipped` counts, and the `ids` of the rows actually written; invalid rows and
+        repeated URLs within the batch are skipped.
+        """
+        counts = {'inserted': 0, 'updated': 0, 'skipped': 0, 'ids': []}
+        rows = {}
+        list_values = {}
+        for use_case in use_cases:
+            if any(not use_case.get(field) for field in REQUIRED_FIELDS):
+                counts['skipped'] += 1
+                continue
+            row = self._to_row(use_case)
+            if row['id'] in rows:
+                counts['skipped'] += 1
+            rows[row['id']] = row
+            list_values[row['id']] = {field: use_case.get(field) for field in LIST_FIELDS}
+
+        if not rows:
+            return counts
+
+        try:
+            ids = list(rows)
+            existing = {
+                row_id for (row_id,) in
+                self.db.query(AIUseCaseDB.id).filter(AIUseCaseDB.id.in_(ids)).all()
+            }
+            statement = self._upsert_statement(list(rows.values()))
+            if statement is not None:
+                self.db.execute(statement)
+            else:
+                # Other dialects: portable merge, still within one transaction
+                for row in rows.values():
+                    self.db.merge(AIUseCaseDB(**row))
+
+            # List fields are replaced as a whole
+            for field, model in LIST_FIELDS.items():
+                self.db.execute(delete(model).where(model.use_case_id.in_(ids)))
+                items = [item for row_id in ids for item in _list_rows(row_id, list_values[row_id][field])]
+                if items:
+                    self.db.execute(insert(model), items)
+            # Keep the full-text index in sync, within the same transaction
+            if self.fulltext.persistent:
+                self.fulltext.replace(self.db.connection(), {
+                    row_id: document_text({**rows[row_id], **list_values[row_id]}) for row_id in ids
+                })
             self.db.commit()
-            return True
+            # Rows loaded earlier in this session may hold outdated list items
+            self.db.expire_all()
         except Exception as e:
-            print(f"Error saving use case: {e}")
+            print(f"Error saving use cases: {e}")
             self.db.rollback()
-            return False
+            counts['skipped'] += len(rows)
+            return counts
+
+        counts['updated'] = len(existing)
+        counts['inserted'] = len(rows) - len(existing)
+        counts['ids'] = ids
+        return counts
+
+    def save_use_case(self, use_case):
+        """Save a single AI use case to the database."""
+        counts = self.upsert_use_cases([use_case])
+        return counts['inserted'] + counts['updated'] == 1
 
     def save_use_cases(self, use_cases):
         """Save multiple AI use cases to the database."""
-        success_count = 0
-        for use_case in use_cases:
-            if self.save_use_case(use_case):
-                success_count += 1
-        return success_count
+        counts = self.upsert_use_cases(use_cases)
+        return counts['inserted'] + counts['updated']
+
+    def get_processed_urls(self, industry, urls):
+        """Return the subset of `urls` already processed for this industry."""
+        keys = {url: url_key(url) for url in urls}
+        if not keys:
+            return set()
+        found = {
+            key for (key,) in self.db.query(ProcessedURL.url_key).filter(
+                ProcessedURL.industry == industry, ProcessedURL.url_key.in_(set(keys.values()))
+            ).all()
+        }
+        return {url for url, key in keys.items() if key in found}
+
+    def mark_urls_processed(self, industry, statuses):
+        """Record the outcome of processed articles, given as {url: status}."""
+        if not statuses:
+            return
+        now = datetime.utcnow()
+        try:
+            for url, status in statuses.items():
+                self.db.merge(ProcessedURL(industry=industry, url_key=url_key(url), url=url[:768],
+                                           status=status, processed_at=now))
+            self.db.commit()
+        except Exception as e:
+            print(f"Error recording processed URLs: {e}")
+            self.db.rollback()
+
+    def _filtered_query(self, industry=None, business_function=None, technology=None, partner=None,
+                        process=None, since=None, until=None):
+        query = self.db.query(AIUseCaseDB)
+        if industry:
+            query = query.filter(AIUseCaseDB.industry == industry)
+        if business_function:
+            query = query.filter(AIUseCaseDB.business_function == business_function)
+        if technology:
+            query = query.filter(AIUseCaseDB.technology_items.any(UseCaseTechnology.value_key == value_key(technology)))
+        if partner:
+            query = query.filter(AIUseCaseDB.partner_items.any(UseCasePartner.value_key == value_key(partner)))
+        if process:
+            query = query.filter(AIUseCaseDB.processus_items.any(UseCaseProcess.value_key == value_key(process)))
+        if since:
+            query = query.filter(AIUseCaseDB.derniere_mise_a_jour >= since)
+        if until:
+            query = query.filter(AIUseCaseDB.derniere_mise_a_jour <= until)
+        # Newest first; the id breaks ties so pagination is stable
+        return query.order_by(AIUseCaseDB.derniere_mise_a_jour.desc(), AIUseCaseDB.id.desc())
+
+    def find_use_cases(self, industry=None, business_function=None, technology=None, partner=None,
+                       process=None, limit=None):
+        """Get the AI use cases matching all the given filters.
+
+        List filters (technology, partner, process) match a whole value, ignoring case
+        and accents, and are answered through the indexed child tables.
+        """
+        query = self._filtered_query(industry, business_function, technology, partner, process)
+        if limit:
+            query = query.limit(limit)
+        return [use_case.to_dict() for use_case in query.all()]
+
+    def page_use_cases(self, cursor=None, limit=50, **filters):
+        """Get one page of use cases, newest first, using keyset pagination.
+
+        `filters` are those of find_use_cases plus `since`/`until` dates. Returns
+        (use_cases, next_cursor); next_cursor is None on the last page.
+        """
+        query = self._filtered_query(**filters)
+        if cursor:
+            last_date, last_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                AIUseCaseDB.derniere_mise_a_jour < last_date,
+                and_(AIUseCaseDB.derniere_mise_a_jour == last_date, AIUseCaseDB.id < last_id)
+            ))
+
+        # One extra row tells whether another page exists
+        rows = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].derniere_mise_a_jour, rows[-1].id)
+        return [use_case.to_dict() for use_case in rows], next_cursor
+
+    def iter_use_cases(self, batch_size=1000, **filters):
+        """Yield every matching use case as a dict, fetching rows `batch_size` at a time.
+
+        Uses yield_per, i.e. server-side cursors on PostgreSQL and MySQL, so memory
+        stays constant however large the table is. Takes the filters of page_use_cases.
+        """
+        statement = self._filtered_query(**filters).statement.execution_options(yield_per=batch_size)
+        for use_case in self.db.scalars(statement):
+            yield use_case.to_dict()
+
+    def search(self, query, filters=None, limit=20):
+        """Full-text search over the description and list fields of the use cases.
+
+        Matching ignores case and accents and applies French stemming. `filters` are
+        those of page_use_cases. Returns the best matches first, each with a `score`.
+        """
+        ranked = self.fulltext.ranked(query)
+        if ranked is None:
+            return []
+        rows = (
+            self._filtered_query(**(filters or {}))
+            .join(ranked, ranked.c.use_case_id == AIUseCaseDB.id)
+            .add_columns(ranked.c.rank)
+            .order_by(None)
+            .order_by(ranked.c.rank, AIUseCaseDB.id)
+            .limit(limit)
+            .all()
+        )
+        return [{**use_case.to_dict(), 'score': round(-rank, 6)} for use_case, rank in rows]
 
     def get_use_cases_by_industry(self, industry):
         """Get all AI use cases for a specific industry."""
@@ -98,4 +512,5 @@ class DatabaseManager:
 
     def __del__(self):
         """Close the database connection when the manager is destroyed."""
-        self.db.close() 
\ No newline at end of file
+        if hasattr(self, 'sessions'):
+            self.sessions.remove()
@@ -0,0 +1,146 @@
+# dedup.py
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import struct
+import threading
+import time
+from prefilter import normalize_text
+from url_utils import canonical_url
+
+# Mersenne prime used by the MinHash permutations (a * h + b) mod p
+MERSENNE_PRIME = (1 << 61) - 1
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def words_of(text):
+    """Words of a text, ignoring case, accents and punctuation."""
+    return WORD_PATTERN.findall(normalize_text(text or ""))
+
+
+def shingles(words, size=5):
+    """Set of hashed shingles of `size` consecutive words."""
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + size]).encode("utf-8"), digest_size=8).digest(), "big")
+        for i in range(max(1, len(words) - size + 1))
+    }
+
+
+class NearDuplicateDetector:
+    """Persistent MinHash + LSH index of article texts.
+
+    Each text is reduced to a MinHash signature of its word shingles; the signature is
+    cut into bands, and articles sharing a band bucket are compared on their estimated
+    Jaccard similarity. Signatures are stored on disk, so a syndicated article is
+    recognized in later runs and for other industries as well.
+    """
+
+    def __init__(self, path=None, threshold=None, num_perm=128, bands=16, min_words=50):
+        self.path = path or os.getenv("DEDUP_PATH", "cache/dedup.db")
+        self.threshold = threshold if threshold is not None else float(os.getenv("DEDUP_THRESHOLD", 0.8))
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        # Texts shorter than this (error pages, paywalls...) are too generic to compare
+        self.min_words = min_words
+        self.stats = {"checked": 0, "duplicates": 0, "too_short": 0}
+
+        # Fixed seed: signatures must stay comparable across runs
+        generator = random.Random(42)
+        self._permutations = [
+            (generator.randrange(1, MERSENNE_PRIME), generator.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                bucket TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (bucket, key)
+            )
+        """)
+        self._conn.commit()
+
+    def signature(self, text):
+        """MinHash signature of a text, or None when it has too few words to compare."""
+        words = words_of(text)
+        if len(words) < self.min_words:
+            return None
+        hashes = shingles(words)
+        return [
+            min((a * h + b) % MERSENNE_PRIME for h in hashes)
+            for a, b in self._permutations
+        ]
+
+    @staticmethod
+    def similarity(first, second):
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+    def _buckets(self, signature):
+        buckets = []
+        for band in range(self.bands):
+            values = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(struct.pack(f">{len(values)}Q", *values), digest_size=8).hexdigest()
+            buckets.append(f"{band}:{digest}")
+        return buckets
+
+    def check(self, url, text):
+        """Return the URL of an earlier near-duplicate of this article, or None.
+
+        An article that is not a duplicate is added to the index. Checking the same
+        article (same canonical URL) again never reports it as its own duplicate.
+        """
+        signature = self.signature(text)
+        with self._lock:
+            self.stats["checked"] += 1
+            if signature is None:
+                self.stats["too_short"] += 1
+                return None
+
+            key = canonical_url(url)
+            buckets = self._buckets(signature)
+            placeholders = ", ".join("?" for _ in buckets)
+            candidates = self._conn.execute(
+                f"SELECT DISTINCT s.key, s.url, s.signature FROM lsh_buckets b "
+                f"JOIN signatures s ON s.key = b.key WHERE b.bucket IN ({placeholders}) AND b.key != ?",
+                (*buckets, key)
+            ).fetchall()
+            for _, candidate_url, blob in candidates:
+                candidate = struct.unpack(f">{self.num_perm}Q", blob)
+                if self.similarity(signature, candidate) >= self.threshold:
+                    self.stats["duplicates"] += 1
+                    return candidate_url
+
+            self._conn.execute(
+                "INSERT INTO signatures (key, url, signature, created_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET signature = excluded.signature",
+                (key, url, struct.pack(f">{self.num_perm}Q", *signature), time.time())
+            )
+            self._conn.execute("DELETE FROM lsh_buckets WHERE key = ?", (key,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO lsh_buckets (bucket, key) VALUES (?, ?)",
+                [(bucket, key) for bucket in buckets]
+            )
+            self._conn.commit()
+            return None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -2,18 +2,44 @@
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
+from metrics import llm_config
+from rate_limit import get_limiter, with_limiter_retries
+import json
 import os
+import re
 
 load_dotenv()
 
+# Spellings of a string verdict; anything else is treated as unreadable
+VERDICT_WORDS = {"true": True, "oui": True, "yes": True, "vrai": True,
+                 "false": False, "non": False, "no": False, "faux": False}
+
+
+def parse_verdict(value):
+    """Read a "pertinent" value as a bool; None when it is neither a boolean nor a known word."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return VERDICT_WORDS.get(value.strip().lower())
+    return None
+
 
 class QualityEnhancer:
-    def __init__(self):
-        self.llm = ChatOpenAI(
+    def __init__(self, llm_cache=None, metrics=None):
+        # llm_cache (an LLMCache) memoizes responses across runs; None disables it
+        # metrics (a RunMetrics) records the duration and token usage of every call
+        limiter = get_limiter("openai")
+        self.llm_cache = llm_cache
+        self.llm = with_limiter_retries(ChatOpenAI(
             model="gpt-4o-mini",
             api_key=os.getenv("OPENAI_API_KEY"),
-            temperature=0.1
-        )
+            temperature=0.1,
+            cache=llm_cache,
+            # Shared OpenAI quota; retries go through it too, so that it sees every 429
+            rate_limiter=limiter,
+            max_retries=0,
+            callbacks=[limiter.callback_handler()] + ([metrics.callback_handler()] if metrics else [])
+        ))
 
     def filter_relevance(self, content, industry):
         """Evaluates if the content is relevant for AI use case analysis."""
@@ -30,9 +56,70 @@ class QualityEnhancer:
         par quelle entreprise, et idéalement avec quels résultats, dans l'industrie {industry}.
         """)
 
-        result = self.llm.invoke(prompt.format(content=content, industry=industry))
+        result = self.llm.invoke(prompt.format(content=content, industry=industry),
+                                 config=llm_config("relevance", industry))
         return "OUI" in result.content.upper()
 
+    def filter_relevance_batch(self, contents, industry, batch_size=10, excerpt_chars=3000):
+        """Classifies many articles at once using short excerpts.
+
+        Articles are grouped `batch_size` at a time into a single numbered prompt, and
+        the groups are sent concurrently. Returns one {"relevant": bool, "confidence": float}
+        dict per article, in input order.
+        """
+        # Prompt in French as requested
+        prompt = ChatPromptTemplate.from_template("""
+        Pour chacun des extraits numérotés ci-dessous, détermine s'il contient des informations pertinentes
+        sur un cas d'utilisation d'IA dans l'industrie {industry}.
+
+        Considère comme pertinent uniquement du contenu qui décrit spécifiquement comment l'IA est utilisée,
+        par quelle entreprise, et idéalement avec quels résultats, dans l'industrie {industry}.
+
+        {excerpts}
+
+        Réponds uniquement avec un tableau JSON contenant un objet par extrait, dans l'ordre, par exemple:
+        [{{"id": 1, "pertinent": true, "confiance": 0.9}}, {{"id": 2, "pertinent": false, "confiance": 0.7}}]
+        La confiance est un nombre entre 0 et 1.
+        """)
+
+        groups = [contents[i:i + batch_size] for i in range(0, len(contents), batch_size)]
+        prompts = [
+            prompt.format(
+                industry=industry,
+                excerpts="\n\n".join(
+                    f"Extrait {number}:\n{content[:excerpt_chars]}"
+                    for number, content in enumerate(group, start=1)
+                )
+            )
+            for group in groups
+        ]
+
+        results = []
+        for group, response in zip(groups, self.llm.batch(prompts, config=llm_config("relevance", industry))):
+            results.extend(self._parse_relevance_batch(response.content, len(group)))
+        return results
+
+    @staticmethod
+    def _parse_relevance_batch(text, count):
+        """Parse the JSON verdicts of a batch; unreadable verdicts keep the article with zero confidence."""
+        verdicts = {}
+        json_match = re.search(r'\[.*\]', text, re.DOTALL)
+        if json_match:
+            try:
+                for entry in json.loads(json_match.group(0)):
+                    relevant = parse_verdict(entry.get("pertinent"))
+                    if relevant is None:
+                        continue
+                    verdicts[int(entry["id"])] = {
+                        "relevant": relevant,
+                        "confidence": float(entry.get("confiance", 0.0))
+                    }
+            except (ValueError, TypeError, KeyError) as e:
+                print(f"  Could not parse batch relevance answer: {e}")
+
+        # Missing verdicts let the article through so the extraction step can decide
+        return [verdicts.get(number, {"relevant": True, "confidence": 0.0}) for number in range(1, count + 1)]
+
     def enrich_information(self, use_case, industry):
         """Enriches information about a use case if it's incomplete."""
         if not use_case.entreprise or not use_case.technologies_ia_utilisees:
@@ -52,7 +139,7 @@ class QualityEnhancer:
             result = self.llm.invoke(prompt.format(
                 case_information=str(use_case.dict()),
                 industry=industry
-            ))
+            ), config=llm_config("enrichment", industry))
 
             # Note: This would ideally be a more structured process to update the use_case object
             # This part would require additional implementation to extract and
@@ -80,6 +167,6 @@ class QualityEnhancer:
         result = self.llm.invoke(prompt.format(
             case_information=str(use_case.dict()),
             industry=industry
-        ))
+        ), config=llm_config("coherence", industry))
 
         return result.content
\ No newline at end of file
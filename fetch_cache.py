@@ -0,0 +1,121 @@
+# fetch_cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from langchain_core.documents import Document
+from url_utils import normalize_url
+
+
+class FetchCache:
+    """Persistent on-disk cache of loaded articles, keyed by normalized URL.
+
+    Entries hold the extracted documents together with the ETag/Last-Modified
+    validators of the original response. Fresh entries are served without any network
+    access; expired ones are revalidated with a conditional request. The total size is
+    bounded and the least recently used entries are evicted first.
+    """
+
+    def __init__(self, path=None, ttl=None, max_bytes=None):
+        self.path = path or os.getenv("FETCH_CACHE_PATH", "cache/fetch_cache.db")
+        self.ttl = ttl if ttl is not None else int(os.getenv("FETCH_CACHE_TTL", 24 * 3600))
+        self.max_bytes = max_bytes if max_bytes is not None else \
+            int(os.getenv("FETCH_CACHE_MAX_MB", 500)) * 1024 * 1024
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "evictions": 0}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fetch_cache (
+                key TEXT PRIMARY KEY,
+                documents TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_fetch_cache_last_access ON fetch_cache (last_access)")
+        self._conn.commit()
+
+    def get(self, url):
+        """Return the cached entry for a URL, or None.
+
+        The entry is a dict with `documents`, `etag`, `last_modified` and `fresh`
+        (False once the TTL has expired and the entry needs revalidation).
+        """
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT documents, etag, last_modified, fetched_at FROM fetch_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE fetch_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+            documents, etag, last_modified, fetched_at = row
+            fresh = now - fetched_at < self.ttl
+            self.stats["hits" if fresh else "stale"] += 1
+
+        return {
+            "documents": [Document(page_content=d["page_content"], metadata=d["metadata"])
+                          for d in json.loads(documents)],
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": fresh
+        }
+
+    def put(self, url, documents, etag=None, last_modified=None):
+        """Store the documents loaded from a URL and evict old entries if needed."""
+        key = normalize_url(url)
+        payload = json.dumps(
+            [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in documents],
+            ensure_ascii=False
+        )
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fetch_cache "
+                "(key, documents, etag, last_modified, fetched_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, payload, etag, last_modified, now, now, len(payload.encode("utf-8")))
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url):
+        """Mark an entry as fresh again after a successful revalidation (304)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE fetch_cache SET fetched_at = ?, last_access = ? WHERE key = ?",
+                (now, now, normalize_url(url))
+            )
+            self._conn.commit()
+            self.stats["revalidated"] += 1
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM fetch_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM fetch_cache ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM fetch_cache WHERE key = ?", (key,))
+            total -= size
+            self.stats["evictions"] += 1
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
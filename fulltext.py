@@ -0,0 +1,197 @@
+# fulltext.py
+import hashlib
+import re
+from sqlalchemy import text, select, literal, and_, table, column, String, Float
+from prefilter import normalize_text
+
+# Words too common to be worth indexing
+FRENCH_STOPWORDS = {
+    "a", "au", "aux", "avec", "ce", "ces", "dans", "de", "des", "du", "elle", "en", "et", "est", "il",
+    "ils", "la", "le", "les", "leur", "leurs", "mais", "ou", "par", "pas", "pour", "qu", "que", "qui",
+    "sa", "se", "ses", "son", "sur", "un", "une", "the", "and", "of", "to", "in", "for"
+}
+
+# Suffixes stripped by french_stem, longest first; text is already accent-free
+FRENCH_SUFFIXES = [
+    "issements", "issement", "ications", "ication", "atrices", "atrice", "ateurs", "ateur", "ations",
+    "ation", "ements", "ement", "ences", "ence", "ances", "ance", "ismes", "isme", "istes", "iste",
+    "iques", "ique", "euses", "euse", "ites", "ite", "ives", "ive", "ees", "ee", "er", "ez", "es", "e", "s", "x"
+]
+MIN_STEM_LENGTH = 4
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+SQLITE_TABLE = "ai_use_cases_fts"
+POSTGRES_TABLE = "ai_use_cases_search"
+
+# FTS5 rowids are signed 64-bit integers
+ROWID_MASK = (1 << 63) - 1
+
+
+def french_stem(word):
+    """Light French stemmer: strips one inflectional or derivational suffix.
+
+    Good enough to match "optimisation" with "optimiser" or "fraudes" with "fraude";
+    both indexed text and queries go through it, so the stems only need to agree.
+    """
+    if word.endswith("aux") and len(word) > 5:
+        return word[:-3] + "al"
+    for suffix in FRENCH_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)]
+    return word
+
+
+def search_terms(value):
+    """Stemmed, accent-free terms of a text or query, without stopwords."""
+    return [
+        french_stem(token) for token in TOKEN_PATTERN.findall(normalize_text(value or ""))
+        if len(token) > 1 and token not in FRENCH_STOPWORDS
+    ]
+
+
+def document_text(use_case):
+    """Searchable text of a use case dict: its description and list fields."""
+    parts = [use_case.get('usage_ia'), use_case.get('business_function')]
+    for field in ('processus_impacte', 'gains_attendus_realises', 'technologies_ia_utilisees',
+                  'partenaires_impliques'):
+        parts.extend(str(value) for value in use_case.get(field) or [])
+    return " ".join(part for part in parts if part)
+
+
+def fts_rowid(use_case_id):
+    """FTS5 rowid of a use case: its id hashed to 63 bits, so rows are found without a scan."""
+    return int(hashlib.sha256(use_case_id.encode("utf-8")).hexdigest()[:16], 16) & ROWID_MASK
+
+
+class SQLiteFullTextIndex:
+    """FTS5 table holding the stemmed text of each use case, ranked with bm25.
+
+    The use_case_id column is not indexed, so rows are keyed by fts_rowid(use_case_id)
+    and updates delete by rowid.
+    """
+
+    # Stored in the database: needs filling when created over existing rows
+    persistent = True
+
+    def create(self, connection):
+        # Tables built before rows were keyed by rowid are dropped, then rebuilt empty
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": SQLITE_TABLE}
+        ).first()
+        if exists:
+            first = connection.execute(text(f"SELECT rowid, use_case_id FROM {SQLITE_TABLE} LIMIT 1")).first()
+            if first is not None and first.rowid != fts_rowid(first.use_case_id):
+                connection.execute(text(f"DROP TABLE {SQLITE_TABLE}"))
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} "
+            "USING fts5(use_case_id UNINDEXED, content, tokenize='unicode61 remove_diacritics 2')"
+        ))
+
+    def count(self, connection):
+        return connection.execute(text(f"SELECT count(*) FROM {SQLITE_TABLE}")).scalar()
+
+    def replace(self, connection, documents):
+        """Index (or re-index) the given {use_case_id: text} documents."""
+        ids = list(documents)
+        if not ids:
+            return
+        rowids = {row_id: fts_rowid(row_id) for row_id in ids}
+        connection.execute(
+            text(f"DELETE FROM {SQLITE_TABLE} WHERE rowid = :rowid"),
+            [{"rowid": rowid} for rowid in rowids.values()]
+        )
+        connection.execute(
+            text(f"INSERT INTO {SQLITE_TABLE} (rowid, use_case_id, content) VALUES (:rowid, :id, :content)"),
+            [{"rowid": rowids[row_id], "id": row_id, "content": " ".join(search_terms(documents[row_id]))}
+             for row_id in ids]
+        )
+
+    def ranked(self, query):
+        """Subquery of (use_case_id, rank) matching every term of the query; lower rank is better."""
+        terms = search_terms(query)
+        if not terms:
+            return None
+        # Prefix queries absorb the suffixes the light stemmer leaves in place
+        match = " ".join(f'"{term}"*' for term in terms)
+        return text(
+            f"SELECT use_case_id, bm25({SQLITE_TABLE}) AS rank FROM {SQLITE_TABLE} "
+            f"WHERE {SQLITE_TABLE} MATCH :match"
+        ).bindparams(match=match).columns(use_case_id=String, rank=Float).subquery()
+
+
+class PostgresFullTextIndex:
+    """Side table with a GIN-indexed tsvector built by PostgreSQL's French configuration."""
+
+    persistent = True
+
+    def create(self, connection):
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {POSTGRES_TABLE} ("
+            "use_case_id VARCHAR(64) PRIMARY KEY REFERENCES ai_use_cases(id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        ))
+        connection.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{POSTGRES_TABLE}_document ON {POSTGRES_TABLE} USING GIN (document)"
+        ))
+
+    def count(self, connection):
+        return connection.execute(text(f"SELECT count(*) FROM {POSTGRES_TABLE}")).scalar()
+
+    def replace(self, connection, documents):
+        """Index (or re-index) the given {use_case_id: text} documents."""
+        if not documents:
+            return
+        # Accents are removed beforehand so that queries typed without them still match
+        connection.execute(
+            text(
+                f"INSERT INTO {POSTGRES_TABLE} (use_case_id, document) "
+                "VALUES (:id, to_tsvector('french', :content)) "
+                "ON CONFLICT (use_case_id) DO UPDATE SET document = excluded.document"
+            ),
+            [{"id": row_id, "content": normalize_text(content)} for row_id, content in documents.items()]
+        )
+
+    def ranked(self, query):
+        """Subquery of (use_case_id, rank) matching every term of the query; lower rank is better."""
+        if not search_terms(query):
+            return None
+        return text(
+            f"SELECT use_case_id, -ts_rank_cd(document, plainto_tsquery('french', :query)) AS rank "
+            f"FROM {POSTGRES_TABLE} WHERE document @@ plainto_tsquery('french', :query)"
+        ).bindparams(query=normalize_text(query)).columns(use_case_id=String, rank=Float).subquery()
+
+
+class ScanFullTextIndex:
+    """Fallback for other dialects: no index, every term must appear in the description."""
+
+    # Nothing is stored, so there is nothing to build or keep in sync
+    persistent = False
+
+    def create(self, connection):
+        pass
+
+    def count(self, connection):
+        return 0
+
+    def replace(self, connection, documents):
+        pass
+
+    def ranked(self, query):
+        words = [word for word in TOKEN_PATTERN.findall(normalize_text(query or "")) if len(word) > 1]
+        if not words:
+            return None
+        use_cases = table("ai_use_cases", column("id"), column("usage_ia"))
+        return select(use_cases.c.id.label("use_case_id"), literal(0.0).label("rank")).where(
+            and_(*[use_cases.c.usage_ia.ilike(f"%{word}%") for word in words])
+        ).subquery()
+
+
+def create_fulltext_index(bind):
+    """Full-text index suited to the dialect of the engine."""
+    dialect = bind.dialect.name
+    if dialect == "sqlite":
+        return SQLiteFullTextIndex()
+    if dialect == "postgresql":
+        return PostgresFullTextIndex()
+    return ScanFullTextIndex()
@@ -1,13 +1,22 @@
 # google_custom_search.py
-import requests
 import os
 from dotenv import load_dotenv
+from http_client import get_client
+from rate_limit import get_limiter
+from search_base import BaseSearchTool
 
 load_dotenv()
 
 
-class GoogleCustomSearch:
-    def __init__(self):
+class GoogleCustomSearch(BaseSearchTool):
+    provider = "google_cse"
+    # At most 10 results per request, and only the first 100 results of a query
+    page_size = 10
+    max_results = 100
+
+    def __init__(self, http=None):
+        self.http = http or get_client()
+        self.limiter = get_limiter(self.provider)
         self.api_key = os.getenv("GOOGLE_API_KEY")
         self.cx = os.getenv("GOOGLE_CSE_ID")  # Custom Search Engine ID
 
@@ -15,44 +24,33 @@ class GoogleCustomSearch:
             print("Warning: GOOGLE_API_KEY or GOOGLE_CSE_ID not found in environment variables.")
             print("Please set up a Google Custom Search Engine at https://programmablesearchengine.google.com/")
 
-    def search_industry_ai_cases(self, industry, num_results=5):
-        """Search for AI use cases in a specific industry using Google Custom Search."""
-        query = f"cas d'utilisation IA intelligence artificielle dans {industry} études de cas exemples France Europe"
-
+    def search_page(self, query, start, count):
+        """Fetch one page of Google Custom Search results, starting at result `start` (0-based)."""
         # Set up the search parameters
         params = {
             "key": self.api_key,
             "cx": self.cx,
             "q": query,
-            "num": min(num_results, 10),  # Google CSE allows max 10 results per request
+            "num": count,
+            "start": start + 1,  # 1-based offset of the first result
             "lr": "lang_fr",  # Restrict to French language
             "gl": "fr"  # Set geolocation to France
         }
 
-        try:
-            response = requests.get("https://www.googleapis.com/customsearch/v1", params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            results = []
-            for item in data.get("items", []):
-                results.append({
-                    "title": item.get("title", ""),
-                    "link": item.get("link", ""),
-                    "snippet": item.get("snippet", "")
-                })
-
-            return results
+        response = self.http.get("https://www.googleapis.com/customsearch/v1", params=params, limiter=self.limiter)
+        response.raise_for_status()
+        data = response.json()
 
-        except Exception as e:
-            print(f"Error searching with Google Custom Search: {e}")
-            return []
+        results = []
+        for item in data.get("items", []):
+            results.append({
+                "title": item.get("title", ""),
+                "link": item.get("link", ""),
+                "snippet": item.get("snippet", "")
+            })
 
-    def search_specific_case(self, industry, specific_case):
-        """Search for a specific AI use case in an industry."""
-        query = f"{specific_case} implémentation IA dans {industry} résultats métriques"
-        return self.search_industry_ai_cases(query, 3)
+        return results
 
 # Usage example:
 # search_tool = GoogleCustomSearch()
-# results = search_tool.search_industry_ai_cases("finance", 5)
\ No newline at end of file
+# results = search_tool.search_industry_ai_cases("finance", 5)
@@ -1,12 +1,20 @@
 # google_search.py
-import requests
 from bs4 import BeautifulSoup
 import random
-import time
+from http_client import get_client
+from rate_limit import get_limiter
+from search_base import BaseSearchTool
 
 
-class SimpleSearchTool:
-    def __init__(self):
+class SimpleSearchTool(BaseSearchTool):
+    provider = "google_scraper"
+    page_size = 10
+    max_results = 100
+
+    def __init__(self, http=None):
+        self.http = http or get_client()
+        # Replaces a fixed one-second pause after every query
+        self.limiter = get_limiter(self.provider)
         # List of user agents to rotate
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -18,18 +26,14 @@ class SimpleSearchTool:
     def _get_random_user_agent(self):
         return random.choice(self.user_agents)
 
-    def search_industry_ai_cases(self, industry, num_results=5):
-        """Search for AI use cases in a specific industry using Google."""
-        query = f"cas d'utilisation IA intelligence artificielle dans {industry} études de cas exemples France Europe"
+    def search_page(self, query, start, count):
+        """Scrape one Google results page, starting at result `start` (0-based)."""
         encoded_query = '+'.join(query.split())
-        url = f"https://www.google.com/search?q={encoded_query}&num={num_results + 5}&hl=fr"
+        url = f"https://www.google.com/search?q={encoded_query}&num={self.page_size}&start={start}&hl=fr"
 
         headers = {'User-Agent': self._get_random_user_agent()}
-        response = requests.get(url, headers=headers)
-
-        if response.status_code != 200:
-            print(f"Error: Status code {response.status_code}")
-            return []
+        response = self.http.get(url, headers=headers, limiter=self.limiter)
+        response.raise_for_status()
 
         soup = BeautifulSoup(response.text, 'html.parser')
         search_results = []
@@ -57,20 +61,11 @@ class SimpleSearchTool:
                     'snippet': snippet
                 })
 
-            if len(search_results) >= num_results:
+            if len(search_results) >= count:
                 break
 
-        # Add a small delay to avoid rate limiting
-        time.sleep(1)
         return search_results
 
-    def search_specific_case(self, industry, specific_case, num_results=3):
-        """Search for a specific AI use case in an industry."""
-        query = f"{specific_case} implémentation IA dans {industry} résultats métriques"
-
-        # Reuse the same search method with different query
-        return self.search_industry_ai_cases(query, num_results)
-
 # Usage example:
 # search_tool = SimpleSearchTool()
 # results = search_tool.search_industry_ai_cases("finance", 5)
\ No newline at end of file
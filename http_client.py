@@ -0,0 +1,173 @@
+# http_client.py
+import email.utils
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Transient statuses worth another attempt
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ResponseTooLarge(requests.RequestException):
+    """Raised when a response body is bigger than the allowed size."""
+
+
+def retry_after_seconds(response):
+    """Delay requested by a Retry-After header (seconds or HTTP date), or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def read_limited(response, max_bytes):
+    """Read a streamed response body, failing as soon as it grows past `max_bytes`.
+
+    The body is stored on the response, so `.content`, `.text` and `.json()` work afterwards.
+    """
+    declared = response.headers.get("Content-Length")
+    if max_bytes and declared and declared.isdigit() and int(declared) > max_bytes:
+        response.close()
+        raise ResponseTooLarge(f"{response.url} is {declared} bytes, over the {max_bytes} byte limit")
+
+    chunks = []
+    size = 0
+    try:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise ResponseTooLarge(f"{response.url} exceeds the {max_bytes} byte limit")
+            chunks.append(chunk)
+    finally:
+        response.close()
+    response._content = b"".join(chunks)
+    return response
+
+
+class HttpClient:
+    """Pooled HTTP session shared by the search tools and the article loader.
+
+    Connections are kept alive in one pool per host. Every request gets a
+    (connect, read) timeout and is retried with exponential backoff and jitter on
+    connection errors, timeouts, 429 and 5xx answers; a Retry-After header sets the
+    minimum wait. Bodies of non-streamed responses are capped at `max_bytes`.
+    """
+
+    def __init__(self, connect_timeout=None, read_timeout=None, max_retries=None, backoff=None,
+                 max_backoff=None, pool_size=None, max_bytes=None):
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else float(os.getenv("HTTP_CONNECT_TIMEOUT", 5)),
+            read_timeout if read_timeout is not None else float(os.getenv("HTTP_READ_TIMEOUT", 30)),
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("HTTP_MAX_RETRIES", 3))
+        self.backoff = backoff if backoff is not None else float(os.getenv("HTTP_BACKOFF", 0.5))
+        self.max_backoff = max_backoff if max_backoff is not None else float(os.getenv("HTTP_MAX_BACKOFF", 30))
+        self.max_bytes = max_bytes if max_bytes is not None else (
+            int(os.getenv("HTTP_MAX_RESPONSE_MB", 10)) * 1024 * 1024
+        )
+        pool_size = pool_size or int(os.getenv("HTTP_POOL_SIZE", 10))
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = os.getenv(
+            "USER_AGENT", "Mozilla/5.0 (compatible; ai-industry-benchmark)"
+        )
+        # pool_connections is the number of hosts kept, pool_maxsize the connections per host
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _delay(self, attempt, response=None):
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        if response is not None:
+            requested = retry_after_seconds(response)
+            if requested is not None:
+                delay = max(delay, min(requested, self.max_backoff))
+        return delay
+
+    def _send(self, method, url, limiter, **kwargs):
+        """One attempt, holding a slot of the provider's rate limiter if there is one."""
+        if limiter is None:
+            return self.session.request(method, url, **kwargs)
+        limiter.acquire()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            limiter.release()
+            raise
+        throttled = response.status_code == 429
+        limiter.release(throttled=throttled, retry_after=retry_after_seconds(response) if throttled else None)
+        return response
+
+    def request(self, method, url, max_bytes=None, limiter=None, **kwargs):
+        """Send a request with retries; returns the final response, whatever its status.
+
+        Streamed responses (stream=True) are returned unread, and the caller enforces
+        its own size limit; other bodies are read up to `max_bytes` (default: the
+        client's limit). `limiter` (a rate_limit.ProviderLimiter) paces the attempts.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        stream = kwargs.pop("stream", False)
+        limit = self.max_bytes if max_bytes is None else max_bytes
+
+        for attempt in range(self.max_retries + 1):
+            self._count("requests")
+            try:
+                response = self._send(method, url, limiter, stream=True, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                time.sleep(self._delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._delay(attempt, response)
+                response.close()
+                self._count("retries")
+                time.sleep(delay)
+                continue
+
+            if response.status_code in RETRY_STATUSES:
+                self._count("failures")
+            return response if stream else read_limited(response, limit)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide HttpClient, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
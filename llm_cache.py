@@ -0,0 +1,115 @@
+# llm_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+# generation_info key set on generations served from the cache
+CACHE_HIT_KEY = "cache_hit"
+
+
+class LLMCache(BaseCache):
+    """Persistent memoization of LLM responses, shared by IndustryAnalyzer and QualityEnhancer.
+
+    Plugged into ChatOpenAI through its `cache` parameter. LangChain passes the model
+    configuration (model name, temperature, ...) as `llm_string` and the serialized
+    messages as `prompt`; both are hashed into the key. Entries expire after a TTL and
+    the least recently used ones are evicted above `max_entries`.
+    """
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        self.path = path or os.getenv("LLM_CACHE_PATH", "cache/llm_cache.db")
+        self.ttl = ttl if ttl is not None else int(os.getenv("LLM_CACHE_TTL", 30 * 24 * 3600))
+        self.max_entries = max_entries if max_entries is not None else \
+            int(os.getenv("LLM_CACHE_MAX_ENTRIES", 20000))
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "tokens_saved": 0}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                generations TEXT NOT NULL,
+                tokens INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_access ON llm_cache (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def _key(prompt, llm_string):
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _count_tokens(generations):
+        total = 0
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            total += usage.get("total_tokens", 0)
+        return total
+
+    def lookup(self, prompt, llm_string):
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generations, tokens, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[2] >= self.ttl:
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.stats["hits"] += 1
+            self.stats["tokens_saved"] += row[1]
+
+        generations = [loads(item) for item in json.loads(row[0])]
+        # Tag the hit so callbacks (RunMetrics) can tell it from a paid call
+        for generation in generations:
+            generation.generation_info = {**(generation.generation_info or {}), CACHE_HIT_KEY: True}
+        return generations
+
+    def update(self, prompt, llm_string, return_val):
+        key = self._key(prompt, llm_string)
+        payload = json.dumps([dumps(generation) for generation in return_val])
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, generations, tokens, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, self._count_tokens(return_val), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def clear(self, **kwargs):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN "
+            "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+            (excess,)
+        )
+        self.stats["evictions"] += excess
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
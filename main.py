@@ -3,131 +3,394 @@ import os
 import json
 import argparse
 import csv
-import importlib.util
-from processors import ArticleProcessor
-from benchmarks import IndustryAnalyzer
+import time
+import importlib
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from processors import ArticleLoadError, ArticleProcessor
+from benchmarks import IndustryAnalyzer, AIUseCase, AIUseCaseAnalysis
 from enrichment import QualityEnhancer
-from database import DatabaseManager
+from database import DatabaseManager, use_case_id
+from pipeline import StagedPipeline, Stage
+from fetch_cache import FetchCache
+from llm_cache import LLMCache
+from search_base import CachedSearchTool, SearchCache
+from multi_search import MultiSearchTool
+from prefilter import SearchResultPrefilter
+from dedup import NearDuplicateDetector
+from metrics import RunMetrics, write_run_report
+from rate_limit import limiter_stats
+from run_journal import RunJournal
+from url_utils import canonical_url
 from dotenv import load_dotenv
 
 
-# Function to dynamically load a search class based on available modules/api keys
-def get_search_tool():
-    # Check for Google Custom Search API key first (recommended)
-    # if os.getenv("GOOGLE_API_KEY") and os.getenv("GOOGLE_CSE_ID"):
-    #     try:
-    #         from google_custom_search import GoogleCustomSearch
-    #         print("Using Google Custom Search API")
-    #         return GoogleCustomSearch()
-    #     except ImportError:
-    #         print("Google Custom Search module not found. Falling back to other options.")
-
-    # Check for Tavily API key
-    if os.getenv("TAVILY_API_KEY"):
+# Search providers: module, class, and whether their credentials are configured
+SEARCH_PROVIDERS = {
+    "tavily": ("tavily_search", "TavilySearchTool", lambda: os.getenv("TAVILY_API_KEY")),
+    "google_cse": ("google_custom_search", "GoogleCustomSearch",
+                   lambda: os.getenv("GOOGLE_API_KEY") and os.getenv("GOOGLE_CSE_ID")),
+    "serpapi": ("search_utils", "IndustrySearchTool", lambda: os.getenv("SERPAPI_API_KEY")),
+    # Scraping fallback, no API key required
+    "google_scraper": ("google_search", "SimpleSearchTool", lambda: True),
+}
+
+
+def get_search_tools():
+    """Instantiate every configured search provider, in order of preference.
+
+    SEARCH_PROVIDERS (comma-separated names) selects and orders the candidates.
+    """
+    names = [name.strip() for name in os.getenv("SEARCH_PROVIDERS", ",".join(SEARCH_PROVIDERS)).split(",")
+             if name.strip()]
+    tools = []
+    for name in names:
+        if name not in SEARCH_PROVIDERS:
+            print(f"Unknown search provider {name!r}, ignored.")
+            continue
+        module_name, class_name, configured = SEARCH_PROVIDERS[name]
+        if not configured():
+            continue
         try:
-            from tavily_search import TavilySearchTool
-            print("Using Tavily AI Search")
-            return TavilySearchTool()
-        except ImportError:
-            print("Tavily search module not found. Falling back to other options.")
-
-    # Check for SerpAPI key
-    # if os.getenv("SERPAPI_API_KEY"):
-    #     try:
-    #         from search_utils import IndustrySearchTool
-    #         print("Using SerpAPI for search")
-    #         return IndustrySearchTool()
-    #     except ImportError:
-    #         print("SerpAPI module not found. Falling back to other options.")
-
-    # Try to load DuckDuckGo
-    try:
-        spec = importlib.util.find_spec('duckduckgo_search')
-        if spec:
-            from duckduckgo_alternative import IndustrySearchTool
-            print("Using DuckDuckGo for search")
-            return IndustrySearchTool()
-    except:
-        print("DuckDuckGo search module not available. Falling back to basic search.")
-
-    # Finally, use the simple Google search as fallback
-    try:
-        from google_search import SimpleSearchTool
-        print("Using Simple Google Search (no API key required)")
-        return SimpleSearchTool()
-    except ImportError:
-        print("Simple search module not found.")
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            print(f"Search provider {name} not available: {e}")
+            continue
+        tools.append(getattr(module, class_name)())
+
+    if not tools:
         raise ImportError("No search module available. Please install at least one search option.")
+    print(f"Searching with: {', '.join(tool.provider for tool in tools)}")
+    return tools
 
 
-load_dotenv()
+def get_search_tool(search_cache=None):
+    """One search tool over every configured provider, each cached in `search_cache` if given."""
+    tools = get_search_tools()
+    if search_cache is not None:
+        tools = [CachedSearchTool(tool, search_cache) for tool in tools]
+    return tools[0] if len(tools) == 1 else MultiSearchTool(tools)
 
 
-def run_industry_benchmark(industry, cases_per_industry=5):
-    """Run the benchmark process for a specified industry."""
-    print(f"Processing industry: {industry}")
+load_dotenv()
 
-    # Initialize tools
-    search_tool = get_search_tool()
-    processor = ArticleProcessor()
-    analyzer = IndustryAnalyzer()
-    enhancer = QualityEnhancer()
-    db_manager = DatabaseManager()
 
-    industry_results = []
+def create_tools(use_cache=True):
+    """Create the search, processing and storage tools used by a benchmark run.
+
+    The returned instances hold the HTTP and LLM clients, so a batch run creates them
+    once and shares them between all industries.
+    """
+    # Providers are cached one by one, so answers arriving after a hedged search still count
+    search_cache = SearchCache() if use_cache else None
+    llm_cache = LLMCache() if use_cache else None
+    metrics = RunMetrics()
+    return {
+        "search_tool": get_search_tool(search_cache),
+        "search_cache": search_cache,
+        "processor": ArticleProcessor(
+            cache=FetchCache() if use_cache else None,
+            # PDF text extraction is CPU bound, so it runs in separate processes
+            pdf_executor=ProcessPoolExecutor(
+                max_workers=int(os.getenv("PDF_WORKERS", 2)),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        ),
+        "analyzer": IndustryAnalyzer(llm_cache=llm_cache, metrics=metrics),
+        "enhancer": QualityEnhancer(llm_cache=llm_cache, metrics=metrics),
+        "db_manager": DatabaseManager(),
+        # Persistent across runs and industries, like the database
+        "dedup": NearDuplicateDetector(),
+        "metrics": metrics,
+    }
 
-    # Search for articles about AI in this industry
-    search_results = search_tool.search_industry_ai_cases(industry, num_results=cases_per_industry)
 
-    if not search_results:
-        print(f"No search results found for industry: {industry}")
-        return {"use_cases": [], "benchmark": "No data available for benchmarking."}
+def close_tools(tools):
+    """Release what create_tools opened: worker pools first, then the cache connections."""
+    processor = tools.get("processor")
+    pdf_executor = getattr(processor, "pdf_executor", None)
+    if pdf_executor is not None:
+        pdf_executor.shutdown(wait=True, cancel_futures=True)
+    # Waits for late provider answers, which may still be writing to the search cache
+    close_search = getattr(tools.get("search_tool"), "close", None)
+    if close_search is not None:
+        close_search()
+    caches = [getattr(processor, "cache", None), tools.get("search_cache"),
+              getattr(tools.get("analyzer"), "llm_cache", None)]
+    for cache in caches:
+        if cache is not None:
+            cache.close()
+
+
+def run_industry_benchmark(industry, cases_per_industry=5, concurrency=4, tools=None, **options):
+    """Run the benchmark process for a specified industry.
+
+    Articles already processed for this industry in an earlier run are skipped
+    unless `refresh` is set. With a `journal`, the search results and every stage
+    output are recorded under `run_id` as they complete, and whatever that run
+    already completed is reused instead of being computed again.
+
+    Without `tools`, a set is created for this run and closed when it ends.
+    """
+    if tools is not None:
+        return _run_industry_benchmark(industry, cases_per_industry, concurrency, tools, **options)
+    tools = create_tools()
+    try:
+        return _run_industry_benchmark(industry, cases_per_industry, concurrency, tools, **options)
+    finally:
+        close_tools(tools)
 
-    for result in search_results:
-        # Check if this is a valid result with a link
-        if not isinstance(result, dict):
-            print(f"  Skipping invalid result format: {result}")
-            continue
 
-        url = result.get('link')
-        if not url or not isinstance(url, str) or not url.startswith('http'):
-            print(f"  Skipping invalid URL: {url}")
-            continue
+def _run_industry_benchmark(industry, cases_per_industry, concurrency, tools, relevance_batch_size=10,
+                            prefilter=True, single_pass=False, refresh=False, journal=None, run_id=None):
+    print(f"Processing industry: {industry}")
+    run_started = time.time()
+
+    checkpoints = {}
+    recorded_search = None
+    if journal is not None:
+        finished = journal.industry_results(run_id, industry)
+        if finished is not None:
+            print(f"  Already completed in run {run_id}, skipped")
+            return finished
+        checkpoints = journal.stage_outputs(run_id, industry)
+        recorded_search = journal.search_pages(run_id, industry)
+        if checkpoints or recorded_search is not None:
+            print(f"  Resuming run {run_id}: {len(checkpoints)} completed article stages"
+                  f"{', search results recorded' if recorded_search is not None else ''}")
 
+    # Initialize tools
+    search_tool = tools["search_tool"]
+    processor = tools["processor"]
+    analyzer = tools["analyzer"]
+    enhancer = tools["enhancer"]
+    db_manager = tools["db_manager"]
+    dedup = tools.get("dedup")
+    metrics = tools.get("metrics") or RunMetrics()
+
+    search_results = []
+    tasks = []
+    skipped_articles = 0
+    fetch_failures = []
+    prefilter_stats = {"candidates": 0, "kept": 0, "fetches_saved": 0, "llm_relevance_checks_saved": 0}
+    seen_urls = set()
+    result_filter = SearchResultPrefilter(industry) if prefilter else None
+
+    def candidate_tasks():
+        """Turn search result pages into tasks as they arrive, so fetching starts during the search."""
+        nonlocal skipped_articles
+        search_started = time.perf_counter()
+        failed = True
         try:
-            print(f"  Processing article: {url}")
-
-            # Load and process the article
-            documents = processor.load_article(url)
-            article_content = " ".join([doc.page_content for doc in documents])
-
-            # Check content relevance before in-depth analysis
-            if enhancer.filter_relevance(article_content, industry):
-                # Extract structured information about the use case
-                use_case_info = analyzer.analyze_article_content(article_content, url, industry)
-
-                # Verify information coherence
-                coherence = enhancer.verify_coherence(use_case_info, industry)
-                print(f"  Coherence check: {coherence}")
-
-                # Enrich information if needed
-                enrichment = enhancer.enrich_information(use_case_info, industry)
-                print(f"  Enrichment: {enrichment}")
-
-                industry_results.append(use_case_info)
-                print(f"  Article processed successfully: {url}")
+            if recorded_search is not None:
+                pages = iter(recorded_search)
             else:
-                print(f"  Article not relevant for analysis, skipped.")
-        except Exception as e:
-            print(f"  Error processing {url}: {str(e)}")
+                if journal is not None:
+                    journal.reset_search(run_id, industry)
+                # Search for articles about AI in this industry, page by page
+                pages = search_tool.iter_industry_ai_cases(industry, num_results=cases_per_industry)
+            for page in pages:
+                if journal is not None and recorded_search is None:
+                    journal.record_search_page(run_id, industry, page)
+                search_results.extend(page)
+                page_tasks = []
+                for result in page:
+                    # Check if this is a valid result with a link
+                    if not isinstance(result, dict):
+                        print(f"  Skipping invalid result format: {result}")
+                        continue
+
+                    url = result.get('link')
+                    if not url or not isinstance(url, str) or not url.startswith('http'):
+                        print(f"  Skipping invalid URL: {url}")
+                        continue
+
+                    # The same article often comes back under several URL spellings
+                    key = canonical_url(url)
+                    if key in seen_urls:
+                        continue
+                    seen_urls.add(key)
+                    page_tasks.append({"url": url, "result": result})
+
+                if not refresh and page_tasks:
+                    processed = db_manager.get_processed_urls(industry, [task["url"] for task in page_tasks])
+                    page_tasks = [task for task in page_tasks if task["url"] not in processed]
+                    skipped_articles += len(processed)
+
+                if result_filter is not None and page_tasks:
+                    # Rank candidates locally and drop obvious misses before any fetch or LLM call
+                    ranked = result_filter.rank([task["result"] for task in page_tasks])
+                    page_tasks = [{"url": result["link"], "result": result} for result in ranked]
+                    for key in prefilter_stats:
+                        prefilter_stats[key] += result_filter.stats[key]
+
+                tasks.extend(page_tasks)
+                yield from page_tasks
+            if journal is not None and recorded_search is None:
+                journal.finish_search(run_id, industry)
+            failed = False
+        finally:
+            metrics.record_stage(industry, "search", time.perf_counter() - search_started,
+                                 items=len(search_results), failed=failed)
+
+    def fetch(task):
+        print(f"  Processing article: {task['url']}")
+        try:
+            documents = processor.load_article(task["url"])
+        except ArticleLoadError:
+            # Never judged, so never marked processed: the article is fetched again next run
+            task["fetch_failed"] = True
+            fetch_failures.append(task["url"])
+            raise
+        if dedup is not None:
+            # Syndicated copies of an article already seen cost no further LLM call
+            original = dedup.check(task["url"], "\n".join(doc.page_content for doc in documents))
+            if original:
+                print(f"  Near-duplicate of {original}, skipped: {task['url']}")
+                return None
+        # Keep only the most relevant parts of long articles within the token budget
+        task["content"] = processor.reduce_content(documents, industry)
+        return task
+
+    def checkpointed(stage, func, dump, restore):
+        """Reuse the journaled output of `stage` for an article, or run it and journal the output.
+
+        A stage that raises (a failed download, an LLM error) is not journaled, so
+        resuming the run tries it again instead of replaying the failure.
+        """
+        def run(task):
+            key = (task["url"], stage)
+            if key in checkpoints:
+                output = checkpoints[key]
+                return None if output is None else restore(task, output)
+            result = func(task)
+            if journal is not None:
+                journal.record_stage(run_id, industry, task["url"], stage, None if result is None else dump(result))
+            return result
+        return run
+
+    def restore_content(task, output):
+        task["content"] = output["content"]
+        return task
+
+    def restore_use_case(task, output):
+        task["use_case"] = (AIUseCaseAnalysis if single_pass else AIUseCase)(**output["use_case"])
+        return task
+
+    def relevance(batch):
+        # Check content relevance before in-depth analysis, several articles per LLM call
+        # Verdicts journaled by the resumed run are reused, the others are asked for
+        verdicts = {task["url"]: checkpoints[(task["url"], "relevance")] for task in batch
+                    if (task["url"], "relevance") in checkpoints}
+        todo = [task for task in batch if task["url"] not in verdicts]
+        if todo:
+            new_verdicts = enhancer.filter_relevance_batch([task["content"] for task in todo], industry,
+                                                           batch_size=relevance_batch_size)
+            for task, verdict in zip(todo, new_verdicts):
+                verdicts[task["url"]] = verdict
+                if journal is not None:
+                    journal.record_stage(run_id, industry, task["url"], "relevance", verdict)
+
+        kept = []
+        for task in batch:
+            verdict = verdicts[task["url"]]
+            task["relevance"] = verdict
+            if verdict["relevant"]:
+                kept.append(task)
+            else:
+                print(f"  Article not relevant for analysis (confidence {verdict['confidence']}), skipped: {task['url']}")
+                kept.append(None)
+        return kept
+
+    def extraction(task):
+        # Extract structured information about the use case
+        task["use_case"] = analyzer.analyze_article_content(task["content"], task["url"], industry)
+        return task
+
+    def single_pass_extraction(task):
+        # Extract, verify and enrich the use case in a single LLM call
+        use_case = analyzer.analyze_article_single_pass(task["content"], task["url"], industry)
+        task["use_case"] = use_case
+        print(f"  Coherence check ({task['url']}): {use_case.incoherences or 'Informations cohérentes'}")
+        if use_case.champs_estimes:
+            print(f"  Estimated fields ({task['url']}): {', '.join(use_case.champs_estimes)}")
+        print(f"  Article processed successfully: {task['url']}")
+        return task
+
+    def verification(task):
+        # Verify information coherence
+        coherence = enhancer.verify_coherence(task["use_case"], industry)
+        print(f"  Coherence check ({task['url']}): {coherence}")
+
+        # Enrich information if needed
+        enrichment = enhancer.enrich_information(task["use_case"], industry)
+        print(f"  Enrichment ({task['url']}): {enrichment}")
+
+        print(f"  Article processed successfully: {task['url']}")
+        return task
+
+    dump_content = lambda task: {"content": task["content"]}
+    dump_use_case = lambda task: {"use_case": task["use_case"].model_dump()}
+    stages = [
+        Stage("fetch", checkpointed("fetch", fetch, dump_content, restore_content), workers=concurrency),
+        Stage("relevance", relevance, workers=concurrency, batch_size=relevance_batch_size),
+    ]
+    if single_pass:
+        stages.append(Stage("extraction", checkpointed("extraction", single_pass_extraction, dump_use_case,
+                                                       restore_use_case), workers=concurrency))
+    else:
+        stages.append(Stage("extraction", checkpointed("extraction", extraction, dump_use_case, restore_use_case),
+                            workers=concurrency))
+        stages.append(Stage("verification", checkpointed("verification", verification, lambda task: {},
+                                                         lambda task, output: task), workers=concurrency))
+
+    pipeline = StagedPipeline(
+        stages,
+        on_error=lambda task, stage, e: print(f"  Error processing {task['url']} ({stage}): {str(e)}"),
+        on_stage=lambda stage, seconds, items, failed: metrics.record_stage(industry, stage, seconds, items, failed)
+    )
+    completed = [task for task in pipeline.run(candidate_tasks()) if task is not None]
+    industry_results = [task["use_case"] for task in completed]
+
+    if not search_results:
+        print(f"No search results found for industry: {industry}")
+        return {"use_cases": [], "benchmark": "No data available for benchmarking."}
+    if skipped_articles:
+        print(f"  Skipped {skipped_articles} articles already processed in a previous run "
+              f"(use --refresh to process them again)")
+    if prefilter:
+        print(f"  Pre-filter: kept {prefilter_stats['kept']} of {prefilter_stats['candidates']} results, "
+              f"saved {prefilter_stats['fetches_saved']} fetches and "
+              f"{prefilter_stats['llm_relevance_checks_saved']} LLM relevance checks")
+
+    cache_stats = {}
+    search_cache = tools.get("search_cache") or getattr(search_tool, "cache", None)
+    if isinstance(search_cache, SearchCache):
+        cache_stats["search"] = dict(search_cache.stats)
+        print(f"  Search cache: {search_cache.stats}")
+    if processor.cache is not None:
+        cache_stats["fetch"] = dict(processor.cache.stats)
+        print(f"  Fetch cache: {processor.cache.stats}")
+    provider_stats = search_tool.provider_stats() if isinstance(search_tool, MultiSearchTool) else {}
+    for provider, stats in provider_stats.items():
+        print(f"  Search {provider}: {stats['calls']} calls, {stats['errors']} errors, {stats['late']} late, "
+              f"p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms")
+    if dedup is not None:
+        cache_stats["near_duplicates"] = dict(dedup.stats)
+        print(f"  Near-duplicates: {dedup.stats}")
+    if isinstance(analyzer.llm_cache, LLMCache):
+        cache_stats["llm"] = dict(analyzer.llm_cache.stats)
+        print(f"  LLM cache: {analyzer.llm_cache.stats}")
 
     # Perform industry-specific benchmarking
-    industry_benchmark = analyzer.compare_industry_use_cases(industry_results, industry)
+    with metrics.timed(industry, "comparison"):
+        industry_benchmark = analyzer.compare_industry_use_cases(industry_results, industry)
 
     # Store results
     results = {
         "use_cases": [uc.model_dump() for uc in industry_results],
-        "benchmark": industry_benchmark.content
+        "benchmark": industry_benchmark.content,
+        "skipped_articles": skipped_articles
     }
 
     # Create output directory if it doesn't exist
@@ -144,7 +407,7 @@ def run_industry_benchmark(industry, cases_per_industry=5):
                 "industry", "business_function", "entreprise", "origine_de_la_source",
                 "lien", "derniere_mise_a_jour", "processus_impacte", "valeur_economique",
                 "gains_attendus_realises", "usage_ia", "technologies_ia_utilisees",
-                "partenaires_impliques"
+                "partenaires_impliques", "incoherences", "champs_estimes"
             ]
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
@@ -160,29 +423,217 @@ def run_industry_benchmark(industry, cases_per_industry=5):
     # Save results to database
     if industry_results:
         use_cases_to_save = [uc.model_dump() for uc in industry_results]
-        saved_count = db_manager.save_use_cases(use_cases_to_save)
-        print(f"  Saved {saved_count} use cases to database")
-
+        with metrics.timed(industry, "save"):
+            counts = db_manager.upsert_use_cases(use_cases_to_save)
+        print(f"  Saved use cases to database: {counts['inserted']} inserted, "
+              f"{counts['updated']} updated, {counts['skipped']} skipped")
+
+    # Remember the articles that went all the way through, so the next run skips them.
+    # Articles that failed (including failed downloads) are left out and retried next time.
+    statuses = {
+        task["url"]: "not_relevant" for task in tasks
+        if not task.get("fetch_failed") and task.get("relevance") and not task["relevance"]["relevant"]
+    }
+    if industry_results:
+        # Only the use cases actually written: invalid ones, or a failed batch, are retried next run
+        saved_ids = set(counts['ids'])
+        statuses.update({task["url"]: "saved" for task in completed
+                         if use_case_id(task["use_case"].lien) in saved_ids})
+    db_manager.mark_urls_processed(industry, statuses)
+
+    # Structured report of where the time and the tokens went
+    report = metrics.report(industry)
+    report.update({
+        "started_at": run_started,
+        "duration_seconds": round(time.time() - run_started, 3),
+        "articles": {
+            "search_results": len(search_results),
+            "skipped": skipped_articles,
+            "processed": len(tasks),
+            "fetch_failed": len(fetch_failures),
+            "use_cases": len(industry_results),
+        },
+        "caches": cache_stats,
+        "search_providers": provider_stats,
+        "rate_limits": limiter_stats(),
+    })
+    write_run_report(report, f"output/run_report_{industry}.json")
+    totals = report["llm_totals"]
+    print(f"  LLM usage: {totals['calls']} calls, {totals['prompt_tokens']} prompt and "
+          f"{totals['completion_tokens']} completion tokens, {totals['cache_hits']} cache hits, "
+          f"~${totals['cost_usd']:.4f}")
+
+    if journal is not None:
+        journal.finish_industry(run_id, industry, results)
     print(f"Benchmark for {industry} completed successfully!")
     return results
 
 
+def run_batch_benchmark(industries, cases_per_industry=5, parallel_industries=2, use_cache=True, **options):
+    """Run the benchmark for several industries in parallel and write a combined summary.
+
+    Extra keyword options (concurrency, relevance_batch_size, ...) are passed to
+    run_industry_benchmark for every industry.
+    """
+    tools = create_tools(use_cache=use_cache)
+    batch_start = time.perf_counter()
+
+    def run_one(industry):
+        start = time.perf_counter()
+        try:
+            results = run_industry_benchmark(industry, cases_per_industry, tools=tools, **options)
+            return {
+                "industry": industry,
+                "status": "success",
+                "use_cases": len(results["use_cases"]),
+                "skipped_articles": results.get("skipped_articles", 0),
+                "duration_seconds": round(time.perf_counter() - start, 2)
+            }
+        except Exception as e:
+            print(f"Error running benchmark for {industry}: {str(e)}")
+            return {
+                "industry": industry,
+                "status": "error",
+                "error": str(e),
+                "use_cases": 0,
+                "skipped_articles": 0,
+                "duration_seconds": round(time.perf_counter() - start, 2)
+            }
+
+    # Industries are I/O bound (HTTP and LLM calls), so threads let them share clients
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, parallel_industries)) as executor:
+            industry_summaries = list(executor.map(run_one, industries))
+    finally:
+        close_tools(tools)
+
+    summary = {
+        "industries": industry_summaries,
+        "total_use_cases": sum(item["use_cases"] for item in industry_summaries),
+        "total_skipped_articles": sum(item["skipped_articles"] for item in industry_summaries),
+        "total_duration_seconds": round(time.perf_counter() - batch_start, 2)
+    }
+
+    os.makedirs("output", exist_ok=True)
+    with open("output/benchmark_summary.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print("Batch summary:")
+    for item in industry_summaries:
+        print(f"  {item['industry']}: {item['status']}, {item['use_cases']} use cases, "
+              f"{item['skipped_articles']} articles skipped, in {item['duration_seconds']}s")
+    print(f"Total: {summary['total_use_cases']} use cases, {summary['total_skipped_articles']} articles skipped, "
+          f"in {summary['total_duration_seconds']}s")
+    return summary
+
+
+def parse_industries(industries=None, industries_file=None):
+    """Build the list of industries from a comma-separated string and/or a file (one per line)."""
+    names = []
+    if industries:
+        names.extend(industries.split(","))
+    if industries_file:
+        with open(industries_file, encoding="utf-8") as f:
+            names.extend(line for line in f if not line.strip().startswith("#"))
+
+    # Keep the given order but drop blanks and duplicates
+    result = []
+    for name in names:
+        name = name.strip()
+        if name and name not in result:
+            result.append(name)
+    return result
+
+
 def main():
     parser = argparse.ArgumentParser(description='Benchmark of AI use cases by industry')
-    parser.add_argument('--industry', type=str, required=True,
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--industry', type=str,
                         help='Industry to analyze (e.g., finance, healthcare, automotive)')
+    target.add_argument('--industries', type=str,
+                        help='Comma-separated list of industries to analyze in one batch')
+    target.add_argument('--industries-file', type=str,
+                        help='File listing the industries to analyze, one per line')
+    target.add_argument('--resume', type=str, metavar='RUN_ID',
+                        help='Continue an interrupted run with its original arguments, reusing its completed work')
     parser.add_argument('--count', type=int, default=5,
                         help='Number of use cases to search for')
     parser.add_argument('--format', type=str, choices=['json', 'csv', 'all'], default='all',
                         help='Output format (json, csv, or all for both)')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='Number of articles processed in parallel by each pipeline stage')
+    parser.add_argument('--parallel-industries', type=int, default=2,
+                        help='Number of industries processed at the same time in batch mode')
+    parser.add_argument('--relevance-batch-size', type=int, default=10,
+                        help='Number of articles classified for relevance in a single LLM call')
+    parser.add_argument('--single-pass', action='store_true',
+                        help='Extract, verify and enrich each use case in one LLM call instead of three')
+    parser.add_argument('--no-prefilter', action='store_true',
+                        help='Fetch every search result instead of dropping obvious misses first')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the on-disk caches and fetch everything again')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Process again the articles already handled in previous runs')
 
     args = parser.parse_args()
 
-    print(f"Starting benchmark for industry: {args.industry}")
-    print(f"Searching for {args.count} use cases...")
+    journal = RunJournal()
+    if args.resume:
+        run = journal.get_run(args.resume)
+        if run is None:
+            parser.error(f"Unknown run id: {args.resume}")
+        run_id = args.resume
+        arguments = run["arguments"]
+        print(f"Resuming run {run_id} ({run['status']})")
+    else:
+        industries = [args.industry] if args.industry else parse_industries(args.industries, args.industries_file)
+        if not industries:
+            parser.error("No industries to analyze")
+        # Everything needed to resume the run with the same settings
+        arguments = {
+            "industries": industries,
+            "batch": not args.industry,
+            "count": args.count,
+            "parallel_industries": args.parallel_industries,
+            "use_cache": not args.no_cache,
+            "options": {
+                "concurrency": args.concurrency,
+                "relevance_batch_size": args.relevance_batch_size,
+                "prefilter": not args.no_prefilter,
+                "single_pass": args.single_pass,
+                "refresh": args.refresh
+            },
+        }
+        run_id = journal.start_run(arguments)
+        print(f"Run id: {run_id} (if interrupted, continue it with --resume {run_id})")
+
+    if not arguments["batch"]:
+        print(f"Starting benchmark for industry: {arguments['industries'][0]}")
+    print(f"Searching for {arguments['count']} use cases...")
     print(f"Output format: {args.format}")
+    print(f"Concurrency: {arguments['options']['concurrency']}")
 
-    run_industry_benchmark(args.industry, args.count)
+    options = {**arguments["options"], "journal": journal, "run_id": run_id}
+    try:
+        if not arguments["batch"]:
+            tools = create_tools(use_cache=arguments["use_cache"])
+            try:
+                run_industry_benchmark(arguments["industries"][0], arguments["count"], tools=tools, **options)
+            finally:
+                close_tools(tools)
+            journal.finish_run(run_id)
+            return
+
+        print(f"Starting batch benchmark for industries: {', '.join(arguments['industries'])}")
+        summary = run_batch_benchmark(arguments["industries"], arguments["count"],
+                                      parallel_industries=arguments["parallel_industries"],
+                                      use_cache=arguments["use_cache"], **options)
+        failed = any(item["status"] != "success" for item in summary["industries"])
+        journal.finish_run(run_id, "failed" if failed else "completed")
+        if failed:
+            print(f"Some industries failed; rerun them with --resume {run_id}")
+    finally:
+        journal.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,285 @@
+# metrics.py
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from langchain_core.callbacks import BaseCallbackHandler
+from llm_cache import CACHE_HIT_KEY
+
+
+def llm_prices():
+    """USD per million prompt and completion tokens; gpt-4o-mini list prices by default."""
+    return (float(os.getenv("LLM_PRICE_INPUT_PER_1M", 0.15)),
+            float(os.getenv("LLM_PRICE_OUTPUT_PER_1M", 0.60)))
+
+
+def llm_config(operation, industry=None):
+    """Runnable config labelling an LLM call, read back by LLMMetricsHandler."""
+    return {"run_name": operation, "metadata": {"operation": operation, "industry": industry}}
+
+
+def summarize_durations(durations):
+    ordered = sorted(durations)
+    if not ordered:
+        return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "total_seconds": 0.0}
+    return {
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+        "total_seconds": round(sum(ordered), 3),
+    }
+
+
+class RunMetrics:
+    """Thread-safe collector of stage timings and LLM usage, labelled by industry.
+
+    One instance is shared by all the industries of a batch, like the other tools;
+    report(industry) extracts the figures of one of them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        # (industry, stage) -> {"durations": [...], "items": n, "errors": n}
+        self._stages = defaultdict(lambda: {"durations": [], "items": 0, "errors": 0})
+        # (industry, operation) -> counters
+        self._llm = defaultdict(lambda: {
+            "durations": [], "calls": 0, "errors": 0, "cache_hits": 0, "retries": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "tokens_saved": 0
+        })
+
+    def record_stage(self, industry, stage, seconds, items=1, failed=False):
+        with self._lock:
+            entry = self._stages[(industry, stage)]
+            entry["durations"].append(seconds)
+            entry["items"] += items
+            entry["errors"] += 1 if failed else 0
+
+    @contextmanager
+    def timed(self, industry, stage):
+        """Time a block of code as one call of `stage`; an exception counts as an error."""
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.record_stage(industry, stage, time.perf_counter() - start, failed=failed)
+
+    def record_llm(self, industry, operation, seconds, prompt_tokens=0, completion_tokens=0,
+                   cached=False, failed=False):
+        with self._lock:
+            entry = self._llm[(industry, operation)]
+            entry["durations"].append(seconds)
+            entry["calls"] += 1
+            entry["errors"] += 1 if failed else 0
+            if cached:
+                entry["cache_hits"] += 1
+                entry["tokens_saved"] += prompt_tokens + completion_tokens
+            else:
+                entry["prompt_tokens"] += prompt_tokens
+                entry["completion_tokens"] += completion_tokens
+
+    def record_retry(self, industry, operation):
+        with self._lock:
+            self._llm[(industry, operation)]["retries"] += 1
+
+    def callback_handler(self):
+        """LangChain callback handler feeding this collector; pass it to the chat model."""
+        return LLMMetricsHandler(self)
+
+    def report(self, industry=None):
+        """JSON-serializable summary of the run, for one industry or all of them."""
+        with self._lock:
+            stages = {
+                stage: {"calls": len(entry["durations"]), "items": entry["items"], "errors": entry["errors"],
+                        **summarize_durations(entry["durations"])}
+                for (label, stage), entry in self._stages.items() if industry is None or label == industry
+            }
+            input_price, output_price = llm_prices()
+            llm = {}
+            for (label, operation), entry in self._llm.items():
+                if industry is not None and label != industry:
+                    continue
+                cost = (entry["prompt_tokens"] * input_price + entry["completion_tokens"] * output_price) / 1_000_000
+                llm[operation] = {
+                    **{key: value for key, value in entry.items() if key != "durations"},
+                    "cost_usd": round(cost, 6),
+                    **summarize_durations(entry["durations"]),
+                }
+
+        totals = {
+            key: sum(entry[key] for entry in llm.values())
+            for key in ("calls", "errors", "cache_hits", "retries", "prompt_tokens", "completion_tokens",
+                        "tokens_saved")
+        }
+        totals["cost_usd"] = round(sum(entry["cost_usd"] for entry in llm.values()), 6)
+        totals["stage_errors"] = sum(entry["errors"] for entry in stages.values())
+        return {
+            "industry": industry,
+            "started_at": self.started_at,
+            "duration_seconds": round(time.time() - self.started_at, 3),
+            "stages": stages,
+            "llm": llm,
+            "llm_totals": totals,
+        }
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """Times each chat model call and reads its token usage.
+
+    Calls are labelled with the `operation` and `industry` metadata set by llm_config;
+    unlabelled calls are counted under "other".
+    """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._started = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        metadata = metadata or {}
+        with self._lock:
+            self._started[run_id] = (time.perf_counter(), metadata.get("industry"),
+                                     metadata.get("operation") or "other")
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        start, industry, operation = started
+        usage = {}
+        cached = False
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or usage
+                # LLMCache tags the generations it serves
+                cached = cached or bool((generation.generation_info or {}).get(CACHE_HIT_KEY))
+        self.metrics.record_llm(industry, operation, time.perf_counter() - start,
+                                prompt_tokens=usage.get("input_tokens", 0),
+                                completion_tokens=usage.get("output_tokens", 0),
+                                cached=cached)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        start, industry, operation = started
+        self.metrics.record_llm(industry, operation, time.perf_counter() - start, failed=True)
+
+    def on_retry(self, retry_state, *, run_id, **kwargs):
+        with self._lock:
+            started = self._started.get(run_id)
+        if started is not None:
+            self.metrics.record_retry(started[1], started[2])
+
+
+def write_run_report(report, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample(name, labels, value):
+    label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+    return f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}"
+
+
+def render_prometheus(reports, http_metrics=None):
+    """Render run reports (and the web app's request counters) in the Prometheus text format."""
+    families = {
+        "ai_benchmark_run_timestamp_seconds": ("gauge", "Start time of the last run", []),
+        "ai_benchmark_run_duration_seconds": ("gauge", "Duration of the last run", []),
+        "ai_benchmark_stage_calls": ("gauge", "Calls of each stage in the last run", []),
+        "ai_benchmark_stage_items": ("gauge", "Items processed by each stage in the last run", []),
+        "ai_benchmark_stage_errors": ("gauge", "Failed calls of each stage in the last run", []),
+        "ai_benchmark_stage_seconds": ("gauge", "Time spent in each stage in the last run", []),
+        "ai_benchmark_stage_p95_seconds": ("gauge", "95th percentile call duration of each stage", []),
+        "ai_benchmark_llm_calls": ("gauge", "LLM calls per operation in the last run", []),
+        "ai_benchmark_llm_errors": ("gauge", "Failed LLM calls per operation in the last run", []),
+        "ai_benchmark_llm_cache_hits": ("gauge", "LLM calls answered from the cache", []),
+        "ai_benchmark_llm_retries": ("gauge", "Retried LLM calls per operation", []),
+        "ai_benchmark_llm_tokens": ("gauge", "Tokens sent and received per operation", []),
+        "ai_benchmark_llm_seconds": ("gauge", "Time spent waiting for the LLM per operation", []),
+        "ai_benchmark_llm_cost_usd": ("gauge", "Estimated LLM cost of the last run", []),
+    }
+
+    def add(name, labels, value):
+        families[name][2].append(_sample(name, labels, value))
+
+    for report in reports:
+        industry = {"industry": report.get("industry") or "all"}
+        add("ai_benchmark_run_timestamp_seconds", industry, report["started_at"])
+        add("ai_benchmark_run_duration_seconds", industry, report["duration_seconds"])
+        for stage, stats in report["stages"].items():
+            labels = {**industry, "stage": stage}
+            add("ai_benchmark_stage_calls", labels, stats["calls"])
+            add("ai_benchmark_stage_items", labels, stats["items"])
+            add("ai_benchmark_stage_errors", labels, stats["errors"])
+            add("ai_benchmark_stage_seconds", labels, stats["total_seconds"])
+            add("ai_benchmark_stage_p95_seconds", labels, stats["p95_ms"] / 1000)
+        for operation, stats in report["llm"].items():
+            labels = {**industry, "operation": operation}
+            add("ai_benchmark_llm_calls", labels, stats["calls"])
+            add("ai_benchmark_llm_errors", labels, stats["errors"])
+            add("ai_benchmark_llm_cache_hits", labels, stats["cache_hits"])
+            add("ai_benchmark_llm_retries", labels, stats["retries"])
+            add("ai_benchmark_llm_tokens", {**labels, "type": "prompt"}, stats["prompt_tokens"])
+            add("ai_benchmark_llm_tokens", {**labels, "type": "completion"}, stats["completion_tokens"])
+            add("ai_benchmark_llm_seconds", labels, stats["total_seconds"])
+            add("ai_benchmark_llm_cost_usd", labels, stats["cost_usd"])
+
+    lines = []
+    for name, (kind, help_text, samples) in families.items():
+        if not samples:
+            continue
+        lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *samples])
+    if http_metrics is not None:
+        lines.extend(http_metrics.render())
+    return "\n".join(lines) + "\n"
+
+
+class HttpMetrics:
+    """Request counters and latency totals of the web app, by endpoint and status code."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)
+        self._seconds = defaultdict(float)
+
+    def record(self, endpoint, status, seconds):
+        with self._lock:
+            self._requests[(endpoint, status)] += 1
+            self._seconds[endpoint] += seconds
+
+    def render(self):
+        with self._lock:
+            requests_samples = [
+                _sample("http_requests_total", {"endpoint": endpoint, "status": status}, count)
+                for (endpoint, status), count in sorted(self._requests.items())
+            ]
+            seconds_samples = [
+                _sample("http_request_duration_seconds_sum", {"endpoint": endpoint}, round(seconds, 6))
+                for endpoint, seconds in sorted(self._seconds.items())
+            ]
+        return [
+            "# HELP http_requests_total Requests served by endpoint and status",
+            "# TYPE http_requests_total counter",
+            *requests_samples,
+            "# HELP http_request_duration_seconds_sum Time spent serving requests by endpoint",
+            "# TYPE http_request_duration_seconds_sum counter",
+            *seconds_samples,
+        ]
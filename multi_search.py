@@ -0,0 +1,132 @@
+# multi_search.py
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from metrics import summarize_durations
+from search_base import BaseSearchTool
+from url_utils import canonical_url
+
+# Reciprocal rank fusion constant: damps the advantage of the very first ranks
+RRF_K = 60
+
+
+def fuse_results(ranked_lists, num_results):
+    """Merge {provider: results} by canonical URL with reciprocal rank fusion.
+
+    A URL scores 1 / (RRF_K + rank) for each provider that returned it, so pages
+    found by several providers come first. The title and snippet of the
+    best-ranked occurrence are kept, and `providers` lists who found the page.
+    """
+    merged = {}
+    for provider, results in ranked_lists.items():
+        for rank, result in enumerate(results, start=1):
+            link = result.get("link")
+            if not link:
+                continue
+            key = canonical_url(link)
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {"result": dict(result), "score": 0.0, "best_rank": rank, "providers": []}
+            elif rank < entry["best_rank"]:
+                entry["result"] = {**dict(result), "link": entry["result"]["link"]}
+                entry["best_rank"] = rank
+            entry["score"] += 1.0 / (RRF_K + rank)
+            entry["providers"].append(provider)
+
+    ordered = sorted(merged.values(), key=lambda entry: (-entry["score"], entry["best_rank"]))
+    return [{**entry["result"], "providers": entry["providers"]} for entry in ordered[:num_results]]
+
+
+class MultiSearchTool(BaseSearchTool):
+    """Query several search providers at once and merge their results.
+
+    Every provider gets the query concurrently. Once the answers received hold
+    `num_results` distinct URLs, the slower providers get `hedge_grace` more
+    seconds before the search returns without them; nothing waits longer than
+    `timeout`. Late answers are dropped (a CachedSearchTool-wrapped provider
+    still caches them for the next query). Per-provider latency and outcomes
+    are available from provider_stats().
+
+    There is no page_size: rank fusion needs the providers' answers before it
+    can order them, so iter_search yields each query's fused results at once.
+    """
+
+    provider = "multi"
+
+    def __init__(self, tools, hedge_grace=None, timeout=None):
+        self.tools = list(tools)
+        self.hedge_grace = hedge_grace if hedge_grace is not None else float(os.getenv("SEARCH_HEDGE_GRACE", 0.5))
+        self.timeout = timeout if timeout is not None else float(os.getenv("SEARCH_TIMEOUT", 20))
+        # Several searches may run at once (specific cases, batch mode), each with one call per provider
+        self.executor = ThreadPoolExecutor(max_workers=4 * len(self.tools), thread_name_prefix="search")
+        self._lock = threading.Lock()
+        self._stats = {
+            tool.provider: {"durations": [], "calls": 0, "errors": 0, "empty": 0, "late": 0, "results": 0}
+            for tool in self.tools
+        }
+
+    def _timed_search(self, tool, query, num_results):
+        start = time.perf_counter()
+        try:
+            results = tool.search(query, num_results)
+        except Exception as e:
+            print(f"Error searching with {tool.provider}: {e}")
+            results = None
+        with self._lock:
+            stats = self._stats[tool.provider]
+            stats["durations"].append(time.perf_counter() - start)
+            stats["calls"] += 1
+            if results is None:
+                stats["errors"] += 1
+            elif not results:
+                stats["empty"] += 1
+            stats["results"] += len(results or [])
+        return results or []
+
+    def search(self, query, num_results=5):
+        """Run `query` on every provider and return the fused top `num_results`."""
+        futures = {
+            self.executor.submit(self._timed_search, tool, query, num_results): tool.provider
+            for tool in self.tools
+        }
+        answers = {}
+        pending = set(futures)
+        deadline = time.monotonic() + self.timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                answers[futures[future]] = future.result()
+
+            unique = {canonical_url(result["link"]) for results in answers.values() for result in results
+                      if result.get("link")}
+            if pending and len(unique) >= num_results:
+                # Enough results: give the slower providers a short grace period, then hedge
+                deadline = min(deadline, time.monotonic() + self.hedge_grace)
+
+        for future in pending:
+            future.add_done_callback(lambda _, provider=futures[future]: self._count_late(provider))
+
+        # Keep the providers' configured order for deterministic tie-breaking
+        ordered = {tool.provider: answers[tool.provider] for tool in self.tools if tool.provider in answers}
+        return fuse_results(ordered, num_results)
+
+    def close(self):
+        """Stop the provider threads, letting late answers finish (and reach their cache)."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def _count_late(self, provider):
+        with self._lock:
+            self._stats[provider]["late"] += 1
+
+    def provider_stats(self):
+        """Calls, errors, empty and late answers, results and latency of each provider."""
+        with self._lock:
+            return {
+                provider: {**{key: value for key, value in stats.items() if key != "durations"},
+                           **summarize_durations(stats["durations"])}
+                for provider, stats in self._stats.items()
+            }
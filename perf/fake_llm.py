@@ -0,0 +1,79 @@
+# perf/fake_llm.py
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+EXCERPT_PATTERN = re.compile(r"Extrait (\d+):\n(.*?)(?=\n\nExtrait \d+:\n|\n\s*Réponds uniquement avec)", re.DOTALL)
+
+
+class ReplayChatModel(BaseChatModel):
+    """Chat model answering the pipeline's prompts with recorded outputs after a fixed delay.
+
+    Stands in for ChatOpenAI in offline benchmarks: each prompt is recognized from its
+    wording and answered from `responses` (see perf/fixtures/llm_responses.json), after
+    `latency` seconds plus up to `jitter` seconds. Token usage is estimated at four
+    characters per token so that instrumentation has something to count.
+    """
+
+    responses: Dict[str, Any]
+    latency: float = 0.0
+    jitter: float = 0.0
+    calls: int = 0
+
+    _lock: Any = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            self.calls += 1
+
+        text = self._answer(prompt)
+        message = AIMessage(content=text, usage_metadata={
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": len(text) // 4,
+            "total_tokens": (len(prompt) + len(text)) // 4,
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _answer(self, prompt):
+        if "extraits numérotés" in prompt:
+            marker = self.responses["relevance_irrelevant_marker"]
+            return json.dumps([
+                {"id": int(number), "pertinent": marker not in excerpt, "confiance": 0.9}
+                for number, excerpt in EXCERPT_PATTERN.findall(prompt)
+            ])
+        if "champs_estimes" in prompt:
+            return json.dumps({**self._extraction(prompt), **self.responses["single_pass_extra"]}, ensure_ascii=False)
+        if "extrais les informations" in prompt:
+            return json.dumps(self._extraction(prompt), ensure_ascii=False)
+        if "Vérifie la cohérence" in prompt:
+            return self.responses["coherence"]
+        if "complète les informations manquantes" in prompt:
+            return self.responses["enrichment"]
+        if "analyse comparative" in prompt:
+            return self.responses["comparison"]
+        return "OUI"
+
+    def _extraction(self, prompt):
+        # The same article always gets the same recorded extraction
+        variants = self.responses["extraction"]
+        return variants[zlib.crc32(prompt.encode("utf-8")) % len(variants)]
@@ -0,0 +1,257 @@
+# perf/run_benchmarks.py
+"""Offline end-to-end benchmark of run_industry_benchmark.
+
+Recorded search results, article pages (HTML and PDF) and LLM outputs are replayed
+from perf/fixtures, so a run costs no API call. The LLM is replaced by a fake model
+with configurable latency. For each number of articles the suite reports per-stage
+latency, throughput and peak memory of the fastest of a few runs, and compares them
+with perf/baselines.json.
+
+    python -m perf.run_benchmarks                      # N = 5, 50 and 500
+    python -m perf.run_benchmarks --sizes 5 50 --llm-latency 0.05
+    python -m perf.run_benchmarks --update-baseline    # record the current numbers
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import requests_mock
+import main
+from benchmarks import IndustryAnalyzer
+from database import DatabaseManager
+from enrichment import QualityEnhancer
+from fetch_cache import FetchCache
+from metrics import RunMetrics
+from processors import ArticleProcessor
+from search_base import BaseSearchTool
+from perf.fake_llm import ReplayChatModel
+
+PERF_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(PERF_DIR, "fixtures")
+BASELINE_PATH = os.path.join(PERF_DIR, "baselines.json")
+DEFAULT_SIZES = [5, 50, 500]
+INDUSTRY = "finance"
+# Stage latencies below this, or measured over fewer calls, are too noisy to compare with a baseline
+MIN_COMPARED_MS = 1.0
+MIN_COMPARED_CALLS = 20
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ReplaySearchTool(BaseSearchTool):
+    """Serves the recorded search results, repeating them under distinct URLs to reach num_results."""
+
+    provider = "replay"
+
+    def __init__(self, recorded):
+        self.recorded = recorded["results"]
+        # URL -> (fixture path, content type), for the HTTP replay
+        self.pages = {}
+
+    def search(self, query, num_results=5):
+        results = []
+        for i in range(num_results):
+            entry = self.recorded[i % len(self.recorded)]
+            copy = i // len(self.recorded)
+            link = entry["link"] if copy == 0 else f"{entry['link']}?copy={copy}"
+            self.pages[link] = (os.path.join(FIXTURES_DIR, entry["fixture"]), entry["content_type"])
+            results.append({"title": entry["title"], "link": link, "snippet": entry["snippet"]})
+        return results
+
+
+def replay_http(mocker, search_tool):
+    """Answer every GET for a searched URL with its recorded page."""
+    def respond(request):
+        page = search_tool.pages.get(request.url)
+        if page is None:
+            return None
+        path, content_type = page
+        with open(path, "rb") as f:
+            content = f.read()
+        return requests_mock.create_response(request, content=content, headers={
+            "Content-Type": content_type, "Content-Length": str(len(content))
+        })
+    mocker.add_matcher(respond)
+
+
+def build_tools(workdir, search_tool, llm, metrics):
+    """Same tools as main.create_tools, with the network and the LLM replaced."""
+    # ChatOpenAI refuses to start without a key; it is never used
+    os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+    analyzer = IndustryAnalyzer(metrics=metrics)
+    enhancer = QualityEnhancer(metrics=metrics)
+    analyzer.llm = enhancer.llm = llm
+    return {
+        "search_tool": search_tool,
+        "processor": ArticleProcessor(cache=FetchCache(path=os.path.join(workdir, "fetch_cache.db"))),
+        "analyzer": analyzer,
+        "enhancer": enhancer,
+        "db_manager": DatabaseManager(f"sqlite:///{os.path.join(workdir, 'bench.db')}"),
+        # The fixtures repeat the same few texts, which the near-duplicate detector would drop
+        "dedup": None,
+        "metrics": metrics,
+    }
+
+
+def run_size(articles, llm_latency=0.02, llm_jitter=0.0, concurrency=4, relevance_batch_size=10,
+             single_pass=False, verbose=False):
+    """Run the pipeline over `articles` replayed articles and return its measurements."""
+    recorded = load_fixture(f"search_{INDUSTRY}.json")
+    metrics = RunMetrics()
+    llm = ReplayChatModel(responses=load_fixture("llm_responses.json"), latency=llm_latency, jitter=llm_jitter,
+                          callbacks=[metrics.callback_handler()])
+    search_tool = ReplaySearchTool(recorded)
+    previous_dir = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as workdir, requests_mock.Mocker() as mocker:
+        replay_http(mocker, search_tool)
+        tools = build_tools(workdir, search_tool, llm, metrics)
+        # run_industry_benchmark writes its outputs to ./output
+        os.chdir(workdir)
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        try:
+            tracemalloc.start()
+            start = time.perf_counter()
+            with output:
+                results = main.run_industry_benchmark(
+                    INDUSTRY, articles, concurrency=concurrency, tools=tools,
+                    relevance_batch_size=relevance_batch_size, single_pass=single_pass
+                )
+            wall = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            report = metrics.report(INDUSTRY)
+        finally:
+            tracemalloc.stop()
+            os.chdir(previous_dir)
+            tools["processor"].cache.close()
+            tools["db_manager"].remove_session()
+            tools["db_manager"].engine.dispose()
+
+    return {
+        "articles": articles,
+        "use_cases": len(results["use_cases"]),
+        "llm_calls": llm.calls,
+        "wall_seconds": round(wall, 3),
+        "throughput_articles_per_second": round(articles / wall, 2),
+        "peak_memory_mb": round(peak / (1024 * 1024), 2),
+        "stages": report["stages"],
+        "llm": report["llm_totals"],
+    }
+
+
+def find_regressions(report, baseline, tolerance=0.2):
+    """Compare a report with a baseline and return one message per regressed metric."""
+    regressions = []
+    for size, current in report["sizes"].items():
+        reference = baseline.get("sizes", {}).get(size)
+        if not reference:
+            continue
+        floor = reference["throughput_articles_per_second"] * (1 - tolerance)
+        if current["throughput_articles_per_second"] < floor:
+            regressions.append(f"N={size}: throughput {current['throughput_articles_per_second']}/s, "
+                               f"baseline {reference['throughput_articles_per_second']}/s")
+        if current["peak_memory_mb"] > reference["peak_memory_mb"] * (1 + tolerance):
+            regressions.append(f"N={size}: peak memory {current['peak_memory_mb']} MB, "
+                               f"baseline {reference['peak_memory_mb']} MB")
+        for name, stats in current["stages"].items():
+            reference_stage = reference["stages"].get(name)
+            if (not reference_stage or reference_stage["p95_ms"] < MIN_COMPARED_MS
+                    or stats["calls"] < MIN_COMPARED_CALLS):
+                continue
+            if stats["p95_ms"] > reference_stage["p95_ms"] * (1 + tolerance):
+                regressions.append(f"N={size}: {name} p95 {stats['p95_ms']} ms, "
+                                   f"baseline {reference_stage['p95_ms']} ms")
+    return regressions
+
+
+def print_report(report):
+    for size, result in report["sizes"].items():
+        print(f"N={size}: {result['wall_seconds']}s, {result['throughput_articles_per_second']} articles/s, "
+              f"peak {result['peak_memory_mb']} MB, {result['use_cases']} use cases, {result['llm_calls']} LLM calls "
+              f"({result['llm']['prompt_tokens']} prompt / {result['llm']['completion_tokens']} completion tokens)")
+        for name, stats in result["stages"].items():
+            print(f"  {name:<12} {stats['calls']:>5} calls  {stats['items']:>5} items  "
+                  f"mean {stats['mean_ms']:>9} ms  p50 {stats['p50_ms']:>9} ms  p95 {stats['p95_ms']:>9} ms")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description='Offline performance benchmark of the article pipeline')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Numbers of articles to run through the pipeline')
+    parser.add_argument('--llm-latency', type=float, default=0.02,
+                        help='Seconds the fake LLM waits before each answer')
+    parser.add_argument('--llm-jitter', type=float, default=0.0,
+                        help='Extra random delay of up to this many seconds per LLM call')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='Number of articles processed in parallel by each pipeline stage')
+    parser.add_argument('--relevance-batch-size', type=int, default=10,
+                        help='Number of articles classified for relevance in a single LLM call')
+    parser.add_argument('--single-pass', action='store_true',
+                        help='Benchmark the single-pass extraction mode')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per size; the fastest one is reported, which filters out machine noise')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Relative slowdown or memory growth tolerated before flagging a regression')
+    parser.add_argument('--baseline', type=str, default=BASELINE_PATH,
+                        help='Baseline file to compare with (and to write with --update-baseline)')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Store the measurements as the new baseline')
+    parser.add_argument('--report', type=str,
+                        help='Also write the full report to this JSON file')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Show the pipeline output')
+    args = parser.parse_args(argv)
+
+    config = {
+        "llm_latency": args.llm_latency,
+        "llm_jitter": args.llm_jitter,
+        "concurrency": args.concurrency,
+        "relevance_batch_size": args.relevance_batch_size,
+        "single_pass": args.single_pass,
+    }
+    report = {"config": config, "sizes": {}}
+    # Untimed warm-up: one-off costs (lazy imports, first connections) would otherwise land on the first size
+    run_size(min(args.sizes), **config)
+    for size in args.sizes:
+        print(f"Running the pipeline over {size} articles...")
+        runs = [run_size(size, verbose=args.verbose, **config) for _ in range(max(1, args.repeat))]
+        report["sizes"][str(size)] = max(runs, key=lambda run: run["throughput_articles_per_second"])
+    print_report(report)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare with; run with --update-baseline to record one.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"Baseline was recorded with {baseline.get('config')}; not comparable, skipping.")
+        return 0
+
+    regressions = find_regressions(report, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print("No regression against the baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,169 @@
+# pipeline.py
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class Stage:
+    def __init__(self, name, func, workers=1, batch_size=None):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        # When set, func receives a list of up to batch_size items and returns one result per item
+        self.batch_size = batch_size
+
+
+class StagedPipeline:
+    """Run items through a sequence of stages, each backed by its own bounded worker pool.
+
+    A stage function receives an item and returns it (possibly updated) to hand it to the
+    next stage, or None to drop it. An item moves on as soon as it leaves a stage, so the
+    download of one article overlaps with the LLM calls made for another.
+
+    A batch stage buffers arriving items and calls its function with a list once
+    `batch_size` items are waiting, or once no further item can reach it.
+
+    Items may come from a generator: each one enters the first stage as soon as it
+    is produced, so processing starts while the rest are still being produced.
+    """
+
+    def __init__(self, stages, on_error=None, on_stage=None):
+        self.stages = stages
+        self.on_error = on_error or self._print_error
+        # Called as on_stage(stage_name, seconds, items, failed) after every stage call
+        self.on_stage = on_stage
+        self._lock = threading.Lock()
+        self._buffers = {}
+        self._pending = {}
+        # True while the input iterator may still produce items
+        self._feeding = False
+
+    def run(self, items):
+        """Process all items and return their final values in input order (None if dropped)."""
+        executors = [
+            ThreadPoolExecutor(max_workers=stage.workers, thread_name_prefix=f"stage-{stage.name}")
+            for stage in self.stages
+        ]
+        # Number of items produced so far that may still reach each batch stage
+        self._buffers = {i: [] for i, stage in enumerate(self.stages) if stage.batch_size}
+        self._pending = {i: 0 for i in self._buffers}
+        self._feeding = True
+        try:
+            outcomes = []
+            try:
+                for item in items:
+                    outcome = Future()
+                    outcomes.append(outcome)
+                    with self._lock:
+                        for position in self._pending:
+                            self._pending[position] += 1
+                    self._submit(executors, 0, item, outcome)
+            finally:
+                # No more items: flush the partial batches nothing else can fill
+                with self._lock:
+                    self._feeding = False
+                    batches = [(position, self._take_batch(position)) for position in self._buffers]
+                for position, batch in batches:
+                    if batch:
+                        self._flush(executors, position, batch)
+            return [outcome.result() for outcome in outcomes]
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+
+    def _submit(self, executors, index, item, outcome):
+        if item is None:
+            self._skip(executors, index)
+            outcome.set_result(None)
+            return
+        if index == len(self.stages):
+            outcome.set_result(item)
+            return
+
+        stage = self.stages[index]
+        if stage.batch_size:
+            self._enqueue(executors, index, item, outcome)
+            return
+
+        future = executors[index].submit(self._call, stage, item, 1)
+        future.add_done_callback(
+            lambda done: self._advance(executors, index, item, outcome, done)
+        )
+
+    def _call(self, stage, arg, items):
+        if self.on_stage is None:
+            return stage.func(arg)
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = stage.func(arg)
+            failed = False
+            return result
+        finally:
+            self.on_stage(stage.name, time.perf_counter() - start, items, failed)
+
+    def _advance(self, executors, index, item, outcome, done):
+        try:
+            error = done.exception()
+            if error is not None:
+                self.on_error(item, self.stages[index].name, error)
+                self._submit(executors, index + 1, None, outcome)
+                return
+            self._submit(executors, index + 1, done.result(), outcome)
+        except Exception as e:
+            # Never leave the caller waiting on an outcome that will not be resolved
+            if not outcome.done():
+                outcome.set_exception(e)
+
+    def _enqueue(self, executors, index, item, outcome):
+        with self._lock:
+            self._pending[index] -= 1
+            self._buffers[index].append((item, outcome))
+            batch = self._take_batch(index)
+        if batch:
+            self._flush(executors, index, batch)
+
+    def _skip(self, executors, index):
+        """Record that a dropped item will never reach the batch stages from `index` on."""
+        for position in self._buffers:
+            if position < index:
+                continue
+            with self._lock:
+                self._pending[position] -= 1
+                batch = self._take_batch(position)
+            if batch:
+                self._flush(executors, position, batch)
+
+    def _take_batch(self, index):
+        buffer = self._buffers[index]
+        if buffer and (len(buffer) >= self.stages[index].batch_size
+                       or (self._pending[index] == 0 and not self._feeding)):
+            self._buffers[index] = []
+            return buffer
+        return None
+
+    def _flush(self, executors, index, batch):
+        future = executors[index].submit(self._call, self.stages[index], [item for item, _ in batch], len(batch))
+        future.add_done_callback(
+            lambda done: self._advance_batch(executors, index, batch, done)
+        )
+
+    def _advance_batch(self, executors, index, batch, done):
+        error = done.exception()
+        if error is None and len(done.result()) != len(batch):
+            error = ValueError(f"expected {len(batch)} results, got {len(done.result())}")
+
+        for position, (item, outcome) in enumerate(batch):
+            try:
+                if error is not None:
+                    self.on_error(item, self.stages[index].name, error)
+                    self._submit(executors, index + 1, None, outcome)
+                else:
+                    self._submit(executors, index + 1, done.result()[position], outcome)
+            except Exception as e:
+                if not outcome.done():
+                    outcome.set_exception(e)
+
+    @staticmethod
+    def _print_error(item, stage_name, error):
+        print(f"  Error in {stage_name} stage for {item}: {error}")
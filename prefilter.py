@@ -0,0 +1,156 @@
+# prefilter.py
+import math
+import re
+import unicodedata
+
+# Terms are written without accents; text is normalized the same way before matching
+AI_TERMS = [
+    "ia", "intelligence artificielle", "artificial intelligence", "machine learning",
+    "apprentissage automatique", "deep learning", "apprentissage profond", "reseau de neurones",
+    "neural network", "nlp", "traitement du langage", "chatbot", "agent conversationnel",
+    "vision par ordinateur", "computer vision", "generative", "genai", "llm", "modele de langage",
+    "chatgpt", "gpt", "algorithme", "predictif", "predictive", "data science", "reconnaissance"
+]
+
+# Matched on the original text: lowercased, "AI" would also match the French "j'ai"
+CASE_SENSITIVE_AI_TERMS = ["AI", "A.I."]
+
+USE_CASE_TERMS = [
+    "cas d'usage", "cas d'utilisation", "etude de cas", "use case", "case study", "retour d'experience",
+    "deploie", "deploiement", "deployment", "implemente", "mise en oeuvre", "projet", "resultats",
+    "gains", "reduction", "ameliore", "optimise", "automatise", "client", "entreprise", "exemple"
+]
+
+INDUSTRY_LEXICONS = {
+    "finance": ["finance", "banque", "bancaire", "bank", "credit", "paiement", "fraude", "trading",
+                "investissement", "fintech", "assurance", "gestion d'actifs", "conformite", "kyc"],
+    "healthcare": ["sante", "health", "healthcare", "hopital", "medical", "medecin", "patient", "diagnostic",
+                   "imagerie", "pharmaceutique", "clinique", "soins", "radiologie"],
+    "automotive": ["automobile", "automotive", "voiture", "vehicule", "constructeur", "conduite autonome",
+                   "equipementier", "usine", "moteur", "mobilite"],
+    "retail": ["retail", "commerce", "distribution", "magasin", "e-commerce", "client", "vente",
+               "recommandation", "stock", "enseigne", "supermarche", "pricing"],
+    "manufacturing": ["industrie", "manufacturing", "usine", "production", "maintenance predictive",
+                      "chaine de production", "qualite", "industriel", "supply chain", "atelier"],
+    "telecom": ["telecom", "telecommunications", "operateur", "reseau", "5g", "mobile", "fibre",
+                "abonne", "churn"],
+    "insurance": ["assurance", "insurance", "assureur", "sinistre", "souscription", "mutuelle",
+                  "indemnisation", "actuariat", "fraude"],
+    "education": ["education", "enseignement", "ecole", "universite", "etudiant", "eleve", "formation",
+                  "pedagogie", "apprentissage", "edtech"],
+    "energy": ["energie", "energy", "electricite", "reseau electrique", "renouvelable", "petrole", "gaz",
+               "nucleaire", "smart grid", "consommation", "fournisseur d'energie"],
+    "logistics": ["logistique", "logistics", "transport", "entrepot", "livraison", "supply chain",
+                  "flotte", "colis", "fret", "routage"],
+}
+
+# Placeholders used by the search tools when a field is missing
+_PLACEHOLDERS = {"no title", "no snippet"}
+
+
+def normalize_text(text):
+    """Lowercase and strip accents so French spellings match the lexicons."""
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in text if not unicodedata.combining(c)).lower().replace("’", "'")
+
+
+def _count(term, text):
+    return len(re.findall(r"(?<!\w)" + re.escape(term) + r"(?!\w)", text))
+
+
+def industry_lexicon(industry):
+    """Industry terms for an industry; unknown industries fall back to the words of their name."""
+    if not industry:
+        return []
+    lexicon = INDUSTRY_LEXICONS.get(normalize_text(industry).strip())
+    if lexicon is None:
+        lexicon = [word for word in re.findall(r"\w+", normalize_text(industry)) if len(word) > 2]
+    return lexicon
+
+
+def score_texts(texts, industry=None):
+    """Score texts against the AI, industry and use-case lexicons.
+
+    Every term is weighted by its inverse document frequency over `texts`, so terms
+    present everywhere count less than distinctive ones. Returns a list of
+    (score, hits) tuples, where hits counts the matches per category.
+    """
+    categories = {
+        "ai": (AI_TERMS + CASE_SENSITIVE_AI_TERMS, 2.0),
+        "industry": (industry_lexicon(industry), 1.5),
+        "use_case": (USE_CASE_TERMS, 1.0),
+    }
+    counts = []
+    for text in texts:
+        normalized = normalize_text(text)
+        counts.append({
+            term: _count(term, text if term in CASE_SENSITIVE_AI_TERMS else normalized)
+            for terms, _ in categories.values() for term in terms
+        })
+    n = len(texts)
+    df = {}
+    for text_counts in counts:
+        for term, tf in text_counts.items():
+            if tf:
+                df[term] = df.get(term, 0) + 1
+
+    scores = []
+    for text_counts in counts:
+        score = 0.0
+        hits = {}
+        for category, (terms, weight) in categories.items():
+            hits[category] = 0
+            for term in terms:
+                tf = text_counts[term]
+                if tf:
+                    hits[category] += tf
+                    score += weight * tf * (math.log((1 + n) / (1 + df[term])) + 1)
+        scores.append((score, hits))
+    return scores
+
+
+class SearchResultPrefilter:
+    """Rank search results by local TF-IDF relevance of their title and snippet.
+
+    Results with no AI term, or with neither an industry nor a use-case term, are
+    dropped before any fetch or LLM call.
+    """
+
+    def __init__(self, industry):
+        self.industry = industry
+        self.stats = {}
+
+    def rank(self, results):
+        """Return the results worth fetching, best first, and update `stats`."""
+        texts = [self._text(result) for result in results]
+        scores = iter(score_texts([text for text in texts if text], self.industry))
+
+        kept = []
+        for position, (result, text) in enumerate(zip(results, texts)):
+            if not text:
+                # Nothing to judge on: let the LLM decide
+                kept.append((0.0, position, result))
+                continue
+
+            score, hits = next(scores)
+            if hits["ai"] and (hits["industry"] or hits["use_case"]):
+                result["prefilter_score"] = round(score, 3)
+                kept.append((score, position, result))
+
+        kept.sort(key=lambda entry: (-entry[0], entry[1]))
+        dropped = len(results) - len(kept)
+        self.stats = {
+            "candidates": len(results),
+            "kept": len(kept),
+            "dropped": dropped,
+            # Each dropped result would have been downloaded and sent to the relevance check
+            "fetches_saved": dropped,
+            "llm_relevance_checks_saved": dropped
+        }
+        return [result for _, _, result in kept]
+
+    @staticmethod
+    def _text(result):
+        parts = [str(result.get(field) or "") for field in ("title", "snippet")]
+        parts = [part for part in parts if part.strip().lower() not in _PLACEHOLDERS]
+        return " ".join(parts).strip()
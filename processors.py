@@ -1,113 +1,279 @@
 # processors.py
-import requests
 from bs4 import BeautifulSoup
-from langchain_community.document_loaders import WebBaseLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
+from prefilter import score_texts
+from http_client import get_client, read_limited
 import os
-import io
+import tempfile
+import time
 try:
     import PyPDF2
     PDF_AVAILABLE = True
 except ImportError:
     PDF_AVAILABLE = False
 
+# Rough conversion used for token budgets (French text averages about 4 characters per token)
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = "\n\n[...Document truncated due to length...]\n\n"
+
+
+def extract_pdf_text(path, max_pages=5, max_chars=50000):
+    """Extract text from the first pages of a PDF file, stopping at the page or character budget.
+
+    Pages are parsed lazily, so the rest of the document is never decoded. Module-level
+    so it can run in a worker process. Returns (text, pages_read, total_pages).
+    """
+    with open(path, "rb") as pdf_file:
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        total_pages = len(pdf_reader.pages)
+
+        text = ""
+        pages_read = 0
+        for i in range(min(max_pages, total_pages)):
+            text += (pdf_reader.pages[i].extract_text() or "") + "\n\n"
+            pages_read += 1
+            if len(text) >= max_chars:
+                text = text[:max_chars]
+                break
+
+    return text, pages_read, total_pages
+
+
+class ArticleLoadError(Exception):
+    """An article could not be downloaded, or held no text."""
+
 
 class ArticleProcessor:
-    def __init__(self):
+    def __init__(self, cache=None, token_budget=None, pdf_executor=None, http=None):
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=100
         )
+        # Chunks for content reduction must not overlap so they can be reassembled
+        self.chunk_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=1000,
+            chunk_overlap=0
+        )
+        # Maximum size, in tokens, of the article text sent to the LLM
+        self.token_budget = token_budget or int(os.getenv("CONTENT_TOKEN_BUDGET", 6000))
+        # Optional FetchCache; when set, articles are loaded through it
+        self.cache = cache
+        self.headers = {"User-Agent": os.getenv("USER_AGENT", "Mozilla/5.0 (compatible; ai-industry-benchmark)")}
+        # Limits for PDF downloads: hard size cap, and a deadline for the whole transfer
+        self.pdf_max_bytes = int(os.getenv("PDF_MAX_MB", 50)) * 1024 * 1024
+        self.pdf_timeout = int(os.getenv("PDF_TIMEOUT", 60))
+        self.pdf_max_pages = 5
+        # Optional executor (e.g. a process pool) running PDF text extraction
+        self.pdf_executor = pdf_executor
+        # Shared pooled session with timeouts and retries
+        self.http = http or get_client()
 
     def load_article(self, url):
-        """Load and process an article from a URL."""
-        try:
-            # Check if it's a PDF
-            if url.lower().endswith('.pdf'):
-                return self._load_pdf(url)
+        """Load and process an article from a URL.
+
+        Raises ArticleLoadError when the article cannot be downloaded or holds no
+        text, so a failed download is never judged as if it were the article.
+        """
+        if self.cache is not None:
+            return self._load_cached(url)
 
+        # Check if it's a PDF
+        if url.lower().endswith('.pdf'):
+            return self._load_pdf(url)
+
+        try:
             # Regular web page
-            loader = WebBaseLoader(url)
-            documents = loader.load()
+            response = self.http.get(url, headers=self.headers, stream=True)
+            response.raise_for_status()
+            return self._response_documents(url, response)
+
+        except Exception as e:
+            print(f"  Warning during article loading: {e}")
+            raise ArticleLoadError(f"Error loading content from {url}: {str(e)}") from e
 
-            # Check content size and handle large documents
-            total_content_length = sum(len(doc.page_content) for doc in documents)
+    def _load_cached(self, url):
+        """Load an article through the fetch cache, revalidating expired entries."""
+        entry = self.cache.get(url)
+        if entry and entry["fresh"]:
+            return entry["documents"]
 
-            # If content is too large (over 100,000 characters), summarize it
-            if total_content_length > 100000:
-                return self._handle_large_document(documents)
+        headers = dict(self.headers)
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
 
+        try:
+            response = self.http.get(url, headers=headers, stream=True)
+            if response.status_code == 304 and entry:
+                self.cache.touch(url)
+                return entry["documents"]
+            response.raise_for_status()
+
+            documents = self._response_documents(url, response)
+            self.cache.put(
+                url, documents,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
             return documents
 
         except Exception as e:
             print(f"  Warning during article loading: {e}")
-            # Return a minimal document so processing can continue
-            return [Document(page_content=f"Error loading content from {url}: {str(e)}", metadata={"source": url})]
+            if entry:
+                # Serve the expired copy rather than nothing
+                return entry["documents"]
+            raise ArticleLoadError(f"Error loading content from {url}: {str(e)}") from e
+
+    def _response_documents(self, url, response):
+        """Turn a streamed article response into documents, PDF or HTML."""
+        if url.lower().endswith('.pdf') or "application/pdf" in response.headers.get("Content-Type", ""):
+            documents = self._pdf_documents(url, response)
+        else:
+            documents = self._html_documents(url, response)
+            # If content is too large (over 100,000 characters), keep its most relevant parts
+            if sum(len(doc.page_content) for doc in documents) > 100000:
+                documents = self._handle_large_document(documents)
+
+        if not any(doc.page_content.strip() for doc in documents):
+            raise ValueError("no text content")
+        return documents
+
+    def _html_documents(self, url, response):
+        """Extract the text and metadata of an HTML response, within the response size cap."""
+        read_limited(response, self.http.max_bytes)
+        response.encoding = response.apparent_encoding
+        soup = BeautifulSoup(response.text, "html.parser")
+
+        metadata = {"source": url}
+        if title := soup.find("title"):
+            metadata["title"] = title.get_text()
+        if description := soup.find("meta", attrs={"name": "description"}):
+            metadata["description"] = description.get("content", "No description found.")
+        if html := soup.find("html"):
+            metadata["language"] = html.get("lang", "No language found.")
+
+        return [Document(page_content=soup.get_text(), metadata=metadata)]
 
     def _load_pdf(self, url):
         """Handle PDF documents with special processing to avoid token limits."""
         try:
-            # For PDF files, we download first
-            response = requests.get(url, stream=True)
+            # Stream the download so large reports never sit in memory
+            response = self.http.get(url, stream=True)
             response.raise_for_status()
 
-            # Try to use PyPDF or a similar library if available
-            if PDF_AVAILABLE:
-                pdf_file = io.BytesIO(response.content)
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
+            return self._response_documents(url, response)
 
-                # Extract text from only the first few pages (to stay within token limits)
-                text = ""
-                max_pages = min(5, len(pdf_reader.pages))
-
-                for i in range(max_pages):
-                    page = pdf_reader.pages[i]
-                    text += page.extract_text() + "\n\n"
+        except Exception as e:
+            print(f"  Error processing PDF: {e}")
+            raise ArticleLoadError(f"Error loading PDF from {url}: {str(e)}") from e
 
-                # Add a note that this is a truncated version
-                if max_pages < len(pdf_reader.pages):
-                    text += f"\n[Note: This is a truncated version of the document. Only the first {max_pages} of {len(pdf_reader.pages)} pages were processed due to token limitations.]"
+    def _pdf_documents(self, url, response):
+        """Spool a streamed PDF response to disk and extract the text of its first pages."""
+        # Try to use PyPDF or a similar library if available
+        if not PDF_AVAILABLE:
+            response.close()
+            # If PyPDF is not available, return a note
+            return [Document(
+                page_content=f"This is a PDF document from {url}. PDF processing requires the PyPDF2 library. Please install it with: pip install PyPDF2",
+                metadata={"source": url}
+            )]
 
-                return [Document(page_content=text, metadata={"source": url})]
+        path = self._spool_pdf(response)
+        try:
+            if self.pdf_executor is not None:
+                text, pages_read, total_pages = self.pdf_executor.submit(
+                    extract_pdf_text, path, self.pdf_max_pages
+                ).result()
             else:
-                # If PyPDF is not available, return a note
-                return [Document(
-                    page_content=f"This is a PDF document from {url}. PDF processing requires the PyPDF2 library. Please install it with: pip install PyPDF2",
-                    metadata={"source": url}
-                )]
+                text, pages_read, total_pages = extract_pdf_text(path, self.pdf_max_pages)
+        finally:
+            os.remove(path)
 
-        except Exception as e:
-            print(f"  Error processing PDF: {e}")
-            return [Document(page_content=f"Error loading PDF from {url}: {str(e)}", metadata={"source": url})]
+        # Add a note that this is a truncated version
+        if pages_read < total_pages:
+            text += f"\n[Note: This is a truncated version of the document. Only the first {pages_read} of {total_pages} pages were processed due to token limitations.]"
 
-    def _handle_large_document(self, documents):
-        """Handle large documents by extracting key information to stay within token limits."""
-        combined_text = "\n\n".join([doc.page_content for doc in documents])
-        
-        # Ensure the document is truncated to 50,000 characters
-        if len(combined_text) > 50000:
-            # Take first 25k and last 25k characters
-            intro = combined_text[:25000]
-            outro = combined_text[-25000:]
-            truncated_text = intro + "\n\n[...Document truncated due to length...]\n\n" + outro
-            
-            # Double-check the length after adding the truncation message
-            if len(truncated_text) > 50000:
-                # If still too long, adjust the intro and outro lengths
-                message_length = len("\n\n[...Document truncated due to length...]\n\n")
-                available_length = 50000 - message_length
-                intro = combined_text[:available_length // 2]
-                outro = combined_text[-(available_length // 2):]
-                truncated_text = intro + "\n\n[...Document truncated due to length...]\n\n" + outro
-        else:
-            truncated_text = combined_text
+        return [Document(page_content=text, metadata={"source": url})]
 
+    def _spool_pdf(self, response):
+        """Write a streamed response to a temporary file, enforcing the size cap and deadline."""
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > self.pdf_max_bytes:
+            response.close()
+            raise ValueError(f"PDF is {declared} bytes, over the {self.pdf_max_bytes} byte limit")
+
+        deadline = time.monotonic() + self.pdf_timeout
+        size = 0
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as spool:
+            try:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    size += len(chunk)
+                    if size > self.pdf_max_bytes:
+                        raise ValueError(f"PDF exceeds the {self.pdf_max_bytes} byte limit")
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"PDF download took longer than {self.pdf_timeout}s")
+                    spool.write(chunk)
+            except Exception:
+                spool.close()
+                os.remove(spool.name)
+                raise
+            finally:
+                response.close()
+
+        return spool.name
+
+    def _handle_large_document(self, documents):
+        """Handle large documents by keeping their most relevant parts to stay within token limits."""
         return [Document(
-            page_content=truncated_text,
+            page_content=self._select_chunks(documents, None, 50000),
             metadata={"source": documents[0].metadata.get("source", "unknown")}
         )]
 
+    def reduce_content(self, documents, industry=None, max_tokens=None):
+        """Return the article text reduced to its most relevant chunks within a token budget."""
+        max_chars = (max_tokens or self.token_budget) * CHARS_PER_TOKEN
+        return self._select_chunks(documents, industry, max_chars)
+
+    def _select_chunks(self, documents, industry, max_chars):
+        """Split the text, score chunks for AI/industry relevance and keep the best ones.
+
+        The first chunk (title and introduction) is always kept. Selected chunks are
+        reassembled in their original order, with a truncation marker for every gap.
+        """
+        combined_text = "\n\n".join([doc.page_content for doc in documents])
+        if len(combined_text) <= max_chars:
+            return combined_text
+
+        chunks = self.chunk_splitter.split_text(combined_text)
+        scores = score_texts(chunks, industry)
+
+        selected = {0}
+        used = len(chunks[0]) + len(TRUNCATION_MARKER)
+        ranked = sorted(range(1, len(chunks)), key=lambda i: (-scores[i][0], i))
+        for i in ranked:
+            # Each chunk may open a new gap, so reserve room for one more marker
+            cost = len(chunks[i]) + len(TRUNCATION_MARKER)
+            if used + cost <= max_chars:
+                selected.add(i)
+                used += cost
+
+        parts = []
+        previous = -1
+        for i in sorted(selected):
+            if i != previous + 1:
+                parts.append(TRUNCATION_MARKER)
+            elif parts:
+                parts.append("\n")
+            parts.append(chunks[i])
+            previous = i
+        if previous != len(chunks) - 1:
+            parts.append(TRUNCATION_MARKER)
+
+        return "".join(parts)[:max_chars]
+
     def extract_key_information(self, documents):
         """Extract key information about AI use cases from documents."""
         chunks = self.text_splitter.split_documents(documents)
@@ -0,0 +1,270 @@
+# rate_limit.py
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
+from dotenv import load_dotenv
+from http_client import RETRY_STATUSES, retry_after_seconds
+import openai
+
+load_dotenv()
+
+# Quotas used when no RATE_LIMIT_<PROVIDER>_* variable is set; 0 means unlimited
+DEFAULT_LIMITS = {
+    # gpt-4o-mini, usage tier 1
+    "openai": {"rpm": 500, "tpm": 200000, "concurrency": 8},
+    "tavily": {"rpm": 100, "tpm": 0, "concurrency": 4},
+    "google_cse": {"rpm": 100, "tpm": 0, "concurrency": 4},
+    "serpapi": {"rpm": 60, "tpm": 0, "concurrency": 4},
+    # Scraping Google without an API: stay well below its bot detection
+    "google_scraper": {"rpm": 20, "tpm": 0, "concurrency": 1},
+}
+# Wait applied to every caller after a 429 without Retry-After
+DEFAULT_THROTTLE_SECONDS = 5.0
+# How often aacquire() checks again for a slot while all of them are taken
+ASYNC_POLL_SECONDS = 0.05
+
+
+class TokenBucket:
+    """Refills at `per_minute` units per minute, holding at most `capacity` units.
+
+    The level may go negative when more than is available is taken (e.g. the
+    tokens of an LLM answer, only known afterwards); callers then wait until it
+    is paid back.
+    """
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        # A few seconds' worth of burst, so a quota is not spent in its first instant
+        self.capacity = capacity or max(1.0, per_minute / 6)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until the level reaches `amount`."""
+        self._refill(now)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount, now):
+        self._refill(now)
+        self.level -= amount
+
+
+class SlotHolds:
+    """Slots acquired, and not yet released, by the calls of one context.
+
+    Kept in a context variable rather than a thread-local: a context follows an
+    asyncio task, and the tasks it spawns share the same object, so a slot taken
+    by a LangChain async call is seen by the callback releasing it.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+
+class ProviderLimiter(BaseRateLimiter):
+    """Requests/min and tokens/min token buckets plus an adaptive concurrency cap for one provider.
+
+    Each call holds a slot between acquire() and release(). The number of slots
+    halves after a 429 and grows back by one after a full window of successful
+    calls (AIMD), so callers settle at the highest rate the quota allows. A 429
+    also pauses every caller for the server's Retry-After.
+
+    It is a LangChain rate limiter: pass it to the chat model as `rate_limiter` (it
+    is only consulted on cache misses) together with callback_handler(), which
+    releases the slot and charges the tokens of the answer.
+    """
+
+    def __init__(self, name, requests_per_minute=0, tokens_per_minute=0, max_concurrency=4):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = self.max_concurrency
+        self._in_flight = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._holds = contextvars.ContextVar(f"rate_limit_holds_{name}", default=None)
+        self.stats = {"calls": 0, "throttled": 0, "waited_seconds": 0.0}
+
+    def _wait_time(self, now):
+        if self._in_flight >= self.concurrency:
+            # Woken up by release()
+            return None
+        wait = max(0.0, self._paused_until - now)
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(0, now))
+        return wait
+
+    def _take(self, start, now):
+        # Called with self._cond held, once a slot is free
+        if self.requests is not None:
+            self.requests.take(1, now)
+        self._in_flight += 1
+        self.stats["calls"] += 1
+        self.stats["waited_seconds"] += now - start
+        holds = self._holds.get()
+        if holds is None:
+            holds = SlotHolds()
+            self._holds.set(holds)
+        holds.count += 1
+
+    def acquire(self, *, blocking=True):
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait == 0:
+                    break
+                if not blocking:
+                    return False
+                self._cond.wait(wait)
+            self._take(start, now)
+        return True
+
+    async def aacquire(self, *, blocking=True):
+        # Waits on the event loop, so the slot is recorded in the calling task's context
+        start = time.monotonic()
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait == 0:
+                    self._take(start, now)
+                    return True
+            if not blocking:
+                return False
+            await asyncio.sleep(ASYNC_POLL_SECONDS if wait is None else wait)
+
+    def track_holds(self):
+        """Count the slots acquired from the current context afresh, e.g. at the start of a call."""
+        self._holds.set(SlotHolds())
+
+    def holds_slot(self):
+        """Whether the current context acquired a slot it has not released yet."""
+        holds = self._holds.get()
+        return holds is not None and holds.count > 0
+
+    def release(self, tokens=0, throttled=False, retry_after=None):
+        """Free the slot taken by acquire() and adapt the limits to the call's outcome."""
+        with self._cond:
+            holds = self._holds.get()
+            if holds is not None and holds.count > 0:
+                holds.count -= 1
+            now = time.monotonic()
+            self._in_flight -= 1
+            if self.tokens is not None and tokens:
+                self.tokens.take(tokens, now)
+            if throttled:
+                self.stats["throttled"] += 1
+                delay = retry_after if retry_after is not None else DEFAULT_THROTTLE_SECONDS
+                self._paused_until = max(self._paused_until, now + delay)
+                self.concurrency = max(1, self.concurrency // 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.concurrency and self.concurrency < self.max_concurrency:
+                    self.concurrency += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+    def callback_handler(self):
+        """LangChain callback handler releasing the slots of chat model calls."""
+        return RateLimitHandler(self)
+
+    def snapshot(self):
+        with self._cond:
+            return {**self.stats, "waited_seconds": round(self.stats["waited_seconds"], 3),
+                    "concurrency": self.concurrency}
+
+
+class RateLimitHandler(BaseCallbackHandler):
+    """Releases a ProviderLimiter slot when a chat model call ends, charging its tokens.
+
+    Calls answered from the LLM cache never acquired a slot and are ignored. Runs
+    inline, in the context of the call, where the slot it acquired is recorded.
+    """
+
+    run_inline = True
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.limiter.track_holds()
+
+    def on_llm_end(self, response, **kwargs):
+        if not self.limiter.holds_slot():
+            return
+        tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                tokens += usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
+        self.limiter.release(tokens=tokens)
+
+    def on_llm_error(self, error, **kwargs):
+        if not self.limiter.holds_slot():
+            return
+        # openai.RateLimitError and other API errors carry the status and the response;
+        # 5xx answers are overload too, and back off the same way
+        throttled = getattr(error, "status_code", None) in RETRY_STATUSES
+        retry_after = None
+        response = getattr(error, "response", None)
+        if throttled and response is not None:
+            retry_after = retry_after_seconds(response)
+        self.limiter.release(throttled=throttled, retry_after=retry_after)
+
+
+# OpenAI errors worth another attempt once the limiter lets the call through again
+OPENAI_RETRY_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+
+def with_limiter_retries(llm, retry_on=OPENAI_RETRY_ERRORS, retries=None):
+    """Retry the failed calls of a rate-limited chat model, leaving the waits to its ProviderLimiter.
+
+    The model's client must not retry by itself (max_retries=0): every 429 then
+    reaches RateLimitHandler, which pauses all callers for Retry-After and halves
+    the concurrency, and the next attempt waits for its slot in acquire().
+    `retries` defaults to OPENAI_MAX_RETRIES (6).
+    """
+    retries = retries if retries is not None else int(os.getenv("OPENAI_MAX_RETRIES", 6))
+    return llm.with_retry(retry_if_exception_type=tuple(retry_on), wait_exponential_jitter=False,
+                          stop_after_attempt=retries + 1)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider):
+    """Process-wide limiter of a provider, configured by RATE_LIMIT_<PROVIDER>_RPM/_TPM/_CONCURRENCY."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            defaults = DEFAULT_LIMITS.get(provider, {"rpm": 0, "tpm": 0, "concurrency": 4})
+            prefix = f"RATE_LIMIT_{provider.upper()}"
+            _limiters[provider] = ProviderLimiter(
+                provider,
+                requests_per_minute=float(os.getenv(f"{prefix}_RPM", defaults["rpm"])),
+                tokens_per_minute=float(os.getenv(f"{prefix}_TPM", defaults["tpm"])),
+                max_concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", defaults["concurrency"])),
+            )
+        return _limiters[provider]
+
+
+def limiter_stats():
+    """Counters of every limiter created so far, by provider."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.snapshot() for name, limiter in limiters.items()}
@@ -0,0 +1,166 @@
+# run_journal.py
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class RunJournal:
+    """SQLite record of a benchmark run, written as each step completes.
+
+    For every industry of a run it keeps the search results, the output of each
+    pipeline stage per article and, once done, the industry's results. A run
+    interrupted at any point can be resumed from its run id without repeating
+    a search, a download or an LLM call already made. Runs older than `ttl`
+    seconds are purged when a new one starts.
+    """
+
+    def __init__(self, path=None, ttl=None):
+        self.path = path or os.getenv("RUN_JOURNAL_PATH", "cache/run_journal.db")
+        self.ttl = ttl if ttl is not None else int(os.getenv("RUN_JOURNAL_TTL", 30 * 24 * 3600))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                arguments TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS search_pages (
+                run_id TEXT NOT NULL,
+                industry TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                results TEXT,
+                PRIMARY KEY (run_id, industry, seq)
+            );
+            CREATE TABLE IF NOT EXISTS article_stages (
+                run_id TEXT NOT NULL,
+                industry TEXT NOT NULL,
+                url TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                output TEXT,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (run_id, industry, url, stage)
+            );
+            CREATE TABLE IF NOT EXISTS industries (
+                run_id TEXT NOT NULL,
+                industry TEXT NOT NULL,
+                results TEXT NOT NULL,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (run_id, industry)
+            );
+        """)
+        self._conn.commit()
+
+    def _write(self, statement, params):
+        with self._lock:
+            self._conn.execute(statement, params)
+            self._conn.commit()
+
+    def start_run(self, arguments):
+        """Record a new run with the arguments needed to resume it, and return its id."""
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        now = time.time()
+        with self._lock:
+            expired = [row[0] for row in self._conn.execute(
+                "SELECT run_id FROM runs WHERE updated_at < ?", (now - self.ttl,))]
+            for table in ("article_stages", "search_pages", "industries", "runs"):
+                self._conn.executemany(f"DELETE FROM {table} WHERE run_id = ?", [(old,) for old in expired])
+            self._conn.execute(
+                "INSERT INTO runs (run_id, arguments, status, created_at, updated_at) VALUES (?, ?, 'running', ?, ?)",
+                (run_id, json.dumps(arguments, ensure_ascii=False), now, now)
+            )
+            self._conn.commit()
+        return run_id
+
+    def get_run(self, run_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT arguments, status, created_at FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"run_id": run_id, "arguments": json.loads(row[0]), "status": row[1], "created_at": row[2]}
+
+    def finish_run(self, run_id, status="completed"):
+        self._write("UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?", (status, time.time(), run_id))
+
+    def reset_search(self, run_id, industry):
+        """Forget the pages of a search that did not finish, before it runs again."""
+        self._write("DELETE FROM search_pages WHERE run_id = ? AND industry = ?", (run_id, industry))
+
+    def record_search_page(self, run_id, industry, results):
+        with self._lock:
+            seq = self._conn.execute(
+                "SELECT COUNT(*) FROM search_pages WHERE run_id = ? AND industry = ? AND results IS NOT NULL",
+                (run_id, industry)
+            ).fetchone()[0]
+            self._conn.execute(
+                "INSERT INTO search_pages (run_id, industry, seq, results) VALUES (?, ?, ?, ?)",
+                (run_id, industry, seq, json.dumps(results, ensure_ascii=False))
+            )
+            self._conn.commit()
+
+    def finish_search(self, run_id, industry):
+        # A NULL page marks the search as complete
+        self._write("INSERT INTO search_pages (run_id, industry, seq, results) VALUES (?, ?, -1, NULL)",
+                    (run_id, industry))
+
+    def search_pages(self, run_id, industry):
+        """Result pages of a finished search, in arrival order, or None if it did not finish."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, results FROM search_pages WHERE run_id = ? AND industry = ? ORDER BY seq",
+                (run_id, industry)
+            ).fetchall()
+        if not rows or rows[0][0] != -1:
+            return None
+        return [json.loads(results) for _, results in rows[1:]]
+
+    def record_stage(self, run_id, industry, url, stage, output):
+        """Record the output of a stage for an article; None means the stage dropped it."""
+        self._write(
+            "INSERT OR REPLACE INTO article_stages (run_id, industry, url, stage, output, completed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (run_id, industry, url, stage, json.dumps(output, ensure_ascii=False), time.time())
+        )
+
+    def stage_outputs(self, run_id, industry):
+        """{(url, stage): output} of every stage already completed in the run."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, stage, output FROM article_stages WHERE run_id = ? AND industry = ?",
+                (run_id, industry)
+            ).fetchall()
+        return {(url, stage): json.loads(output) for url, stage, output in rows}
+
+    def finish_industry(self, run_id, industry, results):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO industries (run_id, industry, results, completed_at) VALUES (?, ?, ?, ?)",
+                (run_id, industry, json.dumps(results, ensure_ascii=False), now)
+            )
+            self._conn.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+            self._conn.commit()
+
+    def industry_results(self, run_id, industry):
+        """Results of an industry the run already completed, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results FROM industries WHERE run_id = ? AND industry = ?", (run_id, industry)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
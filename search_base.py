@@ -0,0 +1,213 @@
+# search_base.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from url_utils import canonical_url
+
+# Business functions used to vary the industry query once its result pages run out
+BUSINESS_FUNCTIONS = [
+    "service client", "marketing", "ventes", "finance et comptabilité", "ressources humaines",
+    "supply chain", "production", "gestion des risques et conformité",
+]
+# Result pages of one query fetched at the same time
+PAGE_WORKERS = 4
+
+
+def industry_query(industry):
+    """French query used by every provider to find AI use cases in an industry."""
+    return f"cas d'utilisation IA intelligence artificielle dans {industry} études de cas exemples France Europe"
+
+
+def industry_queries(industry):
+    """The industry query followed by one variation per business function."""
+    return [industry_query(industry)] + [
+        f"cas d'utilisation IA {function} dans {industry} exemples entreprises France Europe"
+        for function in BUSINESS_FUNCTIONS
+    ]
+
+
+def specific_case_query(industry, specific_case):
+    """French query used by every provider to look up one specific use case."""
+    return f"{specific_case} implémentation IA dans {industry} résultats métriques"
+
+
+class BaseSearchTool:
+    """Common interface of the search providers.
+
+    Subclasses implement `search(query, num_results)` and return a list of
+    {"title", "link", "snippet"} dicts; the industry-level helpers build the queries.
+
+    Providers that serve results page by page set `page_size` (and `max_results`,
+    the deepest result a query can reach) and implement `search_page(query, start,
+    count)` instead, raising when a page cannot be fetched; the pages of a query
+    are then fetched in parallel.
+    """
+
+    provider = "base"
+    page_size = None
+    max_results = None
+
+    def search(self, query, num_results=5):
+        if not self.page_size:
+            raise NotImplementedError
+        results = [result for page in self.iter_search(query, num_results, ordered=True) for result in page]
+        return results[:num_results]
+
+    def search_page(self, query, start, count):
+        raise NotImplementedError
+
+    def iter_search(self, query, num_results=5, ordered=False, on_error=None):
+        """Yield the results of a query page by page, as the pages arrive (or in rank order).
+
+        A page that fails is skipped and its exception passed to `on_error` (printed by default).
+        """
+        if not self.page_size:
+            yield self.search(query, num_results)
+            return
+
+        limit = min(num_results, self.max_results or num_results)
+        starts = range(0, limit, self.page_size)
+        with ThreadPoolExecutor(max_workers=min(len(starts), PAGE_WORKERS) or 1) as executor:
+            futures = [executor.submit(self.search_page, query, start, min(self.page_size, limit - start))
+                       for start in starts]
+            for future in (futures if ordered else as_completed(futures)):
+                try:
+                    page = future.result()
+                except Exception as e:
+                    if on_error is None:
+                        print(f"Error searching with {self.provider}: {e}")
+                    else:
+                        on_error(e)
+                    continue
+                yield page
+
+    def iter_industry_ai_cases(self, industry, num_results=5):
+        """Yield lists of new, distinct results for an industry as they arrive, up to `num_results`.
+
+        When the industry query runs out of results, variations per business
+        function are searched in turn until enough distinct URLs are found.
+        """
+        seen = set()
+        for query in industry_queries(industry):
+            for page in self.iter_search(query, num_results - len(seen)):
+                fresh = []
+                for result in page:
+                    link = result.get("link") if isinstance(result, dict) else None
+                    key = canonical_url(link) if isinstance(link, str) and link else None
+                    if key in seen or len(seen) >= num_results:
+                        continue
+                    if key is not None:
+                        seen.add(key)
+                    fresh.append(result)
+                if fresh:
+                    yield fresh
+            if len(seen) >= num_results:
+                return
+
+    def search_industry_ai_cases(self, industry, num_results=5):
+        """Search for AI use cases in a specific industry."""
+        return self.search(industry_query(industry), num_results)
+
+    def search_specific_case(self, industry, specific_case, num_results=3):
+        """Search for a specific AI use case in an industry."""
+        return self.search(specific_case_query(industry, specific_case), num_results)
+
+
+class SearchCache:
+    """Persistent cache of search results keyed by (provider, query, num_results)."""
+
+    def __init__(self, path=None, ttl=None):
+        self.path = path or os.getenv("SEARCH_CACHE_PATH", "cache/search_cache.db")
+        self.ttl = ttl if ttl is not None else int(os.getenv("SEARCH_CACHE_TTL", 24 * 3600))
+        self.stats = {"hits": 0, "misses": 0}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                provider TEXT NOT NULL,
+                query TEXT NOT NULL,
+                num_results INTEGER NOT NULL,
+                results TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (provider, query, num_results)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, provider, query, num_results):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, created_at FROM search_cache WHERE provider = ? AND query = ? AND num_results = ?",
+                (provider, query, num_results)
+            ).fetchone()
+            if row is None or time.time() - row[1] >= self.ttl:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+        return json.loads(row[0])
+
+    def put(self, provider, query, num_results, results):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (provider, query, num_results, results, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (provider, query, num_results, json.dumps(results, ensure_ascii=False), now)
+            )
+            # Expired entries are never served again
+            self._conn.execute("DELETE FROM search_cache WHERE created_at < ?", (now - self.ttl,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedSearchTool(BaseSearchTool):
+    """Wrap a search tool so repeated queries are answered from a SearchCache.
+
+    A cache hit never reaches the wrapped tool, so its network round-trip (and any
+    throttling delay it applies) is skipped. Empty results are not cached, since the
+    providers also return [] on errors, and neither are the partial results of a
+    paged search in which a page failed.
+    """
+
+    def __init__(self, tool, cache=None):
+        self.tool = tool
+        self.cache = cache or SearchCache()
+        self.provider = tool.provider
+
+    def search(self, query, num_results=5):
+        results = [result for page in self.iter_search(query, num_results, ordered=True) for result in page]
+        return results[:num_results]
+
+    def iter_search(self, query, num_results=5, ordered=False, on_error=None):
+        results = self.cache.get(self.provider, query, num_results)
+        if results is not None:
+            yield results
+            return
+
+        failures = []
+
+        def page_failed(error):
+            failures.append(error)
+            if on_error is None:
+                print(f"Error searching with {self.provider}: {error}")
+            else:
+                on_error(error)
+
+        results = []
+        for page in self.tool.iter_search(query, num_results, ordered=ordered, on_error=page_failed):
+            results.extend(page)
+            yield page
+        # A missing page would otherwise be missing for the whole TTL
+        if results and not failures:
+            self.cache.put(self.provider, query, num_results, results)
@@ -1,13 +1,21 @@
 # tavily_search.py
-import requests
 import os
 from dotenv import load_dotenv
+from http_client import get_client
+from rate_limit import get_limiter
+from search_base import BaseSearchTool
 
 load_dotenv()
 
 
-class TavilySearchTool:
-    def __init__(self):
+class TavilySearchTool(BaseSearchTool):
+    provider = "tavily"
+    # Tavily returns a single page of at most 20 results
+    max_results = 20
+
+    def __init__(self, http=None):
+        self.http = http or get_client()
+        self.limiter = get_limiter(self.provider)
         self.api_key = os.getenv("TAVILY_API_KEY")
         self.base_url = "https://api.tavily.com/search"
 
@@ -15,23 +23,21 @@ class TavilySearchTool:
             print("Warning: TAVILY_API_KEY not found in environment variables.")
             print("Please sign up for a free API key at https://tavily.com")
 
-    def search_industry_ai_cases(self, industry, num_results=5):
-        """Search for AI use cases in a specific industry using Tavily AI Search."""
-        query = f"cas d'utilisation IA intelligence artificielle dans {industry} études de cas exemples France Europe"
-
+    def search(self, query, num_results=5):
+        """Run a query against Tavily AI Search."""
         # Set up the search parameters
         params = {
             "api_key": self.api_key,
             "query": query,
             "search_depth": "advanced",
-            "max_results": num_results,
+            "max_results": min(num_results, self.max_results),
             "include_answer": False,
             "include_domains": ["*.fr", "*.eu", "*.com", "*.org"],
             "include_raw_content": False,
         }
 
         try:
-            response = requests.post(self.base_url, json=params)
+            response = self.http.post(self.base_url, json=params, limiter=self.limiter)
             response.raise_for_status()
             data = response.json()
 
@@ -49,11 +55,6 @@ class TavilySearchTool:
             print(f"Error searching with Tavily: {e}")
             return []
 
-    def search_specific_case(self, industry, specific_case):
-        """Search for a specific AI use case in an industry."""
-        query = f"{specific_case} implémentation IA dans {industry} résultats métriques"
-        return self.search_industry_ai_cases(query, 3)
-
 # Usage example:
 # search_tool = TavilySearchTool()
-# results = search_tool.search_industry_ai_cases("finance", 5)
\ No newline at end of file
+# results = search_tool.search_industry_ai_cases("finance", 5)
@@ -3,4 +3,7 @@ import sys
 
 # Add the project root directory to the Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root) 
\ No newline at end of file
+sys.path.insert(0, project_root)
+
+# Never let the tests touch the database configured in .env
+os.environ["DATABASE_URL"] = "sqlite://"
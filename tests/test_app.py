@@ -0,0 +1,162 @@
+import gzip
+import json
+import pytest
+import app as app_module
+from database import DatabaseManager
+from tests.test_database import make_use_case
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'app.db'}")
+    manager.upsert_use_cases([
+        make_use_case(f"https://example.com/{i}", industry="retail" if i % 2 else "finance",
+                      derniere_mise_a_jour=f"2024-05-{i + 1:02d}",
+                      technologies_ia_utilisees=["Computer Vision"] if i % 3 == 0 else ["NLP"])
+        for i in range(7)
+    ])
+    monkeypatch.setattr(app_module, "db_manager", manager)
+    yield app_module.app.test_client()
+    manager.db.close()
+
+def collect_pages(client, query=""):
+    links, cursor, pages = [], None, 0
+    while True:
+        url = f"/api/use-cases?limit=3{query}" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url).get_json()
+        assert body["success"]
+        links.extend(case["lien"] for cases in body["data"].values() for case in cases)
+        pages += 1
+        cursor = body["next_cursor"]
+        if not cursor:
+            return links, pages
+
+def test_use_cases_are_paginated_with_cursor(client):
+    """Pages follow each other without gaps or repeats, newest first."""
+    links, pages = collect_pages(client)
+
+    assert pages == 3
+    assert len(links) == len(set(links)) == 7
+    assert links[0] == "https://example.com/6"
+
+def test_use_cases_filters(client):
+    """Industry, technology and date filters are applied in the query."""
+    links, _ = collect_pages(client, "&industry=retail&technology=nlp")
+    dated, _ = collect_pages(client, "&since=2024-05-02&until=2024-05-03")
+
+    assert sorted(links) == ["https://example.com/1", "https://example.com/5"]
+    assert sorted(dated) == ["https://example.com/1", "https://example.com/2"]
+
+def test_invalid_parameters_are_rejected(client):
+    assert client.get("/api/use-cases?cursor=not-a-cursor").status_code == 400
+    assert client.get("/api/use-cases?since=yesterday").status_code == 400
+
+def test_etag_and_if_none_match(client):
+    """An unchanged page is answered with 304 Not Modified."""
+    first = client.get("/api/use-cases")
+    second = client.get("/api/use-cases", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.headers["ETag"].startswith("W/")
+    assert second.status_code == 304
+    assert second.data == b""
+
+def test_gzip_compression(client):
+    """Clients accepting gzip get a compressed body."""
+    response = client.get("/api/use-cases", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    body = json.loads(gzip.decompress(response.data))
+    assert body["count"] == 7
+
+def test_industries_endpoint(client):
+    assert client.get("/api/industries").get_json()["data"] == ["finance", "retail"]
+
+def test_concurrent_readers(client):
+    """Requests served from many threads each use their own session."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def read(i):
+        query = "?industry=retail" if i % 2 else "?technology=nlp"
+        return client.get(f"/api/use-cases{query}").status_code
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(read, range(64)))
+
+    assert statuses == [200] * 64
+
+def test_sessions_are_per_thread(client):
+    """The manager hands a different session to every thread."""
+    import threading
+    sessions = []
+
+    def grab():
+        sessions.append(app_module.db_manager.db)
+        app_module.db_manager.remove_session()
+
+    threads = [threading.Thread(target=grab) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sessions[0] is not sessions[1]
+    assert app_module.db_manager.db is app_module.db_manager.db
+
+def test_export_ndjson(client):
+    """The NDJSON export has one use case per line."""
+    response = client.get("/api/export?format=ndjson&industry=retail")
+
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.data.decode("utf-8").splitlines()
+    assert len(lines) == 3
+    assert all(json.loads(line)["industry"] == "retail" for line in lines)
+
+def test_export_csv(client):
+    """The CSV export has a header and list fields joined with '; '."""
+    import csv
+    import io
+    response = client.get("/api/export?format=csv")
+
+    assert response.mimetype == "text/csv"
+    assert "attachment" in response.headers["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.data.decode("utf-8"))))
+    assert len(rows) == 7
+    assert rows[0]["technologies_ia_utilisees"] in ("NLP", "Computer Vision")
+
+def test_export_is_streamed(client):
+    """The body is produced lazily, row by row."""
+    response = client.get("/api/export", buffered=False)
+
+    assert response.is_streamed
+    first_chunk = next(response.response)
+    assert json.loads(first_chunk)["lien"] == "https://example.com/6"
+    response.close()
+
+def test_export_rejects_unknown_format(client):
+    assert client.get("/api/export?format=xml").status_code == 400
+
+def test_search_endpoint(client):
+    """/api/search returns ranked matches and honours the listing filters."""
+    body = client.get("/api/search?q=fraudes&industry=retail").get_json()
+
+    assert body["success"]
+    assert body["count"] == 3
+    assert {case["industry"] for case in body["data"]} == {"retail"}
+    assert "score" in body["data"][0]
+    assert client.get("/api/search").status_code == 400
+
+def test_metrics_endpoint(client, tmp_path, monkeypatch):
+    """/metrics exposes the last run report of each industry and the request counters."""
+    from metrics import HttpMetrics, RunMetrics, write_run_report
+    monkeypatch.setattr(app_module, "http_metrics", HttpMetrics())
+    run = RunMetrics()
+    run.record_stage("finance", "fetch", 0.5, items=1)
+    run.record_llm("finance", "extraction", 1.2, prompt_tokens=1000, completion_tokens=200)
+    write_run_report(run.report("finance"), str(tmp_path / "reports" / "run_report_finance.json"))
+    monkeypatch.setattr(app_module, "RUN_REPORTS_DIR", str(tmp_path / "reports"))
+    client.get("/api/industries")
+
+    body = client.get("/metrics").data.decode("utf-8")
+
+    assert 'ai_benchmark_stage_seconds{industry="finance",stage="fetch"} 0.5' in body
+    assert 'ai_benchmark_llm_tokens{industry="finance",operation="extraction",type="prompt"} 1000' in body
+    assert 'http_requests_total{endpoint="get_industries",status="200"} 1' in body
@@ -0,0 +1,47 @@
+import json
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from benchmarks import IndustryAnalyzer, AIUseCaseAnalysis
+
+USE_CASE = {
+    "industry": "finance",
+    "business_function": "Conformité",
+    "entreprise": "[ESTIMATION] Banque régionale",
+    "origine_de_la_source": "article",
+    "lien": "",
+    "derniere_mise_a_jour": "2024-05-01",
+    "processus_impacte": ["Détection de fraude"],
+    "valeur_economique": "Non mentionné",
+    "gains_attendus_realises": ["Réduction des pertes de 30%"],
+    "usage_ia": "Détection des transactions frauduleuses",
+    "technologies_ia_utilisees": ["Machine Learning"],
+    "partenaires_impliques": []
+}
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    return IndustryAnalyzer()
+
+def test_single_pass_returns_use_case_with_checks(analyzer):
+    """One LLM call yields the use case, its coherence flags and the estimated fields."""
+    answer = dict(USE_CASE, incoherences=["Gain de 30% non justifié"], champs_estimes=["entreprise"])
+    analyzer.llm = FakeListChatModel(responses=[json.dumps(answer, ensure_ascii=False)])
+
+    result = analyzer.analyze_article_single_pass("contenu", "https://example.com/cas", "finance")
+
+    assert isinstance(result, AIUseCaseAnalysis)
+    assert result.lien == "https://example.com/cas"
+    assert result.incoherences == ["Gain de 30% non justifié"]
+    assert result.champs_estimes == ["entreprise"]
+    assert result.entreprise.startswith("[ESTIMATION]")
+
+def test_single_pass_repairs_text_in_list_fields(analyzer):
+    """'Non mentionné' in list fields is turned into an empty list."""
+    answer = dict(USE_CASE, partenaires_impliques="Non mentionné", incoherences=[], champs_estimes=[])
+    analyzer.llm = FakeListChatModel(responses=[json.dumps(answer, ensure_ascii=False)] * 2)
+
+    result = analyzer.analyze_article_single_pass("contenu", "https://example.com/cas", "finance")
+
+    assert result.partenaires_impliques == []
+    assert result.incoherences == []
@@ -0,0 +1,216 @@
+import pytest
+from sqlalchemy import text
+from database import DatabaseManager, use_case_id
+
+def make_use_case(url="https://example.com/cas", **overrides):
+    use_case = {
+        "industry": "finance",
+        "business_function": "Conformité",
+        "entreprise": "Banque X",
+        "origine_de_la_source": "article",
+        "lien": url,
+        "derniere_mise_a_jour": "2024-05-01",
+        "processus_impacte": ["Détection de fraude"],
+        "valeur_economique": None,
+        "gains_attendus_realises": ["Réduction des pertes"],
+        "usage_ia": "Détection des transactions frauduleuses",
+        "technologies_ia_utilisees": ["Machine Learning"],
+        "partenaires_impliques": None
+    }
+    use_case.update(overrides)
+    return use_case
+
+@pytest.fixture
+def db_manager(tmp_path):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    yield manager
+    manager.db.close()
+
+def test_use_case_id_is_stable_across_url_spellings():
+    assert use_case_id("https://Example.com/cas/#top") == use_case_id("https://example.com/cas")
+
+def test_upsert_inserts_then_updates(db_manager):
+    """Saving the same article twice updates the existing row."""
+    first = db_manager.upsert_use_cases([make_use_case(), make_use_case("https://example.com/autre")])
+    second = db_manager.upsert_use_cases([make_use_case(usage_ia="Nouvelle description")])
+
+    assert first == {"inserted": 2, "updated": 0, "skipped": 0,
+                     "ids": [use_case_id("https://example.com/cas"), use_case_id("https://example.com/autre")]}
+    assert second == {"inserted": 0, "updated": 1, "skipped": 0, "ids": [use_case_id("https://example.com/cas")]}
+
+    rows = db_manager.get_use_cases_by_industry("finance")
+    assert len(rows) == 2
+    updated = next(row for row in rows if row["lien"] == "https://example.com/cas")
+    assert updated["usage_ia"] == "Nouvelle description"
+    assert updated["derniere_mise_a_jour"].startswith("2024-05-01")
+    assert updated["partenaires_impliques"] == []
+
+def test_upsert_skips_invalid_and_repeated_rows(db_manager):
+    """Rows missing required fields and repeated URLs within a batch are skipped."""
+    counts = db_manager.upsert_use_cases([
+        make_use_case(),
+        make_use_case(usage_ia=""),
+        make_use_case("https://example.com/cas#copie")
+    ])
+
+    assert counts == {"inserted": 1, "updated": 0, "skipped": 2, "ids": [use_case_id("https://example.com/cas")]}
+
+def test_save_use_cases_accepts_model_dump_without_id(db_manager):
+    """AIUseCase.model_dump() has no id; it is derived from the URL."""
+    assert db_manager.save_use_cases([make_use_case()]) == 1
+    assert db_manager.save_use_case(make_use_case()) is True
+
+def test_find_use_cases_by_technology_and_industry(db_manager):
+    """List filters are matched through the child tables, ignoring case and accents."""
+    db_manager.upsert_use_cases([
+        make_use_case("https://example.com/a", industry="retail", technologies_ia_utilisees=["Computer Vision"]),
+        make_use_case("https://example.com/b", industry="retail", technologies_ia_utilisees=["NLP"]),
+        make_use_case("https://example.com/c", technologies_ia_utilisees=["computer vision"]),
+        make_use_case("https://example.com/d", industry="retail", partenaires_impliques=["Société Générale"]),
+    ])
+
+    results = db_manager.find_use_cases(industry="retail", technology="computer vision")
+    partners = db_manager.find_use_cases(partner="societe generale")
+
+    assert [row["lien"] for row in results] == ["https://example.com/a"]
+    assert results[0]["technologies_ia_utilisees"] == ["Computer Vision"]
+    assert [row["lien"] for row in partners] == ["https://example.com/d"]
+
+def test_upsert_replaces_list_values(db_manager):
+    """Saving an article again replaces its list values instead of appending."""
+    db_manager.upsert_use_cases([make_use_case(technologies_ia_utilisees=["NLP", "ML"])])
+    db_manager.upsert_use_cases([make_use_case(technologies_ia_utilisees=["Computer Vision"])])
+
+    row = db_manager.get_use_cases_by_industry("finance")[0]
+
+    assert row["technologies_ia_utilisees"] == ["Computer Vision"]
+
+def test_legacy_json_columns_are_migrated(tmp_path):
+    """Databases created by older versions get their JSON list columns moved to child tables."""
+    import sqlite3
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE ai_use_cases (
+            id VARCHAR PRIMARY KEY, industry VARCHAR NOT NULL, business_function VARCHAR NOT NULL,
+            origine_de_la_source VARCHAR NOT NULL, lien VARCHAR NOT NULL, usage_ia VARCHAR NOT NULL,
+            derniere_mise_a_jour DATETIME, processus_impacte VARCHAR, gains_attendus_realises VARCHAR,
+            technologies_ia_utilisees VARCHAR, partenaires_impliques VARCHAR
+        )
+    """)
+    conn.execute(
+        "INSERT INTO ai_use_cases VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ("legacy-1", "retail", "Marketing", "article", "https://example.com/legacy", "Recommandation",
+         "2024-01-02 00:00:00.000000", '["Personnalisation"]', '["Ventes +5%"]', '["Computer Vision", "NLP"]', None)
+    )
+    conn.commit()
+    conn.close()
+
+    manager = DatabaseManager(f"sqlite:///{path}")
+    row = manager.find_use_cases(industry="retail", technology="nlp")[0]
+
+    assert row["id"] == "legacy-1"
+    assert row["technologies_ia_utilisees"] == ["Computer Vision", "NLP"]
+    assert row["processus_impacte"] == ["Personnalisation"]
+    assert row["partenaires_impliques"] == []
+    assert row["incoherences"] == [] and row["champs_estimes"] == []
+
+    conn = sqlite3.connect(path)
+    columns = {info[1] for info in conn.execute("PRAGMA table_info(ai_use_cases)")}
+    indexes = {info[1] for info in conn.execute("PRAGMA index_list(ai_use_cases)")}
+    conn.close()
+    assert "technologies_ia_utilisees" not in columns
+    assert {"incoherences", "champs_estimes"} <= columns
+    assert "ix_ai_use_cases_industry" in indexes
+    manager.db.close()
+
+def test_quality_notes_are_stored(db_manager):
+    """The coherence notes and estimated fields of a single-pass analysis are persisted."""
+    db_manager.upsert_use_cases([make_use_case(incoherences=["Date future"], champs_estimes=["entreprise"])])
+
+    row = db_manager.find_use_cases(industry="finance")[0]
+    assert row["incoherences"] == ["Date future"]
+    assert row["champs_estimes"] == ["entreprise"]
+
+    db_manager.upsert_use_cases([make_use_case()])
+    assert db_manager.find_use_cases(industry="finance")[0]["incoherences"] == []
+
+def test_iter_use_cases_streams_all_matching_rows(db_manager):
+    """iter_use_cases yields every match, newest first, across several fetch batches."""
+    db_manager.upsert_use_cases([
+        make_use_case(f"https://example.com/{i}", derniere_mise_a_jour=f"2024-05-{i + 1:02d}")
+        for i in range(5)
+    ] + [make_use_case("https://example.com/sante", industry="healthcare")])
+
+    rows = list(db_manager.iter_use_cases(batch_size=2, industry="finance"))
+
+    assert [row["lien"] for row in rows] == [f"https://example.com/{i}" for i in range(4, -1, -1)]
+    assert rows[0]["technologies_ia_utilisees"] == ["Machine Learning"]
+
+def test_search_matches_stems_and_accents(db_manager):
+    """Search ignores accents and inflections and ranks the closest match first."""
+    db_manager.upsert_use_cases([
+        make_use_case(),
+        make_use_case("https://example.com/livraison", industry="logistics",
+                      usage_ia="Optimiser les tournées de livraison",
+                      processus_impacte=["Planification des tournées"],
+                      gains_attendus_realises=["Réduction des coûts de livraison"]),
+    ])
+
+    assert [r["lien"] for r in db_manager.search("fraudes détectées")] == ["https://example.com/cas"]
+    assert [r["lien"] for r in db_manager.search("optimisation livraisons")] == ["https://example.com/livraison"]
+    assert [r["lien"] for r in db_manager.search("cout")] == ["https://example.com/livraison"]
+    assert db_manager.search("fraude", {"industry": "logistics"}) == []
+    assert db_manager.search("de la") == []
+
+def test_search_index_follows_updates_and_is_rebuilt(tmp_path):
+    """Updating a use case re-indexes it, and a missing index is rebuilt on startup."""
+    url = f"sqlite:///{tmp_path / 'search.db'}"
+    manager = DatabaseManager(url)
+    manager.upsert_use_cases([make_use_case()])
+    manager.upsert_use_cases([make_use_case(usage_ia="Scoring de crédit", processus_impacte=["Octroi"])])
+
+    assert manager.search("transactions") == []
+    assert len(manager.search("credit")) == 1
+
+    with manager.engine.begin() as connection:
+        connection.execute(text("DROP TABLE ai_use_cases_fts"))
+    manager.remove_session()
+
+    assert len(DatabaseManager(url).search("octroi")) == 1
+
+def test_scan_search_skips_the_index_build(tmp_path):
+    """Without a stored index (dialects other than SQLite/PostgreSQL), startup reads no rows."""
+    from unittest.mock import patch
+    from fulltext import ScanFullTextIndex
+    url = f"sqlite:///{tmp_path / 'scan.db'}"
+    DatabaseManager(url).upsert_use_cases([make_use_case()])
+
+    with patch("database.create_fulltext_index", return_value=ScanFullTextIndex()), \
+            patch.object(DatabaseManager, "iter_use_cases") as iter_use_cases:
+        manager = DatabaseManager(url)
+
+    iter_use_cases.assert_not_called()
+    assert len(manager.search("transactions")) == 1
+
+def test_search_index_rows_are_keyed_by_rowid(tmp_path):
+    """FTS rows use the hashed id as rowid; an index built with automatic rowids is rebuilt."""
+    from fulltext import fts_rowid
+    url = f"sqlite:///{tmp_path / 'rowid.db'}"
+    manager = DatabaseManager(url)
+    manager.upsert_use_cases([make_use_case()])
+    manager.upsert_use_cases([make_use_case(usage_ia="Scoring de crédit")])
+
+    with manager.engine.begin() as connection:
+        rows = connection.execute(text("SELECT rowid, use_case_id FROM ai_use_cases_fts")).all()
+        assert [(row.rowid, row.use_case_id) for row in rows] == [(fts_rowid(use_case_id("https://example.com/cas")),
+                                                                  use_case_id("https://example.com/cas"))]
+        # Layout of earlier versions: automatic rowids
+        connection.execute(text("DELETE FROM ai_use_cases_fts"))
+        connection.execute(text("INSERT INTO ai_use_cases_fts (use_case_id, content) VALUES (:id, 'transaction')"),
+                           {"id": use_case_id("https://example.com/cas")})
+    manager.remove_session()
+
+    rebuilt = DatabaseManager(url)
+    assert rebuilt.search("transactions") == []
+    assert len(rebuilt.search("credit")) == 1
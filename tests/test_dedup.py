@@ -0,0 +1,47 @@
+import pytest
+from dedup import NearDuplicateDetector
+
+ARTICLE = (
+    "La banque a déployé un modèle d'apprentissage automatique pour détecter les transactions "
+    "frauduleuses en temps réel. Le système analyse chaque paiement par carte, compare le comportement "
+    "du client à son historique et bloque les opérations suspectes avant leur validation. Selon la "
+    "direction des risques, les pertes liées à la fraude ont baissé de trente pour cent la première "
+    "année, tandis que le nombre de faux positifs signalés aux conseillers a été divisé par deux. "
+    "Le projet a été mené avec une start-up spécialisée dans la détection d'anomalies."
+)
+
+@pytest.fixture
+def detector(tmp_path):
+    detector = NearDuplicateDetector(path=str(tmp_path / "dedup.db"), min_words=20)
+    yield detector
+    detector.close()
+
+def test_syndicated_copy_is_detected(detector):
+    """A copy with a different header and footer is a near-duplicate of the original."""
+    copy = "Communiqué de presse. " + ARTICLE.replace("trente", "30") + " Tous droits réservés."
+
+    assert detector.check("https://banque.example/article", ARTICLE) is None
+    assert detector.check("https://presse.example/communique", copy) == "https://banque.example/article"
+    assert detector.stats["duplicates"] == 1
+
+def test_distinct_and_short_texts_are_kept(detector):
+    other = ("Un assureur utilise la vision par ordinateur pour estimer les dégâts sur les véhicules "
+             "à partir des photos envoyées par les assurés, ce qui réduit le délai d'indemnisation "
+             "de plusieurs jours et libère les experts pour les sinistres complexes.")
+
+    assert detector.check("https://banque.example/article", ARTICLE) is None
+    assert detector.check("https://assurance.example/photos", other) is None
+    assert detector.check("https://a.example/404", "Page introuvable") is None
+    assert detector.stats["too_short"] == 1
+
+def test_signatures_persist_across_instances(tmp_path):
+    """A duplicate is caught by a later run, but an article is never its own duplicate."""
+    path = str(tmp_path / "dedup.db")
+    first = NearDuplicateDetector(path=path, min_words=20)
+    first.check("https://banque.example/article", ARTICLE)
+    first.close()
+
+    second = NearDuplicateDetector(path=path, min_words=20)
+    assert second.check("http://www.banque.example/article", ARTICLE) is None
+    assert second.check("https://miroir.example/article", ARTICLE) == "https://banque.example/article"
+    second.close()
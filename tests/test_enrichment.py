@@ -0,0 +1,52 @@
+from unittest.mock import MagicMock
+from langchain_core.messages import AIMessage
+from enrichment import QualityEnhancer
+
+def make_enhancer(answers):
+    enhancer = QualityEnhancer.__new__(QualityEnhancer)
+    enhancer.llm = MagicMock()
+    enhancer.llm.batch.return_value = [AIMessage(content=answer) for answer in answers]
+    return enhancer
+
+def test_filter_relevance_batch_groups_excerpts():
+    """Articles are sent batch_size at a time, as truncated numbered excerpts."""
+    enhancer = make_enhancer([
+        '[{"id": 1, "pertinent": true, "confiance": 0.9}, {"id": 2, "pertinent": false, "confiance": 0.8}]',
+        '```json\n[{"id": 1, "pertinent": true, "confiance": 0.6}]\n```'
+    ])
+
+    results = enhancer.filter_relevance_batch(["a" * 5000, "b", "c"], "finance", batch_size=2, excerpt_chars=100)
+
+    assert results == [
+        {"relevant": True, "confidence": 0.9},
+        {"relevant": False, "confidence": 0.8},
+        {"relevant": True, "confidence": 0.6},
+    ]
+    prompts = enhancer.llm.batch.call_args[0][0]
+    assert len(prompts) == 2
+    assert "a" * 100 in prompts[0] and "a" * 101 not in prompts[0]
+    assert "Extrait 2:" in prompts[0]
+
+def test_filter_relevance_batch_keeps_unparsed_articles():
+    """Articles without a readable verdict are kept with zero confidence."""
+    enhancer = make_enhancer(['[{"id": 2, "pertinent": false, "confiance": 0.9}]'])
+
+    results = enhancer.filter_relevance_batch(["a", "b"], "finance")
+
+    assert results == [{"relevant": True, "confidence": 0.0}, {"relevant": False, "confidence": 0.9}]
+
+def test_filter_relevance_batch_reads_string_verdicts():
+    """String verdicts are parsed, not truth-tested: "false" and "non" reject the article."""
+    enhancer = make_enhancer([
+        '[{"id": 1, "pertinent": "false", "confiance": 0.8}, {"id": 2, "pertinent": "Non", "confiance": 0.7},'
+        ' {"id": 3, "pertinent": "oui", "confiance": 0.6}, {"id": 4, "pertinent": "peut-être", "confiance": 0.5}]'
+    ])
+
+    results = enhancer.filter_relevance_batch(["a", "b", "c", "d"], "finance")
+
+    assert results == [
+        {"relevant": False, "confidence": 0.8},
+        {"relevant": False, "confidence": 0.7},
+        {"relevant": True, "confidence": 0.6},
+        {"relevant": True, "confidence": 0.0},
+    ]
@@ -0,0 +1,94 @@
+import pytest
+from langchain_core.documents import Document
+from fetch_cache import FetchCache
+from http_client import HttpClient
+from processors import ArticleLoadError, ArticleProcessor
+from url_utils import normalize_url
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = FetchCache(path=str(tmp_path / "fetch.db"), ttl=3600, max_bytes=10 * 1024 * 1024)
+    yield cache
+    cache.close()
+
+def test_normalize_url():
+    """Case, default port, fragment, query order and trailing slash do not change the key."""
+    assert normalize_url("HTTPS://Example.com:443/Article/?b=2&a=1#top") == "https://example.com/Article?a=1&b=2"
+    assert normalize_url("http://example.com") == "http://example.com/"
+
+def test_cache_hit_skips_network(cache, requests_mock):
+    """A fresh entry is returned without any HTTP request."""
+    url = "http://example.com/article.html"
+    requests_mock.get(url, text="<html lang='fr'><head><title>IA</title></head><body><p>Contenu</p></body></html>",
+                      headers={"ETag": '"v1"'})
+    processor = ArticleProcessor(cache=cache)
+
+    first = processor.load_article(url)
+    second = processor.load_article(url + "#section")
+
+    assert requests_mock.call_count == 1
+    assert "Contenu" in second[0].page_content
+    assert second[0].metadata == first[0].metadata
+    assert second[0].metadata["title"] == "IA"
+    assert cache.stats["misses"] == 1
+    assert cache.stats["hits"] == 1
+
+def test_expired_entry_is_revalidated(tmp_path, requests_mock):
+    """An expired entry sends the stored validators and is reused on 304."""
+    cache = FetchCache(path=str(tmp_path / "fetch.db"), ttl=0)
+    url = "http://example.com/article.html"
+    cache.put(url, [Document(page_content="Cached", metadata={"source": url})],
+              etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    requests_mock.get(url, status_code=304)
+
+    result = ArticleProcessor(cache=cache).load_article(url)
+
+    assert result[0].page_content == "Cached"
+    assert requests_mock.last_request.headers["If-None-Match"] == '"v1"'
+    assert requests_mock.last_request.headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert cache.stats["revalidated"] == 1
+    cache.close()
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Once over the size limit, the least recently used entries go first."""
+    cache = FetchCache(path=str(tmp_path / "fetch.db"), ttl=3600, max_bytes=250)
+    page = [Document(page_content="x" * 50, metadata={"source": "test"})]
+
+    cache.put("http://example.com/a", page)
+    cache.put("http://example.com/b", page)
+    cache.get("http://example.com/a")
+    cache.put("http://example.com/c", page)
+
+    assert cache.get("http://example.com/b") is None
+    assert cache.get("http://example.com/a") is not None
+    assert cache.get("http://example.com/c") is not None
+    assert cache.stats["evictions"] == 1
+    cache.close()
+
+def test_canonical_url():
+    """Tracking parameters, scheme and www do not change the identity of an article."""
+    from url_utils import canonical_url
+    assert canonical_url("http://www.Example.com/a/?utm_source=x&id=3&fbclid=y#top") == "https://example.com/a?id=3"
+    assert canonical_url("https://example.com/a?id=3") == "https://example.com/a?id=3"
+
+def test_unparsable_urls_are_kept_as_is():
+    """An invalid port does not break normalization; the raw URL is used instead."""
+    from url_utils import canonical_url
+    assert normalize_url(" http://x.com:abc/a ") == "http://x.com:abc/a"
+    assert canonical_url("http://www.x.com:abc/a?utm_source=y") == "https://x.com:abc/a"
+    assert normalize_url("http://[::1/a") == "http://[::1/a"
+
+def test_failed_fetch_serves_expired_copy_or_raises(tmp_path, requests_mock):
+    """A failed revalidation falls back to the expired copy; without one it raises."""
+    cache = FetchCache(path=str(tmp_path / "fetch.db"), ttl=0)
+    url = "http://example.com/article.html"
+    cache.put(url, [Document(page_content="Cached", metadata={"source": url})])
+    requests_mock.get(url, status_code=503)
+    requests_mock.get(url + "-new", status_code=503)
+    processor = ArticleProcessor(cache=cache, http=HttpClient(max_retries=0))
+
+    assert processor.load_article(url)[0].page_content == "Cached"
+    with pytest.raises(ArticleLoadError):
+        processor.load_article(url + "-new")
+    assert cache.get(url + "-new") is None
+    cache.close()
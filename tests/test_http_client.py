@@ -0,0 +1,89 @@
+import pytest
+import requests
+from http_client import HttpClient, ResponseTooLarge, retry_after_seconds
+
+
+@pytest.fixture
+def client():
+    return HttpClient(max_retries=2, backoff=0, max_backoff=0, max_bytes=1024)
+
+
+def test_retries_transient_errors(client, requests_mock):
+    url = "https://api.example.com/search"
+    requests_mock.get(url, [
+        {"status_code": 503},
+        {"status_code": 429, "headers": {"Retry-After": "0"}},
+        {"json": {"results": []}},
+    ])
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.json() == {"results": []}
+    assert requests_mock.call_count == 3
+    assert client.stats == {"requests": 3, "retries": 2, "failures": 0}
+
+
+def test_gives_up_after_max_retries(client, requests_mock):
+    url = "https://api.example.com/search"
+    requests_mock.get(url, status_code=500)
+
+    response = client.get(url)
+
+    assert response.status_code == 500
+    assert requests_mock.call_count == 3
+    assert client.stats["failures"] == 1
+
+
+def test_client_errors_are_not_retried(client, requests_mock):
+    url = "https://api.example.com/search"
+    requests_mock.get(url, status_code=404)
+
+    assert client.get(url).status_code == 404
+    assert requests_mock.call_count == 1
+
+
+def test_connection_errors_are_retried_then_raised(client, requests_mock):
+    url = "https://api.example.com/search"
+    requests_mock.get(url, exc=requests.ConnectionError)
+
+    with pytest.raises(requests.ConnectionError):
+        client.get(url)
+    assert requests_mock.call_count == 3
+
+
+def test_response_size_limit(client, requests_mock):
+    requests_mock.get("https://example.com/declared", content=b"x" * 2048)
+    requests_mock.get("https://example.com/chunked", content=b"x" * 2048, headers={"Content-Length": ""})
+
+    with pytest.raises(ResponseTooLarge):
+        client.get("https://example.com/declared")
+    with pytest.raises(ResponseTooLarge):
+        client.get("https://example.com/chunked")
+    assert len(client.get("https://example.com/chunked", max_bytes=4096).content) == 2048
+
+
+def test_streamed_responses_are_left_unread(client, requests_mock):
+    requests_mock.get("https://example.com/report.pdf", content=b"x" * 2048)
+
+    response = client.get("https://example.com/report.pdf", stream=True)
+
+    assert b"".join(response.iter_content(512)) == b"x" * 2048
+
+
+def test_default_timeout_is_applied(client, requests_mock):
+    requests_mock.get("https://example.com/", text="ok")
+
+    client.get("https://example.com/")
+
+    assert requests_mock.last_request.timeout == client.timeout
+
+
+def test_retry_after_parsing():
+    response = requests.Response()
+    response.headers["Retry-After"] = "12"
+    assert retry_after_seconds(response) == 12
+    response.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert retry_after_seconds(response) == 0
+    response.headers["Retry-After"] = "bientôt"
+    assert retry_after_seconds(response) is None
@@ -0,0 +1,62 @@
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from llm_cache import LLMCache
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm.db"), ttl=3600, max_entries=100)
+    yield cache
+    cache.close()
+
+def test_repeated_prompt_is_served_from_cache(cache):
+    """The second identical call returns the memoized answer instead of calling the model."""
+    llm = FakeListChatModel(responses=["OUI", "NON"], cache=cache)
+
+    assert llm.invoke("Contenu pertinent ?").content == "OUI"
+    assert llm.invoke("Contenu pertinent ?").content == "OUI"
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+def test_cache_persists_across_instances(tmp_path):
+    """Entries written by one run are found by the next one."""
+    path = str(tmp_path / "llm.db")
+    first = LLMCache(path=path)
+    FakeListChatModel(responses=["OUI"], cache=first).invoke("Question")
+    first.close()
+
+    second = LLMCache(path=path)
+    assert FakeListChatModel(responses=["OUI"], cache=second).invoke("Question").content == "OUI"
+    assert second.stats["hits"] == 1
+    second.close()
+
+def test_model_configuration_is_part_of_the_key(cache):
+    """The same prompt sent to a differently configured model is a miss."""
+    FakeListChatModel(responses=["OUI"], cache=cache).invoke("Question")
+    result = FakeListChatModel(responses=["NON"], cache=cache).invoke("Question")
+
+    assert result.content == "NON"
+    assert cache.stats["hits"] == 0
+    assert cache.stats["misses"] == 2
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Above max_entries the least recently used answers are dropped."""
+    cache = LLMCache(path=str(tmp_path / "llm.db"), max_entries=2)
+    llm = FakeListChatModel(responses=["A", "B", "C"], cache=cache)
+
+    llm.invoke("un")
+    llm.invoke("deux")
+    llm.invoke("trois")
+
+    assert cache.stats["evictions"] == 1
+    assert cache.lookup("un", "unused") is None
+    cache.close()
+
+def test_expired_entries_are_misses(tmp_path):
+    """Entries older than the TTL are ignored."""
+    cache = LLMCache(path=str(tmp_path / "llm.db"), ttl=0)
+    llm = FakeListChatModel(responses=["A", "B"], cache=cache)
+
+    llm.invoke("Question")
+
+    assert llm.invoke("Question").content == "B"
+    cache.close()
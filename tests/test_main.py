@@ -0,0 +1,245 @@
+import json
+from unittest.mock import patch
+import main
+from multi_search import MultiSearchTool
+from search_base import BaseSearchTool, CachedSearchTool, SearchCache
+
+
+def test_parse_industries_from_string_and_file(tmp_path):
+    """Industries from --industries and --industries-file are merged without duplicates."""
+    industries_file = tmp_path / "industries.txt"
+    industries_file.write_text("# nightly run\nhealthcare\n\nretail\nfinance\n", encoding="utf-8")
+
+    result = main.parse_industries("finance, healthcare", str(industries_file))
+
+    assert result == ["finance", "healthcare", "retail"]
+
+def test_run_batch_benchmark_writes_summary(tmp_path, monkeypatch):
+    """Batch mode shares one set of tools and records per-industry status."""
+    monkeypatch.chdir(tmp_path)
+    shared_tools = {"shared": True}
+
+    def fake_run(industry, cases_per_industry, tools, **options):
+        assert tools is shared_tools
+        if industry == "energy":
+            raise RuntimeError("search failed")
+        return {"use_cases": [{}] * 2, "benchmark": ""}
+
+    with patch("main.create_tools", return_value=shared_tools), \
+            patch("main.run_industry_benchmark", side_effect=fake_run), \
+            patch("main.close_tools") as close_tools:
+        summary = main.run_batch_benchmark(["finance", "energy"], parallel_industries=2)
+
+    close_tools.assert_called_once_with(shared_tools)
+
+    assert [item["industry"] for item in summary["industries"]] == ["finance", "energy"]
+    assert summary["industries"][0]["status"] == "success"
+    assert summary["industries"][1]["status"] == "error"
+    assert summary["total_use_cases"] == 2
+
+    with open(tmp_path / "output" / "benchmark_summary.json", encoding="utf-8") as f:
+        assert json.load(f) == summary
+
+class StaticSearchTool(BaseSearchTool):
+    provider = "static"
+
+    def __init__(self, results):
+        self.results = results
+
+    def search(self, query, num_results=5):
+        return self.results[:num_results]
+
+def make_tools(tmp_path, links):
+    """Tools for run_industry_benchmark with every network and LLM call replaced."""
+    from unittest.mock import MagicMock
+    from benchmarks import AIUseCase
+    from database import DatabaseManager
+    from tests.test_database import make_use_case
+
+    search_tool = StaticSearchTool([
+        {"title": "IA et fraude bancaire", "link": link, "snippet": "cas d'usage de l'IA en banque"} for link in links
+    ])
+    processor = MagicMock(cache=None)
+    processor.load_article.side_effect = lambda url: [url]
+    processor.reduce_content.side_effect = lambda documents, industry: documents[0]
+    enhancer = MagicMock()
+    enhancer.filter_relevance_batch.side_effect = lambda contents, industry, batch_size: [
+        {"relevant": "hors-sujet" not in content, "confidence": 0.9} for content in contents
+    ]
+    analyzer = MagicMock()
+    analyzer.analyze_article_content.side_effect = lambda content, url, industry: AIUseCase(**make_use_case(url))
+    analyzer.compare_industry_use_cases.return_value = MagicMock(content="")
+    return {
+        "search_tool": search_tool, "processor": processor, "analyzer": analyzer, "enhancer": enhancer,
+        "db_manager": DatabaseManager(f"sqlite:///{tmp_path / 'runs.db'}"),
+    }
+
+def test_second_run_skips_processed_articles(tmp_path, monkeypatch):
+    """Saved and irrelevant articles are not fetched again, whatever the URL spelling."""
+    monkeypatch.chdir(tmp_path)
+    tools = make_tools(tmp_path, ["https://example.com/a?utm_source=x", "https://example.com/hors-sujet"])
+    first = main.run_industry_benchmark("finance", tools=tools, prefilter=False)
+
+    tools["search_tool"].results = [
+        {"link": "http://www.example.com/a#top"}, {"link": "https://example.com/hors-sujet"},
+        {"link": "https://example.com/nouveau"},
+    ]
+    tools["processor"].load_article.reset_mock()
+    second = main.run_industry_benchmark("finance", tools=tools, prefilter=False)
+
+    assert len(first["use_cases"]) == 1 and first["skipped_articles"] == 0
+    assert second["skipped_articles"] == 2
+    assert [call.args[0] for call in tools["processor"].load_article.call_args_list] == ["https://example.com/nouveau"]
+
+def test_refresh_processes_everything_again(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tools = make_tools(tmp_path, ["https://example.com/a"])
+    main.run_industry_benchmark("finance", tools=tools, prefilter=False)
+
+    results = main.run_industry_benchmark("finance", tools=tools, prefilter=False, refresh=True)
+
+    assert results["skipped_articles"] == 0
+    assert len(results["use_cases"]) == 1
+
+
+def test_failed_fetch_is_not_marked_processed(tmp_path, monkeypatch):
+    """An article whose download failed is retried by the next run instead of being skipped."""
+    from processors import ArticleLoadError
+    monkeypatch.chdir(tmp_path)
+    tools = make_tools(tmp_path, ["https://example.com/a", "https://example.com/down"])
+
+    def load(url):
+        if url.endswith("/down"):
+            raise ArticleLoadError(f"Error loading content from {url}: 503 Server Error")
+        return [url]
+
+    tools["processor"].load_article.side_effect = load
+    first = main.run_industry_benchmark("finance", tools=tools, prefilter=False)
+
+    assert [case["lien"] for case in first["use_cases"]] == ["https://example.com/a"]
+    assert tools["db_manager"].get_processed_urls("finance", ["https://example.com/a", "https://example.com/down"]) \
+        == {"https://example.com/a"}
+
+    tools["processor"].load_article.reset_mock()
+    tools["processor"].load_article.side_effect = lambda url: [url]
+    second = main.run_industry_benchmark("finance", tools=tools, prefilter=False)
+
+    assert second["skipped_articles"] == 1
+    assert [call.args[0] for call in tools["processor"].load_article.call_args_list] == ["https://example.com/down"]
+    assert [case["lien"] for case in second["use_cases"]] == ["https://example.com/down"]
+
+def test_use_case_not_saved_is_not_marked_processed(tmp_path, monkeypatch):
+    """A use case the database rejected is analysed again by the next run."""
+    from benchmarks import AIUseCase
+    from tests.test_database import make_use_case
+    monkeypatch.chdir(tmp_path)
+    tools = make_tools(tmp_path, ["https://example.com/a", "https://example.com/incomplet"])
+    tools["analyzer"].analyze_article_content.side_effect = lambda content, url, industry: AIUseCase(
+        **make_use_case(url, **({"usage_ia": ""} if url.endswith("/incomplet") else {}))
+    )
+
+    main.run_industry_benchmark("finance", tools=tools, prefilter=False)
+
+    assert tools["db_manager"].get_processed_urls(
+        "finance", ["https://example.com/a", "https://example.com/incomplet"]
+    ) == {"https://example.com/a"}
+
+def test_tools_created_for_a_single_run_are_closed(tmp_path, monkeypatch):
+    """Tools created by run_industry_benchmark itself are closed when the run ends."""
+    from unittest.mock import MagicMock
+    monkeypatch.chdir(tmp_path)
+    tools = make_tools(tmp_path, ["https://example.com/a"])
+    tools["processor"].pdf_executor = MagicMock()
+    tools["processor"].cache = MagicMock(stats={})
+    tools["search_cache"] = MagicMock()
+    tools["search_tool"].close = MagicMock()
+
+    with patch("main.create_tools", return_value=tools):
+        results = main.run_industry_benchmark("finance", prefilter=False)
+
+    assert len(results["use_cases"]) == 1
+    tools["processor"].pdf_executor.shutdown.assert_called_once()
+    tools["processor"].cache.close.assert_called_once()
+    tools["search_tool"].close.assert_called_once()
+    tools["search_cache"].close.assert_called_once()
+    tools["analyzer"].llm_cache.close.assert_called_once()
+
+def test_get_search_tool_fans_out_over_configured_providers(tmp_path, monkeypatch):
+    monkeypatch.setenv("TAVILY_API_KEY", "test-key")
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.delenv("SERPAPI_API_KEY", raising=False)
+    cache = SearchCache(path=str(tmp_path / "search.db"))
+
+    tool = main.get_search_tool(cache)
+
+    assert isinstance(tool, MultiSearchTool)
+    assert [provider.provider for provider in tool.tools] == ["tavily", "google_scraper"]
+    assert all(isinstance(provider, CachedSearchTool) for provider in tool.tools)
+
+    monkeypatch.setenv("SEARCH_PROVIDERS", "google_scraper")
+    assert main.get_search_tool().provider == "google_scraper"
+
+
+def test_resumed_run_repeats_no_completed_work(tmp_path, monkeypatch):
+    """A run interrupted during extraction resumes with only the unfinished article stages."""
+    from run_journal import RunJournal
+    monkeypatch.chdir(tmp_path)
+    tools = make_tools(tmp_path, ["https://example.com/a", "https://example.com/b", "https://example.com/hors-sujet"])
+    extract = tools["analyzer"].analyze_article_content.side_effect
+
+    def crash_on_b(content, url, industry):
+        if url.endswith("/b"):
+            raise RuntimeError("killed")
+        return extract(content, url, industry)
+
+    tools["analyzer"].analyze_article_content.side_effect = crash_on_b
+    journal = RunJournal(path=str(tmp_path / "journal.db"))
+    run_id = journal.start_run({"industries": ["finance"]})
+    # The process is killed before the industry is marked complete
+    journal.finish_industry = lambda *args: None
+    first = main.run_industry_benchmark("finance", tools=tools, prefilter=False, journal=journal, run_id=run_id)
+    assert len(first["use_cases"]) == 1
+
+    # The journaled search results are replayed, and completed stages are not run again
+    tools["search_tool"].results = []
+    tools["analyzer"].analyze_article_content.side_effect = extract
+    for name in ("processor", "enhancer", "analyzer"):
+        tools[name].reset_mock()
+    second = main.run_industry_benchmark("finance", tools=tools, prefilter=False, refresh=True,
+                                         journal=journal, run_id=run_id)
+
+    assert sorted(case["lien"] for case in second["use_cases"]) == ["https://example.com/a", "https://example.com/b"]
+    tools["processor"].load_article.assert_not_called()
+    tools["enhancer"].filter_relevance_batch.assert_not_called()
+    assert [call.args[1] for call in tools["analyzer"].analyze_article_content.call_args_list] == [
+        "https://example.com/b"
+    ]
+
+
+def test_resumed_run_fetches_failed_downloads_again(tmp_path, monkeypatch):
+    """A failed download is not journaled as a completed fetch, so resuming retries it."""
+    from processors import ArticleLoadError
+    from run_journal import RunJournal
+    monkeypatch.chdir(tmp_path)
+    tools = make_tools(tmp_path, ["https://example.com/a", "https://example.com/down"])
+
+    def load(url):
+        if url.endswith("/down"):
+            raise ArticleLoadError(f"Error loading content from {url}: Read timed out")
+        return [url]
+
+    tools["processor"].load_article.side_effect = load
+    journal = RunJournal(path=str(tmp_path / "journal.db"))
+    run_id = journal.start_run({"industries": ["finance"]})
+    journal.finish_industry = lambda *args: None
+    main.run_industry_benchmark("finance", tools=tools, prefilter=False, journal=journal, run_id=run_id)
+
+    assert ("https://example.com/down", "fetch") not in journal.stage_outputs(run_id, "finance")
+
+    tools["processor"].load_article.reset_mock()
+    tools["processor"].load_article.side_effect = lambda url: [url]
+    resumed = main.run_industry_benchmark("finance", tools=tools, prefilter=False, refresh=True,
+                                          journal=journal, run_id=run_id)
+
+    assert [call.args[0] for call in tools["processor"].load_article.call_args_list] == ["https://example.com/down"]
+    assert sorted(case["lien"] for case in resumed["use_cases"]) == ["https://example.com/a", "https://example.com/down"]
@@ -0,0 +1,65 @@
+from langchain_community.chat_models.fake import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from llm_cache import LLMCache
+from metrics import RunMetrics, llm_config
+
+class UsageChatModel(FakeListChatModel):
+    """Fake chat model reporting token usage like ChatOpenAI does."""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        text = self.responses[0]
+        message = AIMessage(content=text, usage_metadata={"input_tokens": 100, "output_tokens": 20, "total_tokens": 120})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+def test_llm_calls_are_recorded_by_operation(tmp_path):
+    """Tokens, cost and cache hits are attributed to the labelled operation and industry."""
+    metrics = RunMetrics()
+    cache = LLMCache(path=str(tmp_path / "llm.db"))
+    llm = UsageChatModel(responses=["OUI"], cache=cache, callbacks=[metrics.callback_handler()])
+
+    llm.invoke("Article 1", config=llm_config("relevance", "finance"))
+    llm.invoke("Article 1", config=llm_config("relevance", "finance"))
+    llm.batch(["A", "B"], config=llm_config("coherence", "retail"))
+
+    finance = metrics.report("finance")
+    relevance = finance["llm"]["relevance"]
+    assert relevance["calls"] == 2
+    assert relevance["cache_hits"] == 1
+    assert relevance["prompt_tokens"] == 100 and relevance["completion_tokens"] == 20
+    assert relevance["tokens_saved"] == 120
+    assert relevance["cost_usd"] > 0
+    assert "coherence" not in finance["llm"]
+    assert metrics.report()["llm_totals"]["calls"] == 4
+
+def test_cache_hits_are_read_from_the_generation_tag():
+    """A response is counted as a cache hit from LLMCache's tag, not from its usage keys."""
+    from uuid import uuid4
+    from langchain_core.outputs import LLMResult
+    metrics = RunMetrics()
+    handler = metrics.callback_handler()
+    usage = {"input_tokens": 100, "output_tokens": 20, "total_tokens": 120}
+
+    for generation_info in ({"cache_hit": True}, None):
+        run_id = uuid4()
+        handler.on_chat_model_start({}, [], run_id=run_id, metadata=llm_config("relevance", "finance")["metadata"])
+        generation = ChatGeneration(message=AIMessage(content="OUI", usage_metadata=usage),
+                                    generation_info=generation_info)
+        handler.on_llm_end(LLMResult(generations=[[generation]]), run_id=run_id)
+
+    relevance = metrics.report("finance")["llm"]["relevance"]
+    assert relevance["calls"] == 2
+    assert relevance["cache_hits"] == 1
+
+def test_timed_stages_count_errors():
+    metrics = RunMetrics()
+    with metrics.timed("finance", "search"):
+        pass
+    try:
+        with metrics.timed("finance", "search"):
+            raise RuntimeError("quota")
+    except RuntimeError:
+        pass
+
+    stage = metrics.report("finance")["stages"]["search"]
+    assert stage["calls"] == 2 and stage["errors"] == 1
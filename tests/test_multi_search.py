@@ -0,0 +1,94 @@
+import time
+from multi_search import MultiSearchTool, fuse_results
+from search_base import BaseSearchTool
+
+
+class FakeProvider(BaseSearchTool):
+    def __init__(self, provider, links, delay=0.0, fail=False):
+        self.provider = provider
+        self.links = links
+        self.delay = delay
+        self.fail = fail
+
+    def search(self, query, num_results=5):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        return [{"title": f"{self.provider} {link}", "link": link, "snippet": ""} for link in self.links[:num_results]]
+
+
+def test_fusion_ranks_urls_found_by_several_providers_first():
+    fused = fuse_results({
+        "tavily": [{"link": "https://a.fr/1"}, {"link": "https://b.fr/2"}],
+        "google_cse": [{"link": "https://c.fr/3"}, {"link": "http://www.b.fr/2?utm_source=x"}],
+    }, 3)
+
+    assert [result["link"] for result in fused] == ["https://b.fr/2", "https://a.fr/1", "https://c.fr/3"]
+    assert fused[0]["providers"] == ["tavily", "google_cse"]
+
+
+def test_merges_all_providers():
+    tool = MultiSearchTool([
+        FakeProvider("tavily", ["https://a.fr/1", "https://b.fr/2"]),
+        FakeProvider("google_cse", ["https://b.fr/2", "https://c.fr/3"]),
+    ], hedge_grace=1.0)
+
+    results = tool.search("IA finance", 5)
+
+    assert [result["link"] for result in results] == ["https://b.fr/2", "https://a.fr/1", "https://c.fr/3"]
+
+
+def test_hedged_search_does_not_wait_for_slow_provider():
+    tool = MultiSearchTool([
+        FakeProvider("tavily", ["https://a.fr/1", "https://b.fr/2"]),
+        FakeProvider("google_scraper", ["https://c.fr/3"], delay=1.0),
+    ], hedge_grace=0.05)
+
+    start = time.monotonic()
+    results = tool.search("IA finance", 2)
+
+    assert time.monotonic() - start < 0.5
+    assert [result["link"] for result in results] == ["https://a.fr/1", "https://b.fr/2"]
+    time.sleep(1.1)
+    stats = tool.provider_stats()
+    assert stats["google_scraper"]["late"] == 1
+    assert stats["tavily"]["calls"] == 1
+
+
+def test_waits_for_slow_provider_when_results_are_missing():
+    tool = MultiSearchTool([
+        FakeProvider("tavily", ["https://a.fr/1"]),
+        FakeProvider("google_scraper", ["https://c.fr/3"], delay=0.2),
+    ], hedge_grace=0.0)
+
+    assert len(tool.search("IA finance", 2)) == 2
+
+
+def test_failing_provider_is_counted_and_ignored():
+    tool = MultiSearchTool([
+        FakeProvider("tavily", [], fail=True),
+        FakeProvider("google_cse", ["https://c.fr/3"]),
+    ])
+
+    assert [result["link"] for result in tool.search("IA finance", 3)] == ["https://c.fr/3"]
+    stats = tool.provider_stats()
+    assert stats["tavily"]["errors"] == 1
+    assert stats["google_cse"]["results"] == 1
+    assert stats["google_cse"]["p95_ms"] >= 0
+
+
+def test_timeout_bounds_the_search():
+    tool = MultiSearchTool([FakeProvider("google_scraper", ["https://c.fr/3"], delay=0.5)], timeout=0.1)
+
+    assert tool.search("IA finance", 1) == []
+
+def test_close_lets_late_answers_finish():
+    tool = MultiSearchTool([
+        FakeProvider("tavily", ["https://a.fr/1"]),
+        FakeProvider("google_scraper", ["https://c.fr/3"], delay=0.3),
+    ], hedge_grace=0.0)
+    tool.search("IA finance", 1)
+
+    tool.close()
+
+    assert tool.provider_stats()["google_scraper"]["calls"] == 1
@@ -0,0 +1,24 @@
+from perf.run_benchmarks import run_size, find_regressions
+
+def test_offline_run_replays_fixtures():
+    """The replayed pipeline yields the recorded use cases and times every stage."""
+    result = run_size(5, llm_latency=0)
+
+    # Three HTML articles and the PDF report are relevant; the mortgage-rate article is not
+    assert result["use_cases"] == 4
+    assert {"search", "fetch", "relevance", "extraction", "verification", "save"} <= set(result["stages"])
+    assert result["llm"]["calls"] == 10 and result["llm"]["prompt_tokens"] > 0
+    assert result["stages"]["relevance"]["items"] == 5
+    assert result["peak_memory_mb"] > 0
+
+def test_regressions_are_flagged():
+    stage = {"calls": 50, "items": 50, "mean_ms": 10, "p50_ms": 10, "p95_ms": 20, "total_seconds": 0.5}
+    baseline = {"sizes": {"50": {"throughput_articles_per_second": 10.0, "peak_memory_mb": 5.0,
+                                 "stages": {"fetch": stage}}}}
+    report = {"sizes": {"50": {"throughput_articles_per_second": 7.0, "peak_memory_mb": 5.5,
+                               "stages": {"fetch": {**stage, "p95_ms": 30}}}}}
+
+    regressions = find_regressions(report, baseline, tolerance=0.2)
+
+    assert len(regressions) == 2
+    assert "throughput" in regressions[0] and "fetch p95" in regressions[1]
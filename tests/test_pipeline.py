@@ -0,0 +1,152 @@
+import threading
+import time
+from pipeline import StagedPipeline, Stage
+
+
+def test_results_keep_input_order():
+    """Items finishing out of order are still returned in input order."""
+    def slow_for_small(n):
+        time.sleep(0.01 * (5 - n))
+        return n
+
+    pipeline = StagedPipeline([
+        Stage("sleep", slow_for_small, workers=5),
+        Stage("double", lambda n: n * 2, workers=2),
+    ])
+
+    assert pipeline.run(range(5)) == [0, 2, 4, 6, 8]
+
+def test_dropped_items_skip_later_stages():
+    """Returning None from a stage drops the item."""
+    seen = []
+
+    def keep_even(n):
+        return n if n % 2 == 0 else None
+
+    def record(n):
+        seen.append(n)
+        return n
+
+    pipeline = StagedPipeline([Stage("filter", keep_even), Stage("record", record)])
+
+    assert pipeline.run([1, 2, 3, 4]) == [None, 2, None, 4]
+    assert sorted(seen) == [2, 4]
+
+def test_stage_errors_are_reported_and_dropped():
+    """An exception in one item does not stop the others."""
+    errors = []
+
+    def fail_on_two(n):
+        if n == 2:
+            raise ValueError("boom")
+        return n
+
+    pipeline = StagedPipeline(
+        [Stage("check", fail_on_two, workers=2)],
+        on_error=lambda item, stage, e: errors.append((item, stage, str(e)))
+    )
+
+    assert pipeline.run([1, 2, 3]) == [1, None, 3]
+    assert errors == [(2, "check", "boom")]
+
+def test_stage_workers_run_concurrently():
+    """Each stage processes up to `workers` items at the same time."""
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def track(n):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return n
+
+    StagedPipeline([Stage("track", track, workers=3)]).run(range(6))
+
+    assert peak == 3
+
+def test_batch_stage_groups_items():
+    """A batch stage receives lists of at most batch_size items."""
+    batches = []
+
+    def classify(items):
+        batches.append(list(items))
+        return [n if n % 3 else None for n in items]
+
+    pipeline = StagedPipeline([
+        Stage("fetch", lambda n: n, workers=4),
+        Stage("classify", classify, batch_size=4),
+        Stage("double", lambda n: n * 2),
+    ])
+
+    assert pipeline.run(range(1, 11)) == [2, 4, None, 8, 10, None, 14, 16, None, 20]
+    assert sorted(n for batch in batches for n in batch) == list(range(1, 11))
+    assert all(len(batch) <= 4 for batch in batches)
+
+def test_batch_stage_flushes_when_upstream_drops_items():
+    """A partial batch is flushed once the remaining items are dropped before reaching it."""
+    pipeline = StagedPipeline([
+        Stage("filter", lambda n: n if n < 2 else None, workers=2),
+        Stage("classify", lambda items: [n + 100 for n in items], batch_size=10),
+    ])
+
+    assert pipeline.run(range(5)) == [100, 101, None, None, None]
+
+def test_batch_stage_errors_drop_the_whole_batch():
+    """An exception in a batch function is reported for every item of the batch."""
+    errors = []
+
+    def fail(items):
+        raise RuntimeError("quota")
+
+    pipeline = StagedPipeline(
+        [Stage("classify", fail, batch_size=2)],
+        on_error=lambda item, stage, e: errors.append(item)
+    )
+
+    assert pipeline.run([1, 2, 3]) == [None, None, None]
+    assert sorted(errors) == [1, 2, 3]
+
+def test_on_stage_reports_every_call():
+    """on_stage receives the duration, item count and outcome of each stage call."""
+    calls = []
+
+    def fail_on_three(n):
+        if n == 3:
+            raise ValueError("boom")
+        return n
+
+    pipeline = StagedPipeline(
+        [Stage("check", fail_on_three, workers=2), Stage("classify", lambda items: items, batch_size=10)],
+        on_error=lambda item, stage, e: None,
+        on_stage=lambda name, seconds, items, failed: calls.append((name, items, failed))
+    )
+    pipeline.run([1, 2, 3])
+
+    assert sorted(calls) == [("check", 1, False), ("check", 1, False), ("check", 1, True), ("classify", 2, False)]
+
+def test_items_from_a_generator_start_before_it_ends():
+    """The first stage works on produced items while the generator is still running."""
+    started = threading.Event()
+
+    def produce():
+        yield 1
+        # The first item reaches the stage before the second one is produced
+        assert started.wait(1)
+        yield 2
+        yield 3
+
+    def record(n):
+        started.set()
+        return n
+
+    pipeline = StagedPipeline([
+        Stage("record", record, workers=2),
+        Stage("batch", lambda items: [n * 10 for n in items], batch_size=2),
+    ])
+
+    assert pipeline.run(produce()) == [10, 20, 30]
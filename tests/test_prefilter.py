@@ -0,0 +1,67 @@
+from prefilter import SearchResultPrefilter, normalize_text
+
+def result(title, snippet, link="https://example.com"):
+    return {"title": title, "link": link, "snippet": snippet}
+
+def test_normalize_text_strips_accents():
+    assert normalize_text("Étude de cas : l’IA générative") == "etude de cas : l'ia generative"
+
+def test_off_topic_results_are_dropped():
+    """Results without any AI signal, or without industry/use-case signal, are not fetched."""
+    prefilter = SearchResultPrefilter("finance")
+    results = [
+        result("Recette de la tarte aux pommes", "Une recette facile"),
+        result("La banque X déploie l'IA contre la fraude", "Étude de cas sur la détection de fraude"),
+        result("Intelligence artificielle", "Définition générale"),
+    ]
+
+    kept = prefilter.rank(results)
+
+    assert [r["title"] for r in kept] == ["La banque X déploie l'IA contre la fraude"]
+    assert prefilter.stats["dropped"] == 2
+    assert prefilter.stats["fetches_saved"] == 2
+
+def test_results_are_ranked_by_score():
+    """Results with more distinctive industry and AI terms come first."""
+    prefilter = SearchResultPrefilter("healthcare")
+    results = [
+        result("L'IA dans un projet", "Un projet d'entreprise avec de l'IA", link="https://a"),
+        result("Diagnostic médical par vision par ordinateur à l'hôpital",
+               "Le deep learning aide les médecins en radiologie, résultats chez les patients", link="https://b"),
+    ]
+
+    kept = prefilter.rank(results)
+
+    assert [r["link"] for r in kept] == ["https://b", "https://a"]
+    assert kept[0]["prefilter_score"] > kept[1]["prefilter_score"]
+
+def test_results_without_text_are_kept():
+    """When title and snippet are placeholders there is nothing to judge, so the result is kept."""
+    prefilter = SearchResultPrefilter("retail")
+
+    kept = prefilter.rank([result("No title", "No snippet")])
+
+    assert len(kept) == 1
+
+def test_unknown_industry_uses_its_name():
+    """Industries without a lexicon match on the words of their name."""
+    prefilter = SearchResultPrefilter("aéronautique")
+
+    kept = prefilter.rank([
+        result("L'IA dans l'aéronautique", "Maintenance des avions"),
+        result("L'IA dans la mode", "Création de vêtements"),
+    ])
+
+    assert [r["title"] for r in kept] == ["L'IA dans l'aéronautique"]
+
+def test_french_j_ai_is_not_an_ai_term():
+    """"j'ai" is not read as "AI"; the English acronym still counts when written in capitals."""
+    prefilter = SearchResultPrefilter("finance")
+    results = [
+        result("J'ai ouvert un compte en banque", "Mon expérience client à l'agence", link="https://a"),
+        result("How AI helps a bank fight fraud", "A case study", link="https://b"),
+    ]
+
+    kept = prefilter.rank(results)
+
+    assert [r["link"] for r in kept] == ["https://b"]
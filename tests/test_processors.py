@@ -2,7 +2,8 @@ import pytest
 import requests_mock
 from unittest.mock import patch, MagicMock
 import io
-from processors import ArticleProcessor, PDF_AVAILABLE
+from processors import ArticleLoadError, ArticleProcessor, PDF_AVAILABLE
+from http_client import HttpClient
 from langchain.schema import Document
 
 @pytest.fixture
@@ -39,14 +40,9 @@ def test_load_pdf_network_error(processor, requests_mock):
     """Test PDF loading when network request fails."""
     url = "http://example.com/test.pdf"
     requests_mock.get(url, status_code=404)
-    
-    result = processor._load_pdf(url)
-    
-    assert isinstance(result, list)
-    assert len(result) == 1
-    assert isinstance(result[0], Document)
-    assert "Error loading PDF" in result[0].page_content
-    assert result[0].metadata["source"] == url
+
+    with pytest.raises(ArticleLoadError, match="Error loading PDF from http://example.com/test.pdf"):
+        processor._load_pdf(url)
 
 def test_load_pdf_missing_pypdf(processor, requests_mock, mock_pdf_content):
     """Test PDF loading when PyPDF2 is not installed."""
@@ -107,20 +103,18 @@ def test_load_article_pdf(processor, requests_mock, mock_pdf_content):
 def test_load_article_webpage(processor, requests_mock):
     """Test loading a regular webpage."""
     url = "http://example.com/article.html"
-    html_content = "<html><body><p>Test content</p></body></html>"
+    html_content = "<html lang=\"fr\"><head><title>Titre</title></head><body><p>Test content</p></body></html>"
     requests_mock.get(url, text=html_content)
-    
-    with patch('processors.WebBaseLoader') as mock_loader:
-        mock_doc = Document(page_content="Test content", metadata={"source": url})
-        mock_loader.return_value.load.return_value = [mock_doc]
-        
-        result = processor.load_article(url)
-        
-        assert isinstance(result, list)
-        assert len(result) == 1
-        assert isinstance(result[0], Document)
-        assert result[0].page_content == "Test content"
-        assert result[0].metadata["source"] == url
+
+    result = processor.load_article(url)
+
+    assert isinstance(result, list)
+    assert len(result) == 1
+    assert isinstance(result[0], Document)
+    assert "Test content" in result[0].page_content
+    assert result[0].metadata["source"] == url
+    assert result[0].metadata["title"] == "Titre"
+    assert result[0].metadata["language"] == "fr"
 
 def test_load_article_large_webpage(processor, requests_mock):
     """Test loading a large webpage that needs truncation."""
@@ -129,20 +123,42 @@ def test_load_article_large_webpage(processor, requests_mock):
     long_content = "Test content " * 10000
     html_content = f"<html><body><p>{long_content}</p></body></html>"
     requests_mock.get(url, text=html_content)
-    
-    with patch('processors.WebBaseLoader') as mock_loader:
-        mock_doc = Document(page_content=long_content, metadata={"source": url})
-        mock_loader.return_value.load.return_value = [mock_doc]
-        
-        result = processor.load_article(url)
-        
-        assert isinstance(result, list)
-        assert len(result) == 1
-        assert isinstance(result[0], Document)
-        assert "Test content" in result[0].page_content
-        assert "Document truncated" in result[0].page_content
-        assert len(result[0].page_content) <= 50000
-        assert result[0].metadata["source"] == url
+
+    result = processor.load_article(url)
+
+    assert isinstance(result, list)
+    assert len(result) == 1
+    assert isinstance(result[0], Document)
+    assert "Test content" in result[0].page_content
+    assert "Document truncated" in result[0].page_content
+    assert len(result[0].page_content) <= 50000
+    assert result[0].metadata["source"] == url
+
+def test_load_article_webpage_respects_size_cap(requests_mock):
+    """Web pages go through the shared client, so its response size cap applies."""
+    url = "http://example.com/huge.html"
+    requests_mock.get(url, text="<html><body>" + "x" * 5000 + "</body></html>")
+    processor = ArticleProcessor(http=HttpClient(max_bytes=1000))
+
+    with pytest.raises(ArticleLoadError, match="Error loading content from"):
+        processor.load_article(url)
+
+def test_load_article_raises_on_server_error(requests_mock):
+    """A failed download raises instead of returning an error page as the article."""
+    url = "http://example.com/down.html"
+    requests_mock.get(url, status_code=503, text="<html><body>Service Unavailable</body></html>")
+    processor = ArticleProcessor(http=HttpClient(max_retries=0))
+
+    with pytest.raises(ArticleLoadError, match="503"):
+        processor.load_article(url)
+
+def test_load_article_raises_on_empty_page(processor, requests_mock):
+    """A page without any text is not an article."""
+    url = "http://example.com/empty.html"
+    requests_mock.get(url, text="<html><body>  </body></html>")
+
+    with pytest.raises(ArticleLoadError, match="no text content"):
+        processor.load_article(url)
 
 def test_handle_large_document(processor):
     """Test the _handle_large_document method."""
@@ -172,4 +188,82 @@ def test_extract_key_information(processor):
     
     assert isinstance(result, list)
     assert all(isinstance(chunk, Document) for chunk in result)
-    assert len(result) > 0 
\ No newline at end of file
+    assert len(result) > 0
+
+def test_reduce_content_keeps_relevant_middle_chunks(processor):
+    """The use-case description in the middle survives reduction, filler does not."""
+    filler = "Informations générales sur la société et ses actualités. " * 20
+    use_case = ("La banque utilise l'intelligence artificielle et le machine learning pour détecter la fraude "
+                "sur les paiements, avec une réduction de 30% des pertes. ") * 5
+    text = "Titre de l'article\n\n" + "\n\n".join([filler] * 10 + [use_case] + [filler] * 10)
+    docs = [Document(page_content=text, metadata={"source": "test"})]
+
+    result = processor.reduce_content(docs, "finance", max_tokens=500)
+
+    assert len(result) <= 2000
+    assert result.startswith("Titre de l'article")
+    assert "détecter la fraude" in result
+    assert "Document truncated" in result
+
+def test_reduce_content_leaves_short_documents_untouched(processor):
+    """Documents within the budget are returned whole."""
+    docs = [Document(page_content="Court article", metadata={"source": "test"}),
+            Document(page_content="Suite", metadata={"source": "test"})]
+
+    assert processor.reduce_content(docs, "finance") == "Court article\n\nSuite"
+
+def test_load_pdf_rejects_declared_oversize(processor, requests_mock):
+    """A Content-Length above the cap is refused before downloading the body."""
+    url = "http://example.com/huge.pdf"
+    requests_mock.get(url, content=b"%PDF-1.4", headers={"Content-Length": str(processor.pdf_max_bytes + 1)})
+
+    with pytest.raises(ArticleLoadError, match="Error loading PDF.*limit"):
+        processor._load_pdf(url)
+
+def test_load_pdf_stops_streaming_at_size_cap(processor, requests_mock, mock_pdf_content):
+    """The download is aborted as soon as the streamed bytes exceed the cap."""
+    url = "http://example.com/stream.pdf"
+    requests_mock.get(url, content=mock_pdf_content)
+    processor.pdf_max_bytes = 10
+
+    with patch('processors.PDF_AVAILABLE', True), patch('processors.PyPDF2') as mock_pypdf:
+        with pytest.raises(ArticleLoadError, match="Error loading PDF"):
+            processor._load_pdf(url)
+
+    mock_pypdf.PdfReader.assert_not_called()
+
+def test_load_pdf_stops_at_character_budget(processor, requests_mock, mock_pdf_content):
+    """Pages stop being extracted once the character budget is reached."""
+    url = "http://example.com/long.pdf"
+    requests_mock.get(url, content=mock_pdf_content)
+
+    with patch('processors.PDF_AVAILABLE', True), patch('processors.PyPDF2') as mock_pypdf:
+        mock_page = MagicMock()
+        mock_page.extract_text.return_value = "x" * 30000
+        mock_pdf_reader = MagicMock()
+        mock_pdf_reader.pages = [mock_page] * 10
+        mock_pypdf.PdfReader.return_value = mock_pdf_reader
+
+        result = processor._load_pdf(url)
+
+    assert mock_page.extract_text.call_count == 2
+    assert "first 2 of 10 pages" in result[0].page_content
+
+def test_load_pdf_uses_executor(requests_mock, mock_pdf_content):
+    """Text extraction is delegated to the configured executor."""
+    from concurrent.futures import ThreadPoolExecutor
+    url = "http://example.com/test.pdf"
+    requests_mock.get(url, content=mock_pdf_content)
+
+    with ThreadPoolExecutor(max_workers=1) as executor, \
+            patch('processors.PDF_AVAILABLE', True), patch('processors.PyPDF2') as mock_pypdf:
+        mock_page = MagicMock()
+        mock_page.extract_text.return_value = "Test PDF Content"
+        mock_pypdf.PdfReader.return_value.pages = [mock_page]
+        submit = MagicMock(side_effect=executor.submit)
+        executor.submit = submit
+
+        result = ArticleProcessor(pdf_executor=executor)._load_pdf(url)
+
+    assert "Test PDF Content" in result[0].page_content
+    assert submit.call_count == 1
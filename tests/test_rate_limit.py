@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import time
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from http_client import HttpClient
+from rate_limit import ProviderLimiter, TokenBucket, get_limiter, with_limiter_retries
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(60, capacity=2)
+    now = bucket.updated
+    bucket.take(2, now)
+
+    assert bucket.wait_time(1, now) == 1.0
+    assert bucket.wait_time(1, now + 1.0) == 0.0
+
+
+def test_token_debt_delays_the_next_call():
+    limiter = ProviderLimiter("llm", tokens_per_minute=6000)
+    limiter.acquire()
+    limiter.release(tokens=limiter.tokens.capacity + 50)
+
+    # 50 tokens over at 100 tokens/s
+    assert limiter.acquire(blocking=False) is False
+    time.sleep(0.6)
+    assert limiter.acquire(blocking=False) is True
+
+
+def test_concurrency_halves_on_429_and_grows_back():
+    limiter = ProviderLimiter("api", max_concurrency=4)
+    limiter.acquire()
+    limiter.release(throttled=True, retry_after=0)
+    assert limiter.concurrency == 2
+    assert limiter.stats["throttled"] == 1
+
+    for _ in range(2):
+        limiter.acquire()
+        limiter.release()
+    assert limiter.concurrency == 3
+
+
+def test_retry_after_pauses_every_caller():
+    limiter = ProviderLimiter("api", max_concurrency=4)
+    limiter.acquire()
+    limiter.release(throttled=True, retry_after=0.3)
+
+    assert limiter.acquire(blocking=False) is False
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.25
+
+
+def test_in_flight_calls_are_capped():
+    limiter = ProviderLimiter("api", max_concurrency=2)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def call():
+        limiter.acquire()
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+        limiter.release()
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+    assert limiter.stats["calls"] == 6
+
+
+def test_http_client_reports_429_to_the_limiter(requests_mock):
+    url = "https://api.example.com/search"
+    requests_mock.get(url, [{"status_code": 429, "headers": {"Retry-After": "0"}}, {"json": {}}])
+    limiter = ProviderLimiter("api", max_concurrency=4)
+
+    response = HttpClient(backoff=0).get(url, limiter=limiter)
+
+    assert response.status_code == 200
+    assert limiter.stats == {"calls": 2, "throttled": 1, "waited_seconds": limiter.stats["waited_seconds"]}
+    assert limiter.concurrency == 2
+
+
+def test_chat_model_releases_its_slot():
+    limiter = ProviderLimiter("llm", requests_per_minute=600, max_concurrency=1)
+    llm = FakeListChatModel(responses=["OUI", "NON"], rate_limiter=limiter,
+                            callbacks=[limiter.callback_handler()])
+
+    assert llm.invoke("Question ?").content == "OUI"
+    assert llm.invoke("Question ?").content == "NON"
+    assert limiter.stats["calls"] == 2
+    assert not limiter.holds_slot()
+
+
+def test_async_calls_release_their_slot():
+    """Slots taken by async calls are released, whichever thread or task runs the callbacks."""
+    limiter = ProviderLimiter("llm", requests_per_minute=6000, max_concurrency=2)
+    llm = FakeListChatModel(responses=["OUI"], rate_limiter=limiter, callbacks=[limiter.callback_handler()])
+
+    async def calls():
+        await llm.ainvoke("Question ?")
+        await asyncio.gather(*(llm.ainvoke("Question ?") for _ in range(4)))
+        await llm.abatch(["A", "B"])
+
+    asyncio.run(calls())
+
+    assert limiter.stats["calls"] == 7
+    assert limiter.acquire(blocking=False) and limiter.acquire(blocking=False)
+
+
+class Throttled(Exception):
+    """Stands for openai.RateLimitError: the status and response of a 429."""
+
+    status_code = 429
+
+    class response:
+        headers = {"Retry-After": "1"}
+
+
+class ThrottledOnceChatModel(FakeListChatModel):
+    def _call(self, *args, **kwargs):
+        if not getattr(self, "_throttled", False):
+            object.__setattr__(self, "_throttled", True)
+            raise Throttled("Rate limit reached")
+        return super()._call(*args, **kwargs)
+
+
+def test_retries_wait_on_the_limiter():
+    """A 429 reaches the limiter at once, and the retry waits for its Retry-After."""
+    limiter = ProviderLimiter("llm", max_concurrency=4)
+    llm = with_limiter_retries(
+        ThrottledOnceChatModel(responses=["OUI"], rate_limiter=limiter, callbacks=[limiter.callback_handler()]),
+        retry_on=(Throttled,), retries=2
+    )
+
+    start = time.monotonic()
+    assert llm.invoke("Question ?").content == "OUI"
+
+    assert 0.9 <= time.monotonic() - start < 4
+    assert limiter.stats["throttled"] == 1
+    assert limiter.stats["calls"] == 2
+    assert limiter.concurrency == 2
+    assert not limiter.holds_slot()
+
+
+def test_limiters_are_shared_and_configurable(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_TEST_PROVIDER_RPM", "30")
+    monkeypatch.setenv("RATE_LIMIT_TEST_PROVIDER_CONCURRENCY", "2")
+
+    limiter = get_limiter("test_provider")
+
+    assert get_limiter("test_provider") is limiter
+    assert limiter.requests.rate == 0.5
+    assert limiter.tokens is None
+    assert limiter.max_concurrency == 2
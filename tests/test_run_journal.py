@@ -0,0 +1,65 @@
+import pytest
+from run_journal import RunJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = RunJournal(path=str(tmp_path / "journal.db"))
+    yield journal
+    journal.close()
+
+
+def test_run_arguments_are_kept(journal):
+    run_id = journal.start_run({"industries": ["finance", "santé"], "count": 20})
+
+    run = journal.get_run(run_id)
+    assert run["arguments"] == {"industries": ["finance", "santé"], "count": 20}
+    assert run["status"] == "running"
+
+    journal.finish_run(run_id)
+    assert journal.get_run(run_id)["status"] == "completed"
+    assert journal.get_run("inconnu") is None
+
+
+def test_search_pages_are_only_replayed_once_complete(journal):
+    run_id = journal.start_run({})
+    journal.record_search_page(run_id, "finance", [{"link": "https://example.com/a"}])
+    assert journal.search_pages(run_id, "finance") is None
+
+    journal.reset_search(run_id, "finance")
+    journal.record_search_page(run_id, "finance", [{"link": "https://example.com/b"}])
+    journal.record_search_page(run_id, "finance", [{"link": "https://example.com/c"}])
+    journal.finish_search(run_id, "finance")
+
+    assert journal.search_pages(run_id, "finance") == [
+        [{"link": "https://example.com/b"}], [{"link": "https://example.com/c"}]
+    ]
+    assert journal.search_pages(run_id, "santé") is None
+
+
+def test_stage_outputs_and_industry_results(journal):
+    run_id = journal.start_run({})
+    journal.record_stage(run_id, "finance", "https://example.com/a", "fetch", {"content": "texte"})
+    journal.record_stage(run_id, "finance", "https://example.com/b", "fetch", None)
+
+    assert journal.stage_outputs(run_id, "finance") == {
+        ("https://example.com/a", "fetch"): {"content": "texte"},
+        ("https://example.com/b", "fetch"): None,
+    }
+    assert journal.stage_outputs(run_id, "santé") == {}
+
+    assert journal.industry_results(run_id, "finance") is None
+    journal.finish_industry(run_id, "finance", {"use_cases": [], "benchmark": ""})
+    assert journal.industry_results(run_id, "finance") == {"use_cases": [], "benchmark": ""}
+
+
+def test_old_runs_are_purged(tmp_path):
+    journal = RunJournal(path=str(tmp_path / "journal.db"), ttl=0)
+    old = journal.start_run({})
+    journal.record_stage(old, "finance", "https://example.com/a", "fetch", None)
+
+    journal.start_run({})
+
+    assert journal.get_run(old) is None
+    assert journal.stage_outputs(old, "finance") == {}
+    journal.close()
@@ -0,0 +1,157 @@
+import pytest
+from google_search import SimpleSearchTool
+from rate_limit import ProviderLimiter
+from search_base import BaseSearchTool, CachedSearchTool, SearchCache, industry_queries, industry_query
+
+class RecordingSearchTool(BaseSearchTool):
+    provider = "recording"
+
+    def __init__(self, results):
+        self.results = results
+        self.queries = []
+
+    def search(self, query, num_results=5):
+        self.queries.append((query, num_results))
+        return self.results[:num_results]
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SearchCache(path=str(tmp_path / "search.db"), ttl=3600)
+    yield cache
+    cache.close()
+
+def test_industry_helpers_build_queries():
+    """search_industry_ai_cases and search_specific_case delegate to search()."""
+    tool = RecordingSearchTool([])
+
+    tool.search_industry_ai_cases("finance", 4)
+    tool.search_specific_case("finance", "détection de fraude")
+
+    assert tool.queries[0] == (industry_query("finance"), 4)
+    assert tool.queries[1] == ("détection de fraude implémentation IA dans finance résultats métriques", 3)
+
+def test_cached_search_skips_repeated_queries(cache):
+    """The wrapped tool is only called once per (provider, query, num_results)."""
+    results = [{"title": "Cas", "link": "https://example.com/cas", "snippet": "IA"}]
+    tool = RecordingSearchTool(results)
+    cached = CachedSearchTool(tool, cache)
+
+    assert cached.search_industry_ai_cases("retail", 5) == results
+    assert cached.search_industry_ai_cases("retail", 5) == results
+    cached.search_industry_ai_cases("retail", 10)
+
+    assert len(tool.queries) == 2
+    assert cache.stats == {"hits": 1, "misses": 2}
+
+def test_empty_results_are_not_cached(cache):
+    """Providers return [] on errors, so an empty answer is retried next time."""
+    tool = RecordingSearchTool([])
+    cached = CachedSearchTool(tool, cache)
+
+    cached.search("requête")
+    cached.search("requête")
+
+    assert len(tool.queries) == 2
+
+def test_cache_hit_skips_scraper_rate_limit(cache, requests_mock):
+    """The rate limiter of SimpleSearchTool only applies to real requests."""
+    html = '<div class="g"><a href="https://example.com/cas"><h3>Cas</h3></a><div class="VwiC3b">IA</div></div>'
+    requests_mock.get("https://www.google.com/search", text=html)
+    tool = SimpleSearchTool()
+    tool.limiter = ProviderLimiter("google_scraper", requests_per_minute=20, max_concurrency=1)
+    cached = CachedSearchTool(tool, cache)
+
+    first = cached.search_industry_ai_cases("finance", 1)
+    second = cached.search_industry_ai_cases("finance", 1)
+
+    assert first == second == [{"title": "Cas", "link": "https://example.com/cas", "snippet": "IA"}]
+    assert tool.limiter.stats["calls"] == 1
+    assert requests_mock.call_count == 1
+
+class PagedSearchTool(BaseSearchTool):
+    provider = "paged"
+    page_size = 10
+    max_results = 30
+
+    def __init__(self, per_query=30):
+        self.per_query = per_query
+        self.pages = []
+
+    def search_page(self, query, start, count):
+        self.pages.append((query, start, count))
+        return [{"title": query, "link": f"https://example.com/{abs(hash(query))}/{rank}", "snippet": ""}
+                for rank in range(start, min(start + count, self.per_query))]
+
+def test_pages_are_fetched_up_to_the_provider_limit():
+    tool = PagedSearchTool()
+
+    results = tool.search("IA banque", 50)
+
+    assert len(results) == 30
+    assert sorted(start for _, start, _ in tool.pages) == [0, 10, 20]
+    assert results[0]["link"].endswith("/0") and results[-1]["link"].endswith("/29")
+
+def test_query_variations_fill_up_the_requested_count():
+    tool = PagedSearchTool(per_query=12)
+
+    pages = list(tool.iter_industry_ai_cases("finance", 30))
+    results = [result for page in pages for result in page]
+
+    assert len(results) == 30
+    assert len({result["link"] for result in results}) == 30
+    assert len(pages) > 1
+    queries = list(dict.fromkeys(query for query, _, _ in tool.pages))
+    assert queries == industry_queries("finance")[:3]
+
+def test_cached_tool_streams_then_caches_pages(cache):
+    tool = PagedSearchTool()
+    cached = CachedSearchTool(tool, cache)
+
+    first = [result for page in cached.iter_search("IA banque", 20) for result in page]
+    second = list(cached.iter_search("IA banque", 20))
+
+    assert len(tool.pages) == 2
+    assert second == [first]
+
+def test_cached_tool_does_not_cache_partial_results(cache):
+    """A query with a failed page is served without that page but not cached."""
+    tool = PagedSearchTool()
+    search_page = tool.search_page
+    failed = []
+
+    def flaky_page(query, start, count):
+        if start == 10 and not failed:
+            failed.append(start)
+            raise RuntimeError("503 Server Error")
+        return search_page(query, start, count)
+
+    tool.search_page = flaky_page
+    cached = CachedSearchTool(tool, cache)
+    errors = []
+
+    partial = [result for page in cached.iter_search("IA banque", 20, on_error=errors.append) for result in page]
+    complete = cached.search("IA banque", 20)
+
+    assert len(partial) == 10 and len(errors) == 1
+    assert len(complete) == 20
+    assert len(tool.pages) == 3
+    assert cached.search("IA banque", 20) == complete
+    assert len(tool.pages) == 3
+
+def test_serpapi_search_calls_the_wrapper():
+    """IndustrySearchTool.search stays callable and reads SerpAPI's organic results."""
+    from unittest.mock import MagicMock, patch
+    from search_utils import IndustrySearchTool
+    wrapper = MagicMock()
+    wrapper.results.return_value = {"organic_results": [
+        {"title": "IA en banque", "link": "https://example.com/a", "snippet": "fraude"},
+        {"title": "IA en assurance", "link": "https://example.com/b", "snippet": "sinistres"},
+    ]}
+    with patch("search_utils.SerpAPIWrapper", return_value=wrapper):
+        tool = IndustrySearchTool()
+
+    results = tool.search("IA finance", num_results=1)
+
+    wrapper.results.assert_called_once_with("IA finance")
+    assert results == [{"title": "IA en banque", "link": "https://example.com/a", "snippet": "fraude"}]
+    assert tool.search_industry_ai_cases("finance", 2)[1]["link"] == "https://example.com/b"
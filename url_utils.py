@@ -0,0 +1,52 @@
+# url_utils.py
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+def normalize_url(url):
+    """Normalize a URL so that trivially different spellings share one cache key.
+
+    Lowercases the scheme and host, drops default ports and the fragment, sorts the
+    query parameters and removes a trailing slash from the path. A URL that cannot
+    be parsed (an invalid port, say) is returned as is.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+# Query parameters added by campaigns and share buttons; they never change the page content
+TRACKING_PARAMS = {
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "mc_cid", "mc_eid", "igshid", "_hsenc", "_hsmi",
+    "ref", "ref_src", "ref_url", "cmpid", "xtor", "at_medium", "at_campaign", "sr_share"
+}
+
+
+def canonical_url(url):
+    """Identity of the article behind a URL, for deduplication across runs.
+
+    On top of normalize_url, drops tracking parameters (utm_* and the like), treats
+    http and https as the same scheme and ignores a leading "www.". The result
+    identifies a page; it is not meant to be fetched.
+    """
+    parts = urlsplit(normalize_url(url))
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    scheme = "https" if parts.scheme in ("http", "https") else parts.scheme
+    query = urlencode([
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMS
+    ])
+    return urlunsplit((scheme, host, parts.path, query, ""))